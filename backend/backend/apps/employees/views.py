@@ -1,11 +1,22 @@
+import hashlib
+
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from .models import Employee, VacationLeave
 from .serializers import EmployeeSerializer, VacationLeaveSerializer, EmployeeCreateSerializer, EmployeeDetailSerializer
 from ...common.mixins import QueryOptimizationMixin
 from ...common.permissions import IsEmployeeOwner
+from ...common.utils import with_conditional_headers
 from ...common.viewsets import BaseUserOwnedViewSet
+from ..schedule.services.cross_location_conflict_service import CrossLocationConflictService
+from ..schedule.services.employee_timesheet_service import EmployeeTimesheetService
+from ..schedule.services.schedule_version_service import ScheduleVersionService
+from ..schedule.validators import MonthParamsValidator
 
 
 class EmployeeViewSet(QueryOptimizationMixin, BaseUserOwnedViewSet):
@@ -24,6 +35,10 @@ class EmployeeViewSet(QueryOptimizationMixin, BaseUserOwnedViewSet):
         if location_id:
             queryset = queryset.filter(locations=location_id)
 
+        if self.action == 'timesheet':
+            # Karta czyta wpisy sama - powiązania pracownika są zbędne
+            queryset = queryset.prefetch_related(None)
+
         return queryset
 
     def get_serializer_class(self):
@@ -33,6 +48,64 @@ class EmployeeViewSet(QueryOptimizationMixin, BaseUserOwnedViewSet):
             return EmployeeDetailSerializer
         return EmployeeSerializer
 
+    @action(detail=True, methods=['get'], url_path='conflicts')
+    def conflicts(self, request, pk=None):
+        """
+        GET /api/employees/{id}/conflicts/?month=11&year=2025
+        Konflikty pracownika między lokacjami (nakładanie się zmian, odpoczynek 11h/35h).
+        """
+        validator = MonthParamsValidator(request.query_params)
+        if not validator.is_valid():
+            return Response(validator.errors, status=400)
+
+        employee = self.get_object()
+        conflicts = CrossLocationConflictService(
+            employee_ids=[employee.id],
+            month=validator.month,
+            year=validator.year
+        ).detect()
+
+        return Response({
+            'employee': str(employee.id),
+            'month': validator.month,
+            'year': validator.year,
+            'cross_location_conflicts': conflicts
+        })
+
+    @action(detail=True, methods=['get'], url_path='timesheet')
+    def timesheet(self, request, pk=None):
+        """
+        GET /api/employees/{id}/timesheet/?month=11&year=2025
+        Karta czasu pracy pracownika ze wszystkich lokacji: zmiany dzień po dniu,
+        sumy per lokacja, suma miesiąca, konflikty w lokacjach i między nimi.
+
+        Wynik w cache per wersja miesiąca; ETag/Last-Modified z tej samej
+        wersji - niezmieniony miesiąc zwraca 304.
+        """
+        validator = MonthParamsValidator(request.query_params)
+        if not validator.is_valid():
+            return Response(validator.errors, status=400)
+
+        employee = self.get_object()
+        marker = ScheduleVersionService.get_user_month_marker(request.user.id, validator.month, validator.year)
+
+        conditional = None
+        if marker is not None:
+            token, last_modified = marker
+            digest = hashlib.md5(
+                f"{request.user.id}|{employee.id}|{validator.year}|{validator.month}|{token}".encode()
+            ).hexdigest()
+            conditional = {'etag': quote_etag(digest), 'last_modified': int(last_modified.timestamp())}
+            not_modified = get_conditional_response(request, **conditional)
+            if not_modified is not None:
+                return with_conditional_headers(not_modified, conditional)
+
+        timesheet = EmployeeTimesheetService(employee, validator.month, validator.year)
+        response = Response(timesheet.get_cached(marker[0] if marker else None))
+        if conditional is not None:
+            with_conditional_headers(response, conditional)
+        return response
+
 
 class VacationLeaveViewSet(QueryOptimizationMixin, viewsets.ModelViewSet):
     queryset = VacationLeave.objects.all()
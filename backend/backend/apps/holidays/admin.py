@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import PublicHoliday
+
+
+@admin.register(PublicHoliday)
+class PublicHolidayAdmin(admin.ModelAdmin):
+    list_display = ('date', 'local_name', 'name')
+    search_fields = ('local_name', 'name')
+    date_hierarchy = 'date'
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class HolidaysConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.apps.holidays'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,35 @@
+"""
+Synchronizacja kalendarza świąt (PublicHoliday) z Nager.Date.
+
+Użycie:
+    python manage.py sync_public_holidays                  # bieżący i następny rok
+    python manage.py sync_public_holidays --year 2025 --year 2026
+
+Zmienione daty świąt przeliczają sumy godzin grafiku w dotkniętych miesiącach.
+"""
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...services.holiday_calendar_service import HolidayCalendarService
+
+
+class Command(BaseCommand):
+    help = "Pobiera święta państwowe z Nager.Date i zapisuje je w kalendarzu."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', action='append', type=int, dest='years',
+                            help="Rok (można podać wielokrotnie; domyślnie bieżący i następny)")
+
+    def handle(self, *args, **options):
+        current_year = timezone.now().year
+        years = options['years'] or [current_year, current_year + 1]
+
+        for year in years:
+            try:
+                total = HolidayCalendarService.sync_year(year)
+            except requests.RequestException as e:
+                raise CommandError(f"Błąd API świąt dla roku {year}: {e}")
+            self.stdout.write(f"{year}: zapisano {total} świąt")
+
+        self.stdout.write(self.style.SUCCESS("Gotowe"))
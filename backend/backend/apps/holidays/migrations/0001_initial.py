@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-18 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicHoliday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Data')),
+                ('local_name', models.CharField(max_length=100, verbose_name='Nazwa')),
+                ('name', models.CharField(blank=True, max_length=100, verbose_name='Nazwa (EN)')),
+            ],
+            options={
+                'verbose_name': 'Święto',
+                'verbose_name_plural': 'Święta',
+                'ordering': ['date'],
+            },
+        ),
+    ]
@@ -1,3 +1,21 @@
 from django.db import models
 
-# Create your models here.
+
+class PublicHoliday(models.Model):
+    """
+    Kalendarz świąt państwowych zapisany w bazie (źródło: Nager.Date).
+
+    Wypełniany komendą sync_public_holidays albo przy pierwszym odczycie
+    roku przez HolidayService - silnik godzin grafiku czyta tylko tę tabelę.
+    """
+    date = models.DateField(unique=True, verbose_name="Data")
+    local_name = models.CharField(max_length=100, verbose_name="Nazwa")
+    name = models.CharField(max_length=100, blank=True, verbose_name="Nazwa (EN)")
+
+    class Meta:
+        verbose_name = "Święto"
+        verbose_name_plural = "Święta"
+        ordering = ['date']
+
+    def __str__(self):
+        return f"{self.date} - {self.local_name}"
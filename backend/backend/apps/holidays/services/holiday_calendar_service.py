@@ -0,0 +1,76 @@
+import logging
+from datetime import date
+from typing import Optional, Set
+
+from django.db import transaction
+
+from ..models import PublicHoliday
+from ..signals import holidays_changed
+from .nager_api_client import NagerApiClient
+
+logger = logging.getLogger(__name__)
+
+
+class HolidayCalendarService:
+    """
+    Kalendarz świąt zapisany w bazie (PublicHoliday).
+
+    Odczyt nie odpytuje API - lata synchronizuje sync_year()
+    (komenda sync_public_holidays lub pierwszy odczyt roku w HolidayService).
+    Zmiana zbioru dat świąt wysyła holidays_changed (przeliczenie sum godzin grafiku).
+    """
+
+    @staticmethod
+    def get_dates(date_from: date, date_to: date) -> Set[date]:
+        """Daty świąt z zakresu (włącznie) - jedno zapytanie."""
+        return set(PublicHoliday.objects.filter(
+            date__gte=date_from,
+            date__lte=date_to
+        ).values_list('date', flat=True))
+
+    @staticmethod
+    def has_year(year: int) -> bool:
+        """Czy rok jest już w kalendarzu."""
+        return PublicHoliday.objects.filter(date__year=year).exists()
+
+    @staticmethod
+    def sync_year(year: int, api_client: Optional[NagerApiClient] = None) -> int:
+        """
+        Pobiera święta roku z Nager.Date i zastępuje nimi zapisane.
+
+        Zapisuje tylko różnicę: usuwa daty spoza API, aktualizuje nazwy pozostałych
+        i dodaje nowe. Dodane i usunięte daty trafiają do holidays_changed
+        w tej samej transakcji co zapis świąt.
+
+        Returns:
+            Liczba zapisanych świąt
+
+        Raises:
+            requests.RequestException: W przypadku błędu komunikacji z API
+        """
+        holidays = (api_client or NagerApiClient()).get_public_holidays(year)
+        rows = {}
+        for holiday in holidays:
+            holiday_date = date.fromisoformat(holiday['date'])
+            rows[holiday_date] = PublicHoliday(
+                date=holiday_date,
+                local_name=holiday.get('localName', ''),
+                name=holiday.get('name', '')
+            )
+
+        with transaction.atomic():
+            # Usunięte daty - post_delete PublicHoliday wysyła holidays_changed
+            PublicHoliday.objects.filter(date__year=year).exclude(date__in=list(rows)).delete()
+
+            existing = {holiday.date: holiday for holiday in PublicHoliday.objects.filter(date__year=year)}
+            for holiday_date, holiday in existing.items():
+                holiday.local_name, holiday.name = rows[holiday_date].local_name, rows[holiday_date].name
+            PublicHoliday.objects.bulk_update(existing.values(), ['local_name', 'name'])
+
+            added = [holiday for holiday_date, holiday in rows.items() if holiday_date not in existing]
+            PublicHoliday.objects.bulk_create(added)
+            if added:
+                holidays_changed.send(sender=PublicHoliday, dates={holiday.date for holiday in added})
+
+        logger.info(f"Zsynchronizowano {len(rows)} świąt dla roku {year}")
+        return len(rows)
@@ -1,13 +1,14 @@
 import logging
 from typing import List, Dict
-from datetime import datetime
+from ..models import PublicHoliday
+from .holiday_calendar_service import HolidayCalendarService
 from .nager_api_client import NagerApiClient
 
 logger = logging.getLogger(__name__)
 
 
 class HolidayService:
-    """Serwis do pobierania świąt dla konkretnego miesiąca"""
+    """Serwis do pobierania świąt dla konkretnego miesiąca (z kalendarza w bazie)"""
 
     def __init__(self):
         self.api_client = NagerApiClient()
@@ -32,25 +33,24 @@ class HolidayService:
             ]
         """
         try:
-            # Pobierz wszystkie święta dla roku
-            all_holidays = self.api_client.get_public_holidays(year)
+            # Rok spoza kalendarza - jednorazowo pobierz z API i zapisz
+            if not HolidayCalendarService.has_year(year):
+                HolidayCalendarService.sync_year(year, self.api_client)
 
-            # Filtruj tylko święta z konkretnego miesiąca
-            month_holidays = []
+            holidays = PublicHoliday.objects.filter(date__year=year, date__month=month)
 
-            for holiday in all_holidays:
-                holiday_date = datetime.strptime(holiday['date'], '%Y-%m-%d')
-
-                if holiday_date.month == month:
-                    # Dodaj dzień tygodnia dla wygody
-                    day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-                    holiday['day'] = day_names[holiday_date.weekday()]
-
-                    month_holidays.append(holiday)
-
-            return month_holidays
+            day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+            return [
+                {
+                    'date': holiday.date.isoformat(),
+                    'localName': holiday.local_name,
+                    'name': holiday.name,
+                    'day': day_names[holiday.date.weekday()]
+                }
+                for holiday in holidays
+            ]
 
         except Exception as e:
             logger.error(f"❌ Błąd podczas filtrowania świąt dla {month}/{year}: {e}")
             # Zwróć pustą listę w przypadku błędu
-            return []
\ No newline at end of file
+            return []
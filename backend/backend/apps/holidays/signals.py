@@ -0,0 +1,38 @@
+"""
+Sygnał zmiany kalendarza świąt.
+
+holidays_changed(dates=set dat) wysyłany jest, gdy zmienia się zbiór dat świąt -
+przy synchronizacji roku (HolidayCalendarService.sync_year) i przy edycji
+PublicHoliday (np. z panelu admina). Odbiorcy (sumy godzin grafiku) przeliczają
+dane zależne od świąt w tych dniach.
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from .models import PublicHoliday
+
+holidays_changed = Signal()
+
+
+@receiver(pre_save, sender=PublicHoliday)
+def remember_previous_date(sender, instance, raw=False, **kwargs):
+    """Zapamiętuje poprzednią datę święta (zmiana daty to dwie zmienione daty)."""
+    instance._previous_date = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_date = PublicHoliday.objects.filter(pk=instance.pk).values_list('date', flat=True).first()
+
+
+@receiver(post_save, sender=PublicHoliday)
+def notify_after_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_date', None)
+    if previous == instance.date:
+        return
+    holidays_changed.send(sender=PublicHoliday, dates={instance.date} | ({previous} if previous else set()))
+
+
+@receiver(post_delete, sender=PublicHoliday)
+def notify_after_delete(sender, instance, **kwargs):
+    holidays_changed.send(sender=PublicHoliday, dates={instance.date})
@@ -1,10 +1,73 @@
 from django.contrib import admin
 from django.contrib import admin
-from .models import WorkHours
+from .models import (
+    WorkHours, ScheduleConflict, ScheduleVersion, LocationConflictRule, RotationPattern, RotationAssignment,
+    ScheduleChange, ScheduleChangeFloor, MonthlyHoursSummary, SettlementPeriod
+)
 
 @admin.register(WorkHours)
 class WorkHoursAdmin(admin.ModelAdmin):
     list_display = ('id', 'employee', 'location', 'date', 'hours')
     list_filter = ('date', 'location')
     search_fields = ('employee__full_name', 'location__name')
-    date_hierarchy = 'date'
\ No newline at end of file
+    date_hierarchy = 'date'
+
+
+@admin.register(ScheduleConflict)
+class ScheduleConflictAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'location', 'rule', 'date', 'week')
+    list_filter = ('rule', 'location')
+    search_fields = ('employee__full_name', 'location__name')
+    date_hierarchy = 'date'
+
+
+@admin.register(ScheduleVersion)
+class ScheduleVersionAdmin(admin.ModelAdmin):
+    list_display = ('location', 'year', 'month', 'version', 'updated_at')
+    list_filter = ('location', 'year')
+
+
+@admin.register(MonthlyHoursSummary)
+class MonthlyHoursSummaryAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'location', 'year', 'month', 'total_minutes', 'shift_count',
+                    'night_minutes', 'sunday_minutes', 'holiday_minutes', 'weekend_minutes',
+                    'daily_overtime_minutes', 'updated_at')
+    list_filter = ('location', 'year', 'month')
+    search_fields = ('employee__full_name', 'location__name')
+
+
+@admin.register(SettlementPeriod)
+class SettlementPeriodAdmin(admin.ModelAdmin):
+    list_display = ('location', 'months', 'start_date')
+    search_fields = ('location__name',)
+
+
+@admin.register(LocationConflictRule)
+class LocationConflictRuleAdmin(admin.ModelAdmin):
+    list_display = ('location', 'rule', 'enabled')
+    list_filter = ('rule', 'enabled', 'location')
+
+
+class RotationAssignmentInline(admin.TabularInline):
+    model = RotationAssignment
+    extra = 0
+
+
+@admin.register(RotationPattern)
+class RotationPatternAdmin(admin.ModelAdmin):
+    list_display = ('name', 'location', 'anchor_date')
+    list_filter = ('location',)
+    search_fields = ('name', 'location__name')
+    inlines = [RotationAssignmentInline]
+
+
+@admin.register(ScheduleChange)
+class ScheduleChangeAdmin(admin.ModelAdmin):
+    list_display = ('seq', 'location', 'employee_id', 'date', 'op', 'hours', 'created_at')
+    list_filter = ('op', 'location')
+    date_hierarchy = 'created_at'
+
+
+@admin.register(ScheduleChangeFloor)
+class ScheduleChangeFloorAdmin(admin.ModelAdmin):
+    list_display = ('location', 'purged_seq', 'purged_at')
@@ -0,0 +1,99 @@
+"""
+Benchmark odczytu listy WorkHours: WorkHoursSerializer vs WorkHoursReadService.
+
+Tworzy syntetycznego użytkownika z grafikiem o zadanej liczbie wpisów
+w transakcji wycofywanej na końcu (baza pozostaje bez zmian) i sprawdza,
+że obie ścieżki dają identyczny JSON.
+
+Użycie:
+    python manage.py benchmark_work_hours_list --rows 100000 --repeat 3
+"""
+import time
+import uuid
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from ....employees.models import Employee
+from ....locations.models import Location
+from ...models import WorkHours
+from ...serializers import WorkHoursSerializer
+from ...services.work_hours_read_service import WorkHoursReadService
+
+
+class Command(BaseCommand):
+    help = "Porównuje szybkość odczytu listy grafiku przez serializer i przez values_list (dane syntetyczne)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help="Liczba wpisów WorkHours")
+        parser.add_argument('--employees', type=int, default=200, help="Liczba pracowników")
+        parser.add_argument('--locations', type=int, default=5, help="Liczba lokacji")
+        parser.add_argument('--repeat', type=int, default=3, help="Liczba powtórzeń (liczy się najlepszy czas)")
+
+    def handle(self, *args, **options):
+        if options['rows'] <= 0 or options['employees'] <= 0 or options['locations'] <= 0:
+            raise CommandError("--rows, --employees i --locations muszą być dodatnie")
+
+        with transaction.atomic():
+            queryset = self._create_tenant(options)
+            row_count = queryset.count()
+
+            serializer_ms, serializer_json = self._measure(options['repeat'], lambda: WorkHoursSerializer(
+                queryset.select_related('employee', 'location'), many=True
+            ).data)
+            fast_ms, fast_json = self._measure(options['repeat'], lambda: WorkHoursReadService.serialize(queryset))
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Wpisy: {row_count}")
+        self.stdout.write(f"WorkHoursSerializer:  {serializer_ms:.0f} ms ({row_count / serializer_ms * 1000:.0f} wierszy/s)")
+        self.stdout.write(f"WorkHoursReadService: {fast_ms:.0f} ms ({row_count / fast_ms * 1000:.0f} wierszy/s)")
+        self.stdout.write(f"Przyspieszenie: {serializer_ms / fast_ms:.1f}x")
+
+        if serializer_json != fast_json:
+            raise CommandError("JSON obu ścieżek różni się - WorkHoursReadService nie odpowiada WorkHoursSerializer")
+        self.stdout.write(self.style.SUCCESS("JSON identyczny"))
+
+    @staticmethod
+    def _measure(repeat, build):
+        """Najlepszy czas (ms) zapytania + budowy danych + renderowania JSON."""
+        best = None
+        rendered = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            rendered = JSONRenderer().render(build())
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, rendered
+
+    @staticmethod
+    def _create_tenant(options):
+        """Syntetyczny użytkownik: lokacje, pracownicy i kolejne dni grafiku."""
+        user = get_user_model().objects.create(username=f"benchmark-{uuid.uuid4().hex[:12]}")
+        locations = Location.objects.bulk_create([
+            Location(user=user, name=f"Lokacja {index + 1}") for index in range(options['locations'])
+        ])
+        employees = Employee.objects.bulk_create([
+            Employee(user=user, full_name=f"Pracownik {index + 1:04d}") for index in range(options['employees'])
+        ])
+
+        hours_cycle = ['7:00-15:00', '15:00-23:00', '23:00-7:00', '8:00-20:00', 'DWH']
+        start = date(2025, 1, 1)
+        work_hours = []
+        for index in range(options['rows']):
+            employee_index = index % len(employees)
+            day = index // len(employees)
+            work_hours.append(WorkHours(
+                employee=employees[employee_index],
+                location=locations[employee_index % len(locations)],
+                date=start + timedelta(days=day),
+                hours=hours_cycle[(employee_index + day) % len(hours_cycle)]
+            ))
+        for entry in work_hours:
+            entry.normalize_hours()
+        WorkHours.objects.bulk_create(work_hours, batch_size=5000)
+
+        return WorkHours.objects.filter(location__user=user)
@@ -0,0 +1,125 @@
+"""
+Benchmark zapytania o miesiąc grafiku przy rosnącej historii WorkHours.
+
+Tworzy syntetycznego użytkownika i dokłada kolejne miesiące historii wstecz
+w transakcji wycofywanej na końcu (baza pozostaje bez zmian). Po każdym etapie
+mierzy odczyt bieżącego miesiąca jednej lokacji; na partycjonowanej tabeli
+(PostgreSQL, manage_work_hours_partitions --convert) podaje też liczbę partycji w planie zapytania.
+Przy działającym przycinaniu partycji czas nie zależy od długości historii.
+
+Użycie:
+    python manage.py benchmark_work_hours_partitions --history-months 12 60 120 --employees 100
+"""
+import re
+import time
+import uuid
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from ....employees.models import Employee
+from ....locations.models import Location
+from ...models import WorkHours
+from ...services.work_hours_partition_service import WorkHoursPartitionService
+from ...utils import month_range
+
+
+class Command(BaseCommand):
+    help = "Mierzy czas odczytu miesiąca grafiku dla rosnącej historii WorkHours (dane syntetyczne)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--history-months', type=int, nargs='+', default=[12, 60, 120],
+                            help="Długości historii w miesiącach (kolejne etapy)")
+        parser.add_argument('--employees', type=int, default=100, help="Liczba pracowników")
+        parser.add_argument('--locations', type=int, default=5, help="Liczba lokacji")
+        parser.add_argument('--repeat', type=int, default=5, help="Liczba powtórzeń (liczy się najlepszy czas)")
+
+    def handle(self, *args, **options):
+        history = sorted(set(options['history_months']))
+        if history[0] <= 0 or options['employees'] <= 0 or options['locations'] <= 0:
+            raise CommandError("--history-months, --employees i --locations muszą być dodatnie")
+
+        partitioned = WorkHoursPartitionService.is_partitioned()
+        self.stdout.write(f"Tabela partycjonowana: {'tak' if partitioned else 'nie'} ({connection.vendor})")
+
+        current = date.today().replace(day=1)
+        with transaction.atomic():
+            locations, employees = self._create_tenant(options)
+            queryset = WorkHours.objects.filter(location=locations[0]).in_month(current.year, current.month)
+
+            months_created = 0
+            baseline_ms = None
+            for months in history:
+                self._add_history(current, months_created, months, locations, employees)
+                months_created = months
+                if connection.vendor == 'postgresql':
+                    with connection.cursor() as cursor:
+                        cursor.execute(f"ANALYZE {connection.ops.quote_name(WorkHours._meta.db_table)}")
+
+                elapsed_ms = self._measure(options['repeat'], lambda: list(queryset.values_list(
+                    'id', 'employee_id', 'date', 'hours', 'start_minute', 'duration_minutes'
+                )))
+                baseline_ms = baseline_ms or elapsed_ms
+                total = WorkHours.objects.filter(location__user=locations[0].user).count()
+                line = (f"Historia {months:>4} mies. ({total:>9} wpisów): "
+                        f"{elapsed_ms:8.2f} ms ({elapsed_ms / baseline_ms:.2f}x)")
+                if partitioned:
+                    line += f", partycje w planie: {self._scanned_partitions(queryset)}"
+                self.stdout.write(line)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("Gotowe (dane wycofane)"))
+
+    @staticmethod
+    def _measure(repeat, run):
+        """Najlepszy czas (ms) zapytania."""
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            run()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    @staticmethod
+    def _scanned_partitions(queryset):
+        plan = queryset.explain()
+        return len(set(re.findall(rf"on {WorkHours._meta.db_table}_(p\d{{4}}_\d{{2}}|default)\b", plan)))
+
+    @staticmethod
+    def _create_tenant(options):
+        user = get_user_model().objects.create(username=f"benchmark-{uuid.uuid4().hex[:12]}")
+        locations = Location.objects.bulk_create([
+            Location(user=user, name=f"Lokacja {index + 1}") for index in range(options['locations'])
+        ])
+        employees = Employee.objects.bulk_create([
+            Employee(user=user, full_name=f"Pracownik {index + 1:04d}") for index in range(options['employees'])
+        ])
+        return locations, employees
+
+    @staticmethod
+    def _add_history(current, months_from, months_to, locations, employees):
+        """Grafik wszystkich pracowników na każdy dzień miesięcy months_from..months_to - 1 wstecz od bieżącego."""
+        hours_cycle = ['7:00-15:00', '15:00-23:00', '23:00-7:00', '8:00-20:00', 'DWH']
+        for offset in range(months_from, months_to):
+            index = current.year * 12 + current.month - 1 - offset
+            first, next_first = month_range(index // 12, index % 12 + 1)
+            WorkHoursPartitionService.ensure_partitions(first, first)
+
+            work_hours = []
+            day = first
+            while day < next_first:
+                for employee_index, employee in enumerate(employees):
+                    entry = WorkHours(
+                        employee=employee,
+                        location=locations[employee_index % len(locations)],
+                        date=day,
+                        hours=hours_cycle[(employee_index + day.toordinal()) % len(hours_cycle)]
+                    )
+                    entry.normalize_hours()
+                    work_hours.append(entry)
+                day += timedelta(days=1)
+            WorkHours.objects.bulk_create(work_hours, batch_size=5000)
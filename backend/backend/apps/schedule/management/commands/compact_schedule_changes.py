@@ -0,0 +1,40 @@
+"""
+Kompaktowanie dziennika zmian grafiku (ScheduleChange).
+
+Użycie:
+    python manage.py compact_schedule_changes                     # zmiany zastąpione nowszymi, starsze niż 7 dni
+    python manage.py compact_schedule_changes --older-than-days 1
+    python manage.py compact_schedule_changes --purge-days 90     # + usuń wszystko starsze niż 90 dni
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ...services.schedule_change_service import ScheduleChangeService
+
+
+class Command(BaseCommand):
+    help = "Usuwa z dziennika zmian wpisy zastąpione nowszymi (i opcjonalnie wszystkie stare wpisy)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=7,
+                            help="Kompaktuj zmiany starsze niż N dni (domyślnie 7)")
+        parser.add_argument('--purge-days', type=int,
+                            help="Usuń wszystkie zmiany starsze niż N dni (klienci ze starszym kursorem dostaną reset)")
+
+    def handle(self, *args, **options):
+        if options['older_than_days'] < 0:
+            raise CommandError("--older-than-days nie może być ujemne")
+        if options['purge_days'] is not None and options['purge_days'] < 1:
+            raise CommandError("--purge-days musi być dodatnie")
+
+        now = timezone.now()
+        result = ScheduleChangeService.compact(
+            older_than=now - timedelta(days=options['older_than_days']),
+            purge_before=now - timedelta(days=options['purge_days']) if options['purge_days'] is not None else None
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Usunięto zastąpione zmiany: {result['superseded']}, stare zmiany: {result['purged']}"
+        ))
@@ -0,0 +1,71 @@
+"""
+Zbiorczy skan zgodności grafików (konflikty wielu lokacji i miesięcy).
+
+Użycie:
+    python manage.py compliance_scan --date-from 2025-01-01 --date-to 2025-12-31
+    python manage.py compliance_scan --location <uuid> --date-from 2025-01-01 --date-to 2025-12-31 --workers 8 --output raport.json
+"""
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.compliance_scan_service import ComplianceScanService
+from ....locations.models import Location
+
+
+class Command(BaseCommand):
+    help = "Wykrywa konflikty dla lokacji i miesięcy zakresu równolegle i wypisuje raport zbiorczy."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--location', action='append', dest='locations',
+                            help="UUID lokacji (można podać wielokrotnie; domyślnie wszystkie)")
+        parser.add_argument('--date-from', required=True, help="Początek zakresu (YYYY-MM-DD)")
+        parser.add_argument('--date-to', required=True, help="Koniec zakresu (YYYY-MM-DD)")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Liczba procesów (domyślnie COMPLIANCE_SCAN_MAX_WORKERS)")
+        parser.add_argument('--output', help="Zapisz pełny raport (z konfliktami) do pliku JSON")
+
+    def handle(self, *args, **options):
+        try:
+            date_from = date.fromisoformat(options['date_from'])
+            date_to = date.fromisoformat(options['date_to'])
+        except ValueError:
+            raise CommandError("Nieprawidłowy format daty - oczekiwano YYYY-MM-DD")
+
+        if date_from > date_to:
+            raise CommandError("--date-from musi być wcześniejsze niż --date-to")
+
+        locations = Location.objects.all()
+        if options['locations']:
+            locations = locations.filter(id__in=options['locations'])
+
+        report = ComplianceScanService(
+            location_ids=locations.values_list('id', flat=True),
+            date_from=date_from,
+            date_to=date_to,
+            max_workers=options['workers']
+        ).run()
+
+        for partition in report['partitions']:
+            line = (
+                f"{partition['location_name']} {partition['month']:02d}/{partition['year']}: "
+                f"zmian={partition['shift_count']}, konfliktów={partition['conflict_count']}, "
+                f"{partition['duration_ms']}ms"
+            )
+            if partition['conflict_count']:
+                self.stdout.write(self.style.WARNING(line))
+            else:
+                self.stdout.write(line)
+
+        summary = report['summary']
+        self.stdout.write(self.style.SUCCESS(
+            f"Partycji: {summary['partitions']}, zmian: {summary['shifts']}, konfliktów: {summary['conflicts']}, "
+            f"procesów: {summary['workers']} (pobranie {summary['fetch_ms']}ms, "
+            f"walidacja {summary['validate_ms']}ms, razem {summary['total_ms']}ms)"
+        ))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Raport zapisany: {options['output']}")
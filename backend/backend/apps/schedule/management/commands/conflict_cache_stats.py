@@ -0,0 +1,26 @@
+"""
+Liczniki trafień/chybień cache wyników wykrywania konfliktów.
+
+Użycie:
+    python manage.py conflict_cache_stats
+    python manage.py conflict_cache_stats --reset
+"""
+from django.core.management.base import BaseCommand
+
+from ...services.conflict_cache_service import ConflictCacheService
+
+
+class Command(BaseCommand):
+    help = "Wyświetla (lub zeruje --reset) liczniki cache konfliktów."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Wyzeruj liczniki po wyświetleniu")
+
+    def handle(self, *args, **options):
+        stats = ConflictCacheService.get_stats()
+        ratio = f"{stats['hit_ratio']:.1%}" if stats['hit_ratio'] is not None else "-"
+        self.stdout.write(f"Trafienia: {stats['hits']}, chybienia: {stats['misses']}, skuteczność: {ratio}")
+
+        if options['reset']:
+            ConflictCacheService.reset_stats()
+            self.stdout.write(self.style.SUCCESS("Liczniki wyzerowane"))
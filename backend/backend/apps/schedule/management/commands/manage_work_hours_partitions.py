@@ -0,0 +1,93 @@
+"""
+Partycjonowanie i utrzymanie miesięcznych partycji tabeli WorkHours (PostgreSQL).
+
+Tabelę przepisuje do partycjonowanej jawnie --convert (jednorazowo, w oknie
+serwisowym - tabela jest zablokowana na czas kopiowania); --revert przywraca
+zwykłą tabelę. Uruchamiana z crona (np. raz dziennie) tworzy partycje
+na kolejne miesiące i odłącza partycje starsze niż okres przechowywania;
+na niepartycjonowanej tabeli kończy się błędem.
+
+Użycie:
+    python manage.py manage_work_hours_partitions                       # partycje na WORK_HOURS_PARTITION_MONTHS_AHEAD mies.
+    python manage.py manage_work_hours_partitions --months-ahead 6
+    python manage.py manage_work_hours_partitions --retention-months 36 # + odłącz starsze niż 36 mies.
+    python manage.py manage_work_hours_partitions --retention-months 36 --drop
+    python manage.py manage_work_hours_partitions --list
+    python manage.py manage_work_hours_partitions --convert              # zwykła tabela -> partycjonowana
+    python manage.py manage_work_hours_partitions --revert               # partycjonowana -> zwykła
+"""
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.work_hours_partition_service import WorkHoursPartitionService
+
+
+class Command(BaseCommand):
+    help = "Tworzy partycje WorkHours na kolejne miesiące i odłącza partycje starsze niż okres przechowywania."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.WORK_HOURS_PARTITION_MONTHS_AHEAD,
+                            help="Liczba miesięcy naprzód, dla których muszą istnieć partycje")
+        parser.add_argument('--retention-months', type=int, default=settings.WORK_HOURS_PARTITION_RETENTION_MONTHS,
+                            help="Odłącz partycje miesięcy starszych niż N miesięcy (0 = bez odłączania)")
+        parser.add_argument('--drop', action='store_true',
+                            help="Usuń odłączone partycje zamiast zostawiać je jako tabele archiwalne")
+        parser.add_argument('--list', action='store_true', help="Tylko wypisz partycje")
+        conversion = parser.add_mutually_exclusive_group()
+        conversion.add_argument('--convert', action='store_true',
+                                help="Przepisz zwykłą tabelę WorkHours do partycjonowanej")
+        conversion.add_argument('--revert', action='store_true',
+                                help="Przepisz partycjonowaną tabelę WorkHours do zwykłej")
+
+    def handle(self, *args, **options):
+        if options['months_ahead'] < 0 or options['retention_months'] < 0:
+            raise CommandError("--months-ahead i --retention-months nie mogą być ujemne")
+        if options['drop'] and not options['retention_months']:
+            raise CommandError("--drop wymaga --retention-months")
+
+        if options['revert']:
+            try:
+                WorkHoursPartitionService.unpartition_table()
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS("Gotowe - tabela WorkHours bez partycji"))
+            return
+
+        if options['convert']:
+            try:
+                created = WorkHoursPartitionService.partition_table(options['months_ahead'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(f"Tabela WorkHours partycjonowana, partycje miesięcy: {len(created)}")
+        elif not WorkHoursPartitionService.is_partitioned():
+            raise CommandError(
+                "Tabela WorkHours nie jest partycjonowana (wymaga PostgreSQL) - "
+                "przepisz ją: manage_work_hours_partitions --convert"
+            )
+
+        if not options['list']:
+            current = date.today().replace(day=1)
+            created = WorkHoursPartitionService.ensure_partitions(
+                current, self._add_months(current, options['months_ahead'])
+            )
+            self.stdout.write(f"Utworzone partycje: {', '.join(created) or 'brak'}")
+
+            if options['retention_months']:
+                detached = WorkHoursPartitionService.detach_before(
+                    self._add_months(current, -options['retention_months']), drop=options['drop']
+                )
+                label = "Usunięte" if options['drop'] else "Odłączone"
+                self.stdout.write(f"{label} partycje: {', '.join(detached) or 'brak'}")
+
+        for name, partition_from, partition_to in WorkHoursPartitionService.get_partitions():
+            bounds = f"{partition_from} - {partition_to}" if partition_from else "domyślna"
+            self.stdout.write(f"  {name}: {bounds}")
+
+        self.stdout.write(self.style.SUCCESS("Gotowe"))
+
+    @staticmethod
+    def _add_months(first: date, count: int) -> date:
+        index = first.year * 12 + first.month - 1 + count
+        return date(index // 12, index % 12 + 1, 1)
@@ -0,0 +1,58 @@
+"""
+Przebudowa lub weryfikacja indeksu konfliktów (ScheduleConflict).
+
+Użycie:
+    python manage.py rebuild_conflict_index --date-from 2025-01-01 --date-to 2025-12-31
+    python manage.py rebuild_conflict_index --location <uuid> --date-from 2025-11-01 --date-to 2025-11-30 --verify
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.conflict_index_service import ConflictIndexService
+from ....locations.models import Location
+
+
+class Command(BaseCommand):
+    help = "Przebudowuje (lub weryfikuje --verify) indeks konfliktów dla zakresu dat."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--location', action='append', dest='locations',
+                            help="UUID lokacji (można podać wielokrotnie; domyślnie wszystkie)")
+        parser.add_argument('--date-from', required=True, help="Początek zakresu (YYYY-MM-DD)")
+        parser.add_argument('--date-to', required=True, help="Koniec zakresu (YYYY-MM-DD)")
+        parser.add_argument('--verify', action='store_true',
+                            help="Tylko porównaj indeks z pełnym przeliczeniem, bez zapisu")
+
+    def handle(self, *args, **options):
+        try:
+            date_from = date.fromisoformat(options['date_from'])
+            date_to = date.fromisoformat(options['date_to'])
+        except ValueError:
+            raise CommandError("Nieprawidłowy format daty - oczekiwano YYYY-MM-DD")
+
+        if date_from > date_to:
+            raise CommandError("--date-from musi być wcześniejsze niż --date-to")
+
+        locations = Location.objects.all()
+        if options['locations']:
+            locations = locations.filter(id__in=options['locations'])
+
+        mismatched = 0
+        for location in locations:
+            if options['verify']:
+                mismatches = ConflictIndexService.verify_range(str(location.id), date_from, date_to)
+                for mismatch in mismatches:
+                    mismatched += 1
+                    self.stdout.write(self.style.WARNING(
+                        f"{location.name} {mismatch['month']:02d}/{mismatch['year']}: "
+                        f"brakujące={mismatch['missing']}, nieaktualne={mismatch['stale']}"
+                    ))
+            else:
+                total = ConflictIndexService.rebuild_range(str(location.id), date_from, date_to)
+                self.stdout.write(f"{location.name}: zapisano {total} konfliktów")
+
+        if options['verify'] and mismatched:
+            raise CommandError(f"Indeks niezgodny w {mismatched} miesiącach - uruchom bez --verify")
+
+        self.stdout.write(self.style.SUCCESS("Gotowe"))
@@ -0,0 +1,43 @@
+"""
+Przebudowa sum godzin pracownik-lokacja-miesiąc (MonthlyHoursSummary).
+
+Użycie:
+    python manage.py rebuild_hours_summary --date-from 2025-01-01 --date-to 2025-12-31
+    python manage.py rebuild_hours_summary --location <uuid> --date-from 2025-11-01 --date-to 2025-11-30
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...services.monthly_hours_summary_service import MonthlyHoursSummaryService
+from ....locations.models import Location
+
+
+class Command(BaseCommand):
+    help = "Przelicza sumy godzin pracowników we wszystkich miesiącach zakresu dat."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--location', action='append', dest='locations',
+                            help="UUID lokacji (można podać wielokrotnie; domyślnie wszystkie)")
+        parser.add_argument('--date-from', required=True, help="Początek zakresu (YYYY-MM-DD)")
+        parser.add_argument('--date-to', required=True, help="Koniec zakresu (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        try:
+            date_from = date.fromisoformat(options['date_from'])
+            date_to = date.fromisoformat(options['date_to'])
+        except ValueError:
+            raise CommandError("Nieprawidłowy format daty - oczekiwano YYYY-MM-DD")
+
+        if date_from > date_to:
+            raise CommandError("--date-from musi być wcześniejsze niż --date-to")
+
+        locations = Location.objects.all()
+        if options['locations']:
+            locations = locations.filter(id__in=options['locations'])
+
+        for location in locations:
+            total = MonthlyHoursSummaryService.rebuild_range(str(location.id), date_from, date_to)
+            self.stdout.write(f"{location.name}: zapisano {total} sum")
+
+        self.stdout.write(self.style.SUCCESS("Gotowe"))
@@ -0,0 +1,106 @@
+"""
+Porównanie silnika wektorowego (NumPy) z walidatorami Pythonowymi.
+
+Użycie:
+    python manage.py verify_conflict_engines --synthetic 500 --seed 7
+    python manage.py verify_conflict_engines --date-from 2025-01-01 --date-to 2025-12-31
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import WorkHours
+from ...services.conflicts import ConflictAggregator, ShiftIndex
+from ...services.conflicts.shift_index import ShiftInterval, MINUTES_PER_DAY
+from ...services.conflict_index_service import ConflictIndexService
+from ....locations.models import Location
+
+try:
+    from ...services.conflicts.vectorized_aggregator import VectorizedConflictAggregator
+except ImportError:
+    VectorizedConflictAggregator = None
+
+
+class Command(BaseCommand):
+    help = "Sprawdza zgodność silnika NumPy z walidatorami Pythonowymi (dane z bazy lub syntetyczne)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--synthetic', type=int, default=0,
+                            help="Liczba syntetycznych pracowników (bez dostępu do bazy)")
+        parser.add_argument('--seed', type=int, default=0, help="Ziarno generatora danych syntetycznych")
+        parser.add_argument('--location', action='append', dest='locations', help="UUID lokacji")
+        parser.add_argument('--date-from', help="Początek zakresu (YYYY-MM-DD)")
+        parser.add_argument('--date-to', help="Koniec zakresu (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        if VectorizedConflictAggregator is None:
+            raise CommandError("NumPy nie jest zainstalowany")
+
+        cases = []
+        if options['synthetic']:
+            cases.extend(self._synthetic_cases(options['synthetic'], options['seed']))
+        if options['date_from'] and options['date_to']:
+            cases.extend(self._database_cases(options))
+        if not cases:
+            raise CommandError("Podaj --synthetic N lub --date-from/--date-to")
+
+        failures = 0
+        for label, shift_index, month, year in cases:
+            started = time.perf_counter()
+            expected = ConflictAggregator(shift_index, month, year).detect_all_conflicts()
+            python_ms = (time.perf_counter() - started) * 1000
+
+            started = time.perf_counter()
+            actual = VectorizedConflictAggregator(shift_index, month, year).detect_all_conflicts()
+            numpy_ms = (time.perf_counter() - started) * 1000
+
+            status = "OK"
+            if expected != actual:
+                failures += 1
+                status = "NIEZGODNOŚĆ"
+            self.stdout.write(
+                f"{status} {label}: {len(shift_index)} zmian, python={python_ms:.1f}ms, numpy={numpy_ms:.1f}ms"
+            )
+
+        if failures:
+            raise CommandError(f"Silniki niezgodne w {failures} przypadkach")
+        self.stdout.write(self.style.SUCCESS("Silniki zgodne"))
+
+    def _database_cases(self, options):
+        date_from = date.fromisoformat(options['date_from'])
+        date_to = date.fromisoformat(options['date_to'])
+
+        locations = Location.objects.all()
+        if options['locations']:
+            locations = locations.filter(id__in=options['locations'])
+
+        for location in locations:
+            for year, month in ConflictIndexService.iter_months(date_from, date_to):
+                work_hours = WorkHours.objects.filter(
+                    location_id=location.id,
+                    employee__agreement_type='permanent'
+                ).in_month(year, month).order_by('date')
+                yield f"{location.name} {month:02d}/{year}", ShiftIndex.from_work_hours(work_hours), month, year
+
+    @staticmethod
+    def _synthetic_cases(employee_count, seed):
+        """Losowe grafiki z gęstymi, nocnymi i zbyt długimi zmianami oraz dniami wolnymi."""
+        rng = random.Random(seed)
+        for year, month in [(2025, 1), (2025, 3), (2025, 12), (2026, 2)]:
+            month_start = date(year, month, 1)
+            shifts_by_employee = {}
+            for emp_no in range(employee_count):
+                intervals = []
+                for day_offset in range(31):
+                    work_date = month_start + timedelta(days=day_offset)
+                    if work_date.month != month or rng.random() < 0.3:
+                        continue
+                    start_minute = rng.randrange(0, MINUTES_PER_DAY, 30)
+                    duration = rng.choice([240, 480, 600, 720, 750, 840])
+                    start = work_date.toordinal() * MINUTES_PER_DAY + start_minute
+                    intervals.append(ShiftInterval(work_date, start, start + duration))
+                if intervals:
+                    shifts_by_employee[f"synthetic-{emp_no}"] = intervals
+            yield f"syntetyczne {month:02d}/{year}", ShiftIndex(shifts_by_employee), month, year
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_alter_employee_identification_number'),
+        ('locations', '0004_alter_location_identification_number'),
+        ('schedule', '0004_alter_workhours_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleConflict',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule', models.CharField(choices=[('rest_11h', 'Odpoczynek dobowy 11h'), ('rest_35h', 'Odpoczynek tygodniowy 35h'), ('exceed_12h', 'Zmiana powyżej 12h')], max_length=20, verbose_name='Reguła')),
+                ('date', models.DateField(verbose_name='Data konfliktu')),
+                ('week', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Tydzień ISO')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_conflicts', to='employees.employee', verbose_name='Pracownik')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_conflicts', to='locations.location', verbose_name='Lokacja')),
+            ],
+            options={
+                'verbose_name': 'Konflikt grafiku',
+                'verbose_name_plural': 'Konflikty grafiku',
+                'ordering': ['date', 'employee'],
+                'indexes': [models.Index(fields=['location', 'date'], name='conflict_loc_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'location', 'rule', 'date'), name='schedule_conflict_unique_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.1.7 on 2026-10-18 16:42
+
+import re
+
+from django.db import migrations, models
+
+SHIFT_HOURS_PATTERN = re.compile(r'(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})')
+SHIFT_HOURS_SHORT_PATTERN = re.compile(r'(\d{1,2})-(\d{1,2})')
+
+
+def parse_shift_minutes(hours_str):
+    """Zamrożona kopia utils.parse_shift_minutes (None dla kodów i błędnych godzin)."""
+    if not hours_str or hours_str == '-':
+        return None
+
+    match = SHIFT_HOURS_PATTERN.match(hours_str)
+    if match:
+        start_h, start_m, end_h, end_m = map(int, match.groups())
+    else:
+        match = SHIFT_HOURS_SHORT_PATTERN.match(hours_str)
+        if not match:
+            return None
+        start_h, end_h = map(int, match.groups())
+        start_m = end_m = 0
+
+    start_minute = start_h * 60 + start_m
+    end_minute = end_h * 60 + end_m
+    if start_m >= 60 or end_m >= 60 or start_minute >= 1440 or end_minute > 1440:
+        return None
+    return start_minute, end_minute
+
+
+def fill_structured_hours(apps, schema_editor):
+    """Wypełnia kolumny strukturalne dla istniejących wpisów."""
+    WorkHours = apps.get_model('schedule', 'WorkHours')
+    fields = ['start_minute', 'end_minute', 'duration_minutes', 'is_overnight']
+
+    batch = []
+    for wh in WorkHours.objects.only('id', 'hours').iterator(chunk_size=2000):
+        parsed = parse_shift_minutes(wh.hours)
+        if not parsed:
+            continue
+
+        wh.start_minute, wh.end_minute = parsed
+        wh.is_overnight = wh.end_minute < wh.start_minute
+        wh.duration_minutes = wh.end_minute - wh.start_minute + (1440 if wh.is_overnight else 0)
+        batch.append(wh)
+
+        if len(batch) >= 2000:
+            WorkHours.objects.bulk_update(batch, fields)
+            batch = []
+
+    if batch:
+        WorkHours.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0005_schedule_conflict'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='workhours',
+            name='duration_minutes',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Długość zmiany (minuty)'),
+        ),
+        migrations.AddField(
+            model_name='workhours',
+            name='end_minute',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Koniec zmiany (minuta doby)'),
+        ),
+        migrations.AddField(
+            model_name='workhours',
+            name='is_overnight',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Zmiana nocna'),
+        ),
+        migrations.AddField(
+            model_name='workhours',
+            name='start_minute',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Początek zmiany (minuta doby)'),
+        ),
+        migrations.RunPython(fill_structured_hours, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.7 on 2026-10-18 17:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_alter_location_identification_number'),
+        ('schedule', '0006_workhours_structured_hours'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Rok')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Miesiąc')),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='Wersja')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ostatnia zmiana')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_versions', to='locations.location', verbose_name='Lokacja')),
+            ],
+            options={
+                'verbose_name': 'Wersja grafiku',
+                'verbose_name_plural': 'Wersje grafiku',
+                'constraints': [models.UniqueConstraint(fields=('location', 'year', 'month'), name='schedule_version_unique_month')],
+            },
+        ),
+    ]
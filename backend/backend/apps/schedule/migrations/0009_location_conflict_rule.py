@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_alter_location_identification_number'),
+        ('schedule', '0008_schedule_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationConflictRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule', models.CharField(max_length=50, verbose_name='Reguła')),
+                ('enabled', models.BooleanField(default=True, verbose_name='Włączona')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='conflict_rules', to='locations.location', verbose_name='Lokacja')),
+            ],
+            options={
+                'verbose_name': 'Reguła konfliktów lokacji',
+                'verbose_name_plural': 'Reguły konfliktów lokacji',
+                'constraints': [models.UniqueConstraint(fields=('location', 'rule'), name='location_conflict_rule_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:30
+
+import json
+import logging
+
+from django.db import migrations, models
+from django.db.models import Count
+
+logger = logging.getLogger(__name__)
+
+
+def remove_duplicate_cells(apps, schema_editor):
+    """
+    Przed dodaniem unikalności zostawia jeden wpis na (pracownik, lokacja, dzień).
+
+    Grafik w interfejsie i tak pokazywał tylko jeden z duplikatów; zostaje
+    wpis z godzinami (przed kodem typu "DWH"), potem najwcześniejszy, a przy
+    remisie - pierwszy po id. Kolejność ustalana w Pythonie, więc wynik nie
+    zależy od sortowania NULL w bazie.
+
+    Usunięcia NIE DA SIĘ COFNĄĆ - cofnięcie migracji zdejmuje tylko ograniczenie.
+    Każdy usunięty wpis jest zapisywany w logu (WARNING, pełne wartości pól w JSON),
+    skąd można go odtworzyć ręcznie.
+    """
+    WorkHours = apps.get_model('schedule', 'WorkHours')
+
+    duplicated = (
+        WorkHours.objects.filter(location__isnull=False)
+        .values('employee_id', 'location_id', 'date')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+    )
+    discarded_total = 0
+    for cell in duplicated.iterator():
+        rows = sorted(
+            WorkHours.objects.filter(
+                employee_id=cell['employee_id'],
+                location_id=cell['location_id'],
+                date=cell['date']
+            ).values(),
+            key=lambda row: (row['start_minute'] is None, row['start_minute'] or 0, str(row['id']))
+        )
+        kept, discarded = rows[0], rows[1:]
+        for row in discarded:
+            logger.warning(
+                "Usunięto zduplikowany wpis WorkHours (zachowany %s): %s",
+                kept['id'], json.dumps(row, default=str, sort_keys=True)
+            )
+        WorkHours.objects.filter(pk__in=[row['id'] for row in discarded]).delete()
+        discarded_total += len(discarded)
+
+    if discarded_total:
+        logger.warning("Usunięto %d zduplikowanych wpisów WorkHours", discarded_total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_alter_employee_identification_number'),
+        ('locations', '0004_alter_location_identification_number'),
+        ('schedule', '0009_location_conflict_rule'),
+    ]
+
+    operations = [
+        # Usuniętych duplikatów nie da się odtworzyć - cofnięcie zdejmuje tylko ograniczenie
+        migrations.RunPython(remove_duplicate_cells, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='workhours',
+            constraint=models.UniqueConstraint(fields=('employee', 'location', 'date'), name='workhours_unique_cell'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.7 on 2026-10-18 20:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_alter_employee_identification_number'),
+        ('locations', '0004_alter_location_identification_number'),
+        ('schedule', '0010_workhours_unique_cell'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RotationPattern',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100, verbose_name='Nazwa')),
+                ('cycle', models.JSONField(verbose_name='Cykl zmian')),
+                ('anchor_date', models.DateField(verbose_name='Początek cyklu')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rotation_patterns', to='locations.location', verbose_name='Lokacja')),
+            ],
+            options={
+                'verbose_name': 'Wzorzec rotacji',
+                'verbose_name_plural': 'Wzorce rotacji',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RotationAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_offset', models.PositiveSmallIntegerField(default=0, verbose_name='Przesunięcie w cyklu (dni)')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rotation_assignments', to='employees.employee', verbose_name='Pracownik')),
+                ('pattern', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='schedule.rotationpattern', verbose_name='Wzorzec')),
+            ],
+            options={
+                'verbose_name': 'Przypisanie do rotacji',
+                'verbose_name_plural': 'Przypisania do rotacji',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='rotationpattern',
+            constraint=models.UniqueConstraint(fields=('location', 'name'), name='rotation_pattern_unique_name'),
+        ),
+        migrations.AddConstraint(
+            model_name='rotationassignment',
+            constraint=models.UniqueConstraint(fields=('pattern', 'employee'), name='rotation_assignment_unique_employee'),
+        ),
+    ]
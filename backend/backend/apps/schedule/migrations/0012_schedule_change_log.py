@@ -0,0 +1,47 @@
+# Generated by Django 5.1.7 on 2026-10-18 21:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_alter_location_identification_number'),
+        ('schedule', '0011_rotation_pattern'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleChangeFloor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('purged_seq', models.BigIntegerField(default=0, verbose_name='Usunięte do seq (włącznie)')),
+                ('purged_at', models.DateTimeField(auto_now=True, verbose_name='Ostatnie czyszczenie')),
+                ('location', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_change_floor', to='locations.location', verbose_name='Lokacja')),
+            ],
+            options={
+                'verbose_name': 'Granica dziennika zmian',
+                'verbose_name_plural': 'Granice dziennika zmian',
+            },
+        ),
+        migrations.CreateModel(
+            name='ScheduleChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('employee_id', models.UUIDField(verbose_name='Pracownik')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('op', models.CharField(choices=[('upsert', 'Zapis'), ('delete', 'Usunięcie')], max_length=10, verbose_name='Operacja')),
+                ('work_hours_id', models.UUIDField(blank=True, null=True, verbose_name='Wpis grafiku')),
+                ('hours', models.CharField(blank=True, max_length=50, null=True, verbose_name='Godziny pracy')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Czas zmiany')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_changes', to='locations.location', verbose_name='Lokacja')),
+            ],
+            options={
+                'verbose_name': 'Zmiana grafiku',
+                'verbose_name_plural': 'Dziennik zmian grafiku',
+                'ordering': ['seq'],
+                'indexes': [models.Index(fields=['location', 'seq'], name='schedule_change_loc_seq_idx')],
+            },
+        ),
+    ]
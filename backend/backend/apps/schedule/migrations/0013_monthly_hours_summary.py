@@ -0,0 +1,91 @@
+# Generated by Django 5.1.7 on 2026-10-18 21:40
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+NIGHT_START_MINUTE = 21 * 60
+NIGHT_END_MINUTE = 7 * 60
+
+
+def overlap_minutes(start, end, range_start, range_end):
+    return max(0, min(end, range_end) - max(start, range_start))
+
+
+def summarize(work_date, start_minute, duration):
+    """Zamrożona kopia utils.night_minutes/weekend_minutes: (minuty nocne, minuty weekendowe)."""
+    end = start_minute + duration
+    night_length = 1440 - NIGHT_START_MINUTE + NIGHT_END_MINUTE
+    night = sum(
+        overlap_minutes(start_minute, end, night_start, night_start + night_length)
+        for night_start in (NIGHT_START_MINUTE - 1440, NIGHT_START_MINUTE, NIGHT_START_MINUTE + 1440)
+    )
+    weekend = 0
+    if work_date.weekday() >= 5:
+        weekend += overlap_minutes(start_minute, end, 0, 1440)
+    if (work_date + timedelta(days=1)).weekday() >= 5:
+        weekend += overlap_minutes(start_minute, end, 1440, 2880)
+    return night, weekend
+
+
+def fill_monthly_hours(apps, schema_editor):
+    """Wylicza sumy dla istniejących wpisów."""
+    WorkHours = apps.get_model('schedule', 'WorkHours')
+    MonthlyHoursSummary = apps.get_model('schedule', 'MonthlyHoursSummary')
+
+    totals = {}
+    rows = WorkHours.objects.filter(location__isnull=False).values_list(
+        'employee_id', 'location_id', 'date', 'start_minute', 'duration_minutes'
+    )
+    for employee_id, location_id, work_date, start_minute, duration in rows.iterator(chunk_size=2000):
+        summary = totals.setdefault((employee_id, location_id, work_date.year, work_date.month), [0, 0, 0, 0])
+        if start_minute is None:
+            continue
+        night, weekend = summarize(work_date, start_minute, duration)
+        summary[0] += duration
+        summary[1] += 1
+        summary[2] += night
+        summary[3] += weekend
+
+    MonthlyHoursSummary.objects.bulk_create([
+        MonthlyHoursSummary(
+            employee_id=employee_id, location_id=location_id, year=year, month=month,
+            total_minutes=total, shift_count=shifts, night_minutes=night, weekend_minutes=weekend
+        )
+        for (employee_id, location_id, year, month), (total, shifts, night, weekend) in totals.items()
+    ], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_alter_employee_identification_number'),
+        ('locations', '0004_alter_location_identification_number'),
+        ('schedule', '0012_schedule_change_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyHoursSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Rok')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Miesiąc')),
+                ('total_minutes', models.PositiveIntegerField(default=0, verbose_name='Czas pracy (minuty)')),
+                ('shift_count', models.PositiveSmallIntegerField(default=0, verbose_name='Liczba zmian')),
+                ('night_minutes', models.PositiveIntegerField(default=0, verbose_name='Praca w porze nocnej (minuty)')),
+                ('weekend_minutes', models.PositiveIntegerField(default=0, verbose_name='Praca w weekend (minuty)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Ostatnie przeliczenie')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_hours', to='employees.employee', verbose_name='Pracownik')),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_hours', to='locations.location', verbose_name='Lokacja')),
+            ],
+            options={
+                'verbose_name': 'Suma godzin w miesiącu',
+                'verbose_name_plural': 'Sumy godzin w miesiącach',
+                'indexes': [models.Index(fields=['location', 'year', 'month'], name='monthly_hours_loc_month_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'location', 'year', 'month'), name='monthly_hours_unique_month')],
+            },
+        ),
+        migrations.RunPython(fill_monthly_hours, migrations.RunPython.noop),
+    ]
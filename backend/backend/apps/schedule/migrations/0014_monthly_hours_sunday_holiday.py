@@ -0,0 +1,70 @@
+# Generated by Django 5.1.7 on 2026-10-18 22:10
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+SUNDAY_HOLIDAY_START_MINUTE = 6 * 60
+
+
+def overlap_minutes(start, end, range_start, range_end):
+    return max(0, min(end, range_end) - max(start, range_start))
+
+
+def fill_sunday_holiday_minutes(apps, schema_editor):
+    """
+    Zamrożona kopia podziału HoursBreakdownService dla doby niedzielnej/świątecznej
+    (6:00-6:00; święto w niedzielę tylko jako święto).
+    """
+    WorkHours = apps.get_model('schedule', 'WorkHours')
+    MonthlyHoursSummary = apps.get_model('schedule', 'MonthlyHoursSummary')
+    PublicHoliday = apps.get_model('holidays', 'PublicHoliday')
+    holidays = set(PublicHoliday.objects.values_list('date', flat=True))
+
+    totals = {}
+    rows = WorkHours.objects.filter(location__isnull=False, start_minute__isnull=False).values_list(
+        'employee_id', 'location_id', 'date', 'start_minute', 'duration_minutes'
+    )
+    for employee_id, location_id, work_date, start_minute, duration in rows.iterator(chunk_size=2000):
+        summary = totals.setdefault((employee_id, location_id, work_date.year, work_date.month), [0, 0])
+        end = start_minute + duration
+        for day_offset in (-1, 0, 1):
+            day = work_date + timedelta(days=day_offset)
+            if day in holidays:
+                bucket = 1
+            elif day.weekday() == 6:
+                bucket = 0
+            else:
+                continue
+            window_start = day_offset * 1440 + SUNDAY_HOLIDAY_START_MINUTE
+            summary[bucket] += overlap_minutes(start_minute, end, window_start, window_start + 1440)
+
+    summaries = []
+    for summary in MonthlyHoursSummary.objects.all().iterator(chunk_size=2000):
+        sunday, holiday = totals.get((summary.employee_id, summary.location_id, summary.year, summary.month), (0, 0))
+        if sunday or holiday:
+            summary.sunday_minutes, summary.holiday_minutes = sunday, holiday
+            summaries.append(summary)
+    MonthlyHoursSummary.objects.bulk_update(summaries, ['sunday_minutes', 'holiday_minutes'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('holidays', '0001_initial'),
+        ('schedule', '0013_monthly_hours_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlyhourssummary',
+            name='holiday_minutes',
+            field=models.PositiveIntegerField(default=0, verbose_name='Praca w święto (minuty)'),
+        ),
+        migrations.AddField(
+            model_name='monthlyhourssummary',
+            name='sunday_minutes',
+            field=models.PositiveIntegerField(default=0, verbose_name='Praca w niedzielę (minuty)'),
+        ),
+        migrations.RunPython(fill_sunday_holiday_minutes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.7 on 2026-10-18 22:40
+
+from itertools import groupby
+from operator import itemgetter
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+DAILY_NORM_MINUTES = 8 * 60
+
+
+def fill_daily_overtime_minutes(apps, schema_editor):
+    """
+    Zamrożona kopia MonthlyHoursSummaryService: nadwyżka dnia pracownika (wszystkie
+    lokacje) ponad normę dobową, przypisana kolejnym wg godziny rozpoczęcia zmianom dnia.
+    """
+    WorkHours = apps.get_model('schedule', 'WorkHours')
+    MonthlyHoursSummary = apps.get_model('schedule', 'MonthlyHoursSummary')
+
+    totals = {}
+    rows = WorkHours.objects.filter(location__isnull=False, start_minute__isnull=False).order_by(
+        'employee_id', 'date'
+    ).values_list('employee_id', 'date', 'start_minute', 'location_id', 'duration_minutes')
+    for (employee_id, work_date), shifts in groupby(rows.iterator(chunk_size=2000), key=itemgetter(0, 1)):
+        worked = 0
+        for _, _, _, location_id, duration in sorted(shifts, key=lambda shift: (shift[2], str(shift[3]))):
+            overtime = max(0, worked + duration - DAILY_NORM_MINUTES) - max(0, worked - DAILY_NORM_MINUTES)
+            worked += duration
+            if overtime:
+                key = (employee_id, location_id, work_date.year, work_date.month)
+                totals[key] = totals.get(key, 0) + overtime
+
+    summaries = []
+    for summary in MonthlyHoursSummary.objects.all().iterator(chunk_size=2000):
+        minutes = totals.get((summary.employee_id, summary.location_id, summary.year, summary.month), 0)
+        if minutes:
+            summary.daily_overtime_minutes = minutes
+            summaries.append(summary)
+    MonthlyHoursSummary.objects.bulk_update(summaries, ['daily_overtime_minutes'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0004_alter_location_identification_number'),
+        ('schedule', '0014_monthly_hours_sunday_holiday'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthlyhourssummary',
+            name='daily_overtime_minutes',
+            field=models.PositiveIntegerField(default=0, verbose_name='Praca ponad normę dobową (minuty)'),
+        ),
+        migrations.CreateModel(
+            name='SettlementPeriod',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('months', models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)], verbose_name='Długość okresu (miesiące)')),
+                ('start_date', models.DateField(verbose_name='Początek okresu')),
+                ('location', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='settlement_period', to='locations.location', verbose_name='Lokacja')),
+            ],
+            options={
+                'verbose_name': 'Okres rozliczeniowy lokacji',
+                'verbose_name_plural': 'Okresy rozliczeniowe lokacji',
+            },
+        ),
+        migrations.RunPython(fill_daily_overtime_minutes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-19 09:20
+
+from django.db import migrations
+from django.db.models import Max, Min
+
+
+def fill_schedule_conflicts(apps, schema_editor):
+    """
+    Wypełnia indeks konfliktów dla istniejących wpisów - tabela z 0005 powstała pusta,
+    a lista grafiku czyta konflikty z indeksu.
+
+    Wykrywanie (walidatory, reguły lokacji, rodzaj umowy) jest zbyt rozległe na
+    zamrożoną kopię - migracja przebudowuje indeks tak jak komenda
+    rebuild_conflict_index (ConflictIndexService), dlatego zależy od ostatniej
+    migracji modeli, z których korzysta serwis.
+    """
+    from ..services.conflict_index_service import ConflictIndexService
+
+    WorkHours = apps.get_model('schedule', 'WorkHours')
+    ranges = WorkHours.objects.filter(location__isnull=False).values('location_id').annotate(
+        date_from=Min('date'),
+        date_to=Max('date')
+    ).order_by().values_list('location_id', 'date_from', 'date_to')
+    for location_id, date_from, date_to in ranges:
+        ConflictIndexService.rebuild_range(str(location_id), date_from, date_to)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_alter_employee_identification_number'),
+        ('schedule', '0015_settlement_period'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_schedule_conflicts, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,28 @@
 import uuid
+from django.core.exceptions import ValidationError
+from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
 from ..employees.models import Employee
 from ..locations.models import Location
+from .utils import parse_shift_minutes, shift_duration_minutes, month_range
+
+
+class WorkHoursQuerySet(models.QuerySet):
+    """Filtry dat jako zakresy - obsługiwane przez indeksy (location, date) i (employee, date)."""
+
+    def in_month(self, year, month):
+        """Wpisy miesiąca (date >= 1. dzień AND date < 1. dzień następnego miesiąca)."""
+        first, next_first = month_range(year, month)
+        return self.filter(date__gte=first, date__lt=next_first)
+
+    def in_range(self, date_from=None, date_to=None):
+        """Wpisy z zakresu dat (włącznie); brak granicy = zakres otwarty z tej strony."""
+        queryset = self
+        if date_from is not None:
+            queryset = queryset.filter(date__gte=date_from)
+        if date_to is not None:
+            queryset = queryset.filter(date__lte=date_to)
+        return queryset
 
 
 class WorkHours(models.Model):
@@ -11,6 +32,15 @@ class WorkHours(models.Model):
     date = models.DateField(verbose_name="Data pracy")
     hours = models.CharField(max_length=50, verbose_name="Godziny pracy", help_text="np. 8:00-16:00")
 
+    # Kolumny strukturalne wypełniane przy zapisie na podstawie pola hours.
+    # NULL dla wpisów bez godzin (np. "DWH").
+    start_minute = models.PositiveSmallIntegerField(verbose_name="Początek zmiany (minuta doby)", null=True, blank=True, editable=False)
+    end_minute = models.PositiveSmallIntegerField(verbose_name="Koniec zmiany (minuta doby)", null=True, blank=True, editable=False)
+    duration_minutes = models.PositiveSmallIntegerField(verbose_name="Długość zmiany (minuty)", null=True, blank=True, editable=False)
+    is_overnight = models.BooleanField(verbose_name="Zmiana nocna", default=False, editable=False)
+
+    objects = WorkHoursQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Godziny pracy"
         verbose_name_plural = "Godziny pracy"
@@ -26,8 +56,354 @@ class WorkHours(models.Model):
             models.Index(fields=['date'], name='workhours_date_idx'),
         ]
 
+        # Na partycjonowanej tabeli (PostgreSQL, manage_work_hours_partitions --convert) ograniczenia unikalne
+        # muszą zawierać kolumnę date
+        constraints = [
+            # Jedna komórka grafiku na pracownika, lokację i dzień (klucz upsertu masowego)
+            models.UniqueConstraint(
+                fields=['employee', 'location', 'date'],
+                name='workhours_unique_cell'
+            ),
+        ]
+
         # Kolejność domyślna
         ordering = ['date', 'employee']
 
     def __str__(self):
         return f"{self.employee} - {self.date} - {self.hours}"
+
+    # Pola aktualizowane przez normalize_hours()
+    STRUCTURED_HOURS_FIELDS = ['start_minute', 'end_minute', 'duration_minutes', 'is_overnight']
+
+    def normalize_hours(self):
+        """
+        Wypełnia kolumny strukturalne na podstawie pola hours.
+
+        Wywoływane w save(); operacje masowe (bulk_create/bulk_update)
+        muszą wywołać je same.
+        """
+        try:
+            parsed = parse_shift_minutes(self.hours)
+        except ValueError:
+            parsed = None
+
+        if parsed:
+            self.start_minute, self.end_minute = parsed
+            self.duration_minutes = shift_duration_minutes(*parsed)
+            self.is_overnight = self.end_minute < self.start_minute
+        else:
+            self.start_minute = self.end_minute = self.duration_minutes = None
+            self.is_overnight = False
+
+    def clean(self):
+        super().clean()
+        try:
+            parse_shift_minutes(self.hours)
+        except ValueError as e:
+            raise ValidationError({'hours': str(e)})
+
+    def save(self, *args, **kwargs):
+        self.normalize_hours()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'hours' in update_fields:
+            kwargs['update_fields'] = set(update_fields) | set(self.STRUCTURED_HOURS_FIELDS)
+
+        super().save(*args, **kwargs)
+
+
+class ScheduleConflict(models.Model):
+    """
+    Indeks konfliktów grafiku utrzymywany przy każdym zapisie WorkHours.
+
+    Klucz: pracownik + lokacja + reguła + data. Dla reguły 35h data to
+    poniedziałek tygodnia ISO.
+    """
+    RULE_REST_11H = 'rest_11h'
+    RULE_REST_35H = 'rest_35h'
+    RULE_EXCEED_12H = 'exceed_12h'
+
+    RULE_CHOICES = [
+        (RULE_REST_11H, "Odpoczynek dobowy 11h"),
+        (RULE_REST_35H, "Odpoczynek tygodniowy 35h"),
+        (RULE_EXCEED_12H, "Zmiana powyżej 12h"),
+    ]
+
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='schedule_conflicts', verbose_name="Pracownik")
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='schedule_conflicts', verbose_name="Lokacja")
+    rule = models.CharField(max_length=20, choices=RULE_CHOICES, verbose_name="Reguła")
+    date = models.DateField(verbose_name="Data konfliktu")
+    week = models.PositiveSmallIntegerField(verbose_name="Tydzień ISO", null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Konflikt grafiku"
+        verbose_name_plural = "Konflikty grafiku"
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee', 'location', 'rule', 'date'],
+                name='schedule_conflict_unique_key'
+            ),
+        ]
+
+        indexes = [
+            # Odczyt konfliktów lokacji-miesiąca (endpoint listy)
+            models.Index(fields=['location', 'date'], name='conflict_loc_date_idx'),
+        ]
+
+        ordering = ['date', 'employee']
+
+    def __str__(self):
+        return f"{self.employee} - {self.rule} - {self.date}"
+
+
+class ScheduleVersion(models.Model):
+    """
+    Wersja grafiku lokacji-miesiąca - podbijana przy każdym zapisie WorkHours,
+    który może zmienić wynik wykrywania konfliktów tego miesiąca.
+
+    Trzymana w bazie, więc jest wspólna dla wszystkich workerów.
+    """
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='schedule_versions', verbose_name="Lokacja")
+    year = models.PositiveSmallIntegerField(verbose_name="Rok")
+    month = models.PositiveSmallIntegerField(verbose_name="Miesiąc")
+    version = models.PositiveIntegerField(default=0, verbose_name="Wersja")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Ostatnia zmiana")
+
+    class Meta:
+        verbose_name = "Wersja grafiku"
+        verbose_name_plural = "Wersje grafiku"
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['location', 'year', 'month'],
+                name='schedule_version_unique_month'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.location} - {self.month:02d}.{self.year} - v{self.version}"
+
+
+class LocationConflictRule(models.Model):
+    """
+    Włączenie/wyłączenie reguły konfliktów (klucz z rejestru walidatorów) dla lokacji.
+
+    Brak wiersza oznacza regułę włączoną.
+    """
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='conflict_rules', verbose_name="Lokacja")
+    rule = models.CharField(max_length=50, verbose_name="Reguła")
+    enabled = models.BooleanField(default=True, verbose_name="Włączona")
+
+    class Meta:
+        verbose_name = "Reguła konfliktów lokacji"
+        verbose_name_plural = "Reguły konfliktów lokacji"
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['location', 'rule'],
+                name='location_conflict_rule_unique'
+            ),
+        ]
+
+    def clean(self):
+        super().clean()
+        # Import lokalny - pakiet walidatorów importuje modele
+        from .services.conflicts import validator_registry
+        if self.rule not in validator_registry.rule_keys():
+            raise ValidationError({'rule': f"Nieznana reguła. Dostępne: {', '.join(validator_registry.rule_keys())}"})
+
+    def __str__(self):
+        return f"{self.location} - {self.rule} - {'wł.' if self.enabled else 'wył.'}"
+
+
+class RotationPattern(models.Model):
+    """
+    Nazwany wzorzec rotacji zmian lokacji, np. D-D-N-N-wolne-wolne.
+
+    cycle to lista godzin kolejnych dni cyklu ("7:00-19:00", kod typu "DWH"
+    albo null/"" dla dnia wolnego). Dzień cyklu liczony jest od anchor_date
+    przesuniętej o start_offset pracownika.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='rotation_patterns', verbose_name="Lokacja")
+    name = models.CharField(max_length=100, verbose_name="Nazwa")
+    cycle = models.JSONField(verbose_name="Cykl zmian")
+    anchor_date = models.DateField(verbose_name="Początek cyklu")
+
+    class Meta:
+        verbose_name = "Wzorzec rotacji"
+        verbose_name_plural = "Wzorce rotacji"
+
+        constraints = [
+            models.UniqueConstraint(fields=['location', 'name'], name='rotation_pattern_unique_name'),
+        ]
+
+        ordering = ['name']
+
+    def clean(self):
+        super().clean()
+        if not isinstance(self.cycle, list) or not self.cycle:
+            raise ValidationError({'cycle': "Cykl musi być niepustą listą dni"})
+        for day, hours in enumerate(self.cycle, start=1):
+            if hours in (None, ''):
+                continue
+            try:
+                parse_shift_minutes(hours)
+            except (ValueError, TypeError) as e:
+                raise ValidationError({'cycle': f"Dzień {day}: {e}"})
+
+    def __str__(self):
+        return f"{self.location} - {self.name}"
+
+
+class RotationAssignment(models.Model):
+    """Przypisanie pracownika do wzorca rotacji z przesunięciem w cyklu."""
+    pattern = models.ForeignKey(RotationPattern, on_delete=models.CASCADE, related_name='assignments', verbose_name="Wzorzec")
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='rotation_assignments', verbose_name="Pracownik")
+    start_offset = models.PositiveSmallIntegerField(default=0, verbose_name="Przesunięcie w cyklu (dni)")
+
+    class Meta:
+        verbose_name = "Przypisanie do rotacji"
+        verbose_name_plural = "Przypisania do rotacji"
+
+        constraints = [
+            models.UniqueConstraint(fields=['pattern', 'employee'], name='rotation_assignment_unique_employee'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee} - {self.pattern.name} (+{self.start_offset})"
+
+
+class ScheduleChange(models.Model):
+    """
+    Dziennik zmian komórek grafiku (tylko dopisywanie) dla synchronizacji przyrostowej.
+
+    seq rośnie monotonicznie; klient pamięta ostatni odczytany seq i pobiera
+    tylko nowsze wpisy. Pracownik i wpis WorkHours bez kluczy obcych - wpis
+    o usunięciu musi przetrwać usunięcie pracownika.
+    """
+    OP_UPSERT = 'upsert'
+    OP_DELETE = 'delete'
+    OP_CHOICES = [
+        (OP_UPSERT, 'Zapis'),
+        (OP_DELETE, 'Usunięcie'),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='schedule_changes', verbose_name="Lokacja")
+    employee_id = models.UUIDField(verbose_name="Pracownik")
+    date = models.DateField(verbose_name="Data")
+    op = models.CharField(max_length=10, choices=OP_CHOICES, verbose_name="Operacja")
+    work_hours_id = models.UUIDField(null=True, blank=True, verbose_name="Wpis grafiku")
+    hours = models.CharField(max_length=50, null=True, blank=True, verbose_name="Godziny pracy")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Czas zmiany")
+
+    class Meta:
+        verbose_name = "Zmiana grafiku"
+        verbose_name_plural = "Dziennik zmian grafiku"
+
+        indexes = [
+            # Odczyt "zmiany lokacji od seq" - skan zakresu po indeksie
+            models.Index(fields=['location', 'seq'], name='schedule_change_loc_seq_idx'),
+        ]
+
+        ordering = ['seq']
+
+    def __str__(self):
+        return f"#{self.seq} {self.location} - {self.date} - {self.op}"
+
+
+class ScheduleChangeFloor(models.Model):
+    """
+    Najwyższy seq usunięty z dziennika lokacji przy czyszczeniu (compact_schedule_changes).
+
+    Klient z kursorem poniżej tej wartości mógł stracić zmiany - musi pobrać grafik od nowa.
+    """
+    location = models.OneToOneField(Location, on_delete=models.CASCADE, related_name='schedule_change_floor', verbose_name="Lokacja")
+    purged_seq = models.BigIntegerField(default=0, verbose_name="Usunięte do seq (włącznie)")
+    purged_at = models.DateTimeField(auto_now=True, verbose_name="Ostatnie czyszczenie")
+
+    class Meta:
+        verbose_name = "Granica dziennika zmian"
+        verbose_name_plural = "Granice dziennika zmian"
+
+    def __str__(self):
+        return f"{self.location} - do #{self.purged_seq}"
+
+
+class MonthlyHoursSummary(models.Model):
+    """
+    Sumy godzin pracownika w lokacji-miesiącu, utrzymywane przy każdym zapisie WorkHours.
+
+    Raporty, PDF i dashboardy czytają gotowe sumy zamiast przeliczać teksty godzin.
+    Zmiana należy do miesiąca swojej daty (także nocna kończąca się 1. dnia następnego).
+    Składniki nocne/niedzielne/świąteczne - patrz HoursBreakdownService.
+    Operacje masowe przeliczają sumy same (MonthlyHoursSummaryService.rebuild_range).
+    Praca ponad normę dobową liczona jest z całego dnia pracownika we wszystkich
+    lokacjach - suma pola po lokacjach daje nadgodziny dobowe pracownika.
+    """
+    employee = models.ForeignKey(Employee, on_delete=models.CASCADE, related_name='monthly_hours', verbose_name="Pracownik")
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='monthly_hours', verbose_name="Lokacja")
+    year = models.PositiveSmallIntegerField(verbose_name="Rok")
+    month = models.PositiveSmallIntegerField(verbose_name="Miesiąc")
+    total_minutes = models.PositiveIntegerField(default=0, verbose_name="Czas pracy (minuty)")
+    shift_count = models.PositiveSmallIntegerField(default=0, verbose_name="Liczba zmian")
+    night_minutes = models.PositiveIntegerField(default=0, verbose_name="Praca w porze nocnej (minuty)")
+    weekend_minutes = models.PositiveIntegerField(default=0, verbose_name="Praca w weekend (minuty)")
+    sunday_minutes = models.PositiveIntegerField(default=0, verbose_name="Praca w niedzielę (minuty)")
+    holiday_minutes = models.PositiveIntegerField(default=0, verbose_name="Praca w święto (minuty)")
+    daily_overtime_minutes = models.PositiveIntegerField(default=0, verbose_name="Praca ponad normę dobową (minuty)")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Ostatnie przeliczenie")
+
+    class Meta:
+        verbose_name = "Suma godzin w miesiącu"
+        verbose_name_plural = "Sumy godzin w miesiącach"
+
+        constraints = [
+            models.UniqueConstraint(
+                fields=['employee', 'location', 'year', 'month'],
+                name='monthly_hours_unique_month'
+            ),
+        ]
+
+        indexes = [
+            # Odczyt sum lokacji-miesiąca (PDF, lista)
+            models.Index(fields=['location', 'year', 'month'], name='monthly_hours_loc_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee} - {self.location} - {self.month:02d}.{self.year}"
+
+
+class SettlementPeriod(models.Model):
+    """
+    Okres rozliczeniowy czasu pracy lokacji (art. 129 KP): od 1 do 12 miesięcy.
+
+    Okresy następują po sobie od start_date (1. dzień miesiąca) w obie strony osi czasu.
+    Brak wiersza oznacza okres jednomiesięczny.
+    """
+    location = models.OneToOneField(
+        Location,
+        on_delete=models.CASCADE,
+        related_name='settlement_period',
+        verbose_name="Lokacja"
+    )
+    months = models.PositiveSmallIntegerField(
+        default=1,
+        validators=[MinValueValidator(1), MaxValueValidator(12)],
+        verbose_name="Długość okresu (miesiące)"
+    )
+    start_date = models.DateField(verbose_name="Początek okresu")
+
+    class Meta:
+        verbose_name = "Okres rozliczeniowy lokacji"
+        verbose_name_plural = "Okresy rozliczeniowe lokacji"
+
+    def clean(self):
+        super().clean()
+        if self.start_date and self.start_date.day != 1:
+            raise ValidationError({'start_date': "Okres musi zaczynać się 1. dnia miesiąca"})
+
+    def __str__(self):
+        return f"{self.location} - {self.months} mies. od {self.start_date:%m.%Y}"
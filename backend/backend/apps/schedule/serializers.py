@@ -1,13 +1,225 @@
-from rest_framework import serializers
-from .models import WorkHours
-
-
-class WorkHoursSerializer(serializers.ModelSerializer):
-    employee_name = serializers.CharField(source='employee.__str__', read_only=True)
-    location_name = serializers.CharField(source='location.name', read_only=True)
-
-    class Meta:
-        model = WorkHours
-        fields = ['id', 'employee', 'employee_name', 'location', 'location_name', 'date', 'hours']
-
-
+from django.db import transaction
+from rest_framework import serializers
+from ..employees.models import Employee
+from ..locations.models import Location
+from .models import WorkHours, RotationPattern, RotationAssignment
+from .utils import parse_shift_minutes
+
+
+class WorkHoursSerializer(serializers.ModelSerializer):
+    employee_name = serializers.CharField(source='employee.__str__', read_only=True)
+    location_name = serializers.CharField(source='location.name', read_only=True)
+
+    class Meta:
+        model = WorkHours
+        fields = ['id', 'employee', 'employee_name', 'location', 'location_name', 'date', 'hours']
+
+    def validate_hours(self, value):
+        """Sprawdza zakres godzin (kody typu "DWH" są dozwolone)."""
+        try:
+            parse_shift_minutes(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+    def validate(self, attrs):
+        """Jeden wpis na pracownika, lokację i dzień (klucz naturalny komórki grafiku)."""
+        attrs = super().validate(attrs)
+        employee = attrs.get('employee', getattr(self.instance, 'employee', None))
+        location = attrs.get('location', getattr(self.instance, 'location', None))
+        work_date = attrs.get('date', getattr(self.instance, 'date', None))
+
+        if employee is not None and location is not None and work_date is not None:
+            duplicates = WorkHours.objects.filter(employee=employee, location=location, date=work_date)
+            if self.instance is not None:
+                duplicates = duplicates.exclude(pk=self.instance.pk)
+            if duplicates.exists():
+                raise serializers.ValidationError({'date': "Pracownik ma już wpis w tej lokacji w tym dniu"})
+
+        return attrs
+
+
+class WorkHoursCellSerializer(serializers.Serializer):
+    """Komórka grafiku w zapisie masowym; puste hours czyści komórkę."""
+    employee = serializers.UUIDField()
+    date = serializers.DateField()
+    hours = serializers.CharField(max_length=50, allow_null=True, allow_blank=True, required=False, default=None)
+
+    def validate_hours(self, value):
+        if not value:
+            return None
+        try:
+            parse_shift_minutes(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+
+class WorkHoursBulkSerializer(serializers.Serializer):
+    """
+    Zapis masowy grafiku lokacji-miesiąca.
+
+    Lokacja i pracownicy sprawdzani są jednym zapytaniem każde (bez zapytania na komórkę).
+    """
+    location = serializers.UUIDField()
+    month = serializers.IntegerField(min_value=1, max_value=12)
+    year = serializers.IntegerField(min_value=1900, max_value=2100)
+    mode = serializers.ChoiceField(choices=['merge', 'replace'], default='merge')
+    cells = WorkHoursCellSerializer(many=True, allow_empty=True)
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+
+        if not Location.objects.filter(id=attrs['location'], user=user).exists():
+            raise serializers.ValidationError({'location': "Lokacja nie istnieje"})
+
+        outside = [
+            str(cell['date']) for cell in attrs['cells']
+            if (cell['date'].year, cell['date'].month) != (attrs['year'], attrs['month'])
+        ]
+        if outside:
+            raise serializers.ValidationError({'cells': f"Daty spoza miesiąca grafiku: {', '.join(outside[:5])}"})
+
+        employee_ids = {cell['employee'] for cell in attrs['cells']}
+        known = set(Employee.objects.filter(id__in=employee_ids, user=user).values_list('id', flat=True))
+        unknown = employee_ids - known
+        if unknown:
+            raise serializers.ValidationError({'cells': f"Nieznani pracownicy: {', '.join(sorted(map(str, unknown)))}"})
+
+        return attrs
+
+
+class WorkHoursCopySerializer(serializers.Serializer):
+    """Kopiowanie grafiku lokacji z zakresu źródłowego do docelowego."""
+    MAX_TARGET_DAYS = 93
+
+    location = serializers.UUIDField()
+    source_from = serializers.DateField()
+    source_to = serializers.DateField()
+    target_from = serializers.DateField()
+    target_to = serializers.DateField(required=False, allow_null=True, default=None)
+    align = serializers.ChoiceField(choices=['weekday', 'date'], default='weekday')
+    employees = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=True, default=list)
+    overwrite = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not Location.objects.filter(id=attrs['location'], user=self.context['request'].user).exists():
+            raise serializers.ValidationError({'location': "Lokacja nie istnieje"})
+
+        if attrs['source_from'] > attrs['source_to']:
+            raise serializers.ValidationError({'source_to': "Koniec zakresu źródłowego przed początkiem"})
+
+        target_to = attrs['target_to'] or attrs['target_from'] + (attrs['source_to'] - attrs['source_from'])
+        if attrs['target_from'] > target_to:
+            raise serializers.ValidationError({'target_to': "Koniec zakresu docelowego przed początkiem"})
+        if (target_to - attrs['target_from']).days >= self.MAX_TARGET_DAYS:
+            raise serializers.ValidationError({'target_to': f"Zakres docelowy może mieć najwyżej {self.MAX_TARGET_DAYS} dni"})
+        if attrs['target_from'] <= attrs['source_to'] and attrs['source_from'] <= target_to:
+            raise serializers.ValidationError({'target_from': "Zakres docelowy nie może nachodzić na źródłowy"})
+
+        return attrs
+
+
+class RotationAssignmentSerializer(serializers.ModelSerializer):
+    employee_name = serializers.CharField(source='employee.__str__', read_only=True)
+
+    class Meta:
+        model = RotationAssignment
+        fields = ['employee', 'employee_name', 'start_offset']
+
+
+class RotationPatternSerializer(serializers.ModelSerializer):
+    """
+    Wzorzec rotacji z przypisaniami pracowników.
+
+    Zapis z polem assignments zastępuje wszystkie przypisania wzorca.
+    """
+    location_name = serializers.CharField(source='location.name', read_only=True)
+    assignments = RotationAssignmentSerializer(many=True, required=False)
+
+    class Meta:
+        model = RotationPattern
+        fields = ['id', 'location', 'location_name', 'name', 'cycle', 'anchor_date', 'assignments']
+
+    def validate_location(self, value):
+        if value.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError("Lokacja nie istnieje")
+        return value
+
+    def validate_cycle(self, value):
+        """Niepusta lista godzin dni cyklu; null/"" to dzień wolny."""
+        if not isinstance(value, list) or not value:
+            raise serializers.ValidationError("Cykl musi być niepustą listą dni")
+        for day, hours in enumerate(value, start=1):
+            if hours in (None, ''):
+                continue
+            if not isinstance(hours, str):
+                raise serializers.ValidationError(f"Dzień {day}: oczekiwano godzin jako tekstu")
+            try:
+                parse_shift_minutes(hours)
+            except ValueError as e:
+                raise serializers.ValidationError(f"Dzień {day}: {e}")
+        return value
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        location = attrs.get('location', getattr(self.instance, 'location', None))
+        name = attrs.get('name', getattr(self.instance, 'name', None))
+
+        duplicates = RotationPattern.objects.filter(location=location, name=name)
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError({'name': "Wzorzec o tej nazwie już istnieje w lokacji"})
+
+        assignments = attrs.get('assignments')
+        if assignments is not None:
+            employees = [assignment['employee'] for assignment in assignments]
+            if len(set(employees)) != len(employees):
+                raise serializers.ValidationError({'assignments': "Pracownik przypisany więcej niż raz"})
+            foreign = [str(employee) for employee in employees if employee.user_id != self.context['request'].user.id]
+            if foreign:
+                raise serializers.ValidationError({'assignments': f"Nieznani pracownicy: {', '.join(foreign)}"})
+
+        return attrs
+
+    @transaction.atomic
+    def create(self, validated_data):
+        assignments = validated_data.pop('assignments', [])
+        pattern = super().create(validated_data)
+        self._save_assignments(pattern, assignments)
+        return pattern
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        assignments = validated_data.pop('assignments', None)
+        pattern = super().update(instance, validated_data)
+        if assignments is not None:
+            pattern.assignments.all().delete()
+            self._save_assignments(pattern, assignments)
+        return pattern
+
+    @staticmethod
+    def _save_assignments(pattern, assignments):
+        RotationAssignment.objects.bulk_create([
+            RotationAssignment(pattern=pattern, **assignment) for assignment in assignments
+        ])
+
+
+class RotationGenerateSerializer(serializers.Serializer):
+    """Generowanie grafiku z wzorca rotacji dla zakresu dat."""
+    MAX_DAYS = 186
+
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    employees = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=True, default=list)
+    overwrite = serializers.BooleanField(default=False)
+    dry_run = serializers.BooleanField(default=False)
+    force = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if attrs['date_from'] > attrs['date_to']:
+            raise serializers.ValidationError({'date_to': "Koniec zakresu przed początkiem"})
+        if (attrs['date_to'] - attrs['date_from']).days >= self.MAX_DAYS:
+            raise serializers.ValidationError({'date_to': f"Zakres może mieć najwyżej {self.MAX_DAYS} dni"})
+        return attrs
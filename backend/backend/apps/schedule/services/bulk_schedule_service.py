@@ -0,0 +1,146 @@
+"""
+Masowy zapis komórek grafiku (upsert po pracowniku i dacie).
+"""
+from calendar import monthrange
+from datetime import date
+from typing import Dict, Any, List
+
+from django.db import transaction
+
+from ..models import WorkHours
+from ..signals import suspend_conflict_signals
+from .conflict_index_service import ConflictIndexService
+from .monthly_hours_summary_service import MonthlyHoursSummaryService
+from .schedule_change_service import ScheduleChangeService
+from .schedule_version_service import ScheduleVersionService
+
+
+class BulkScheduleService:
+    """
+    Zapisuje zmiany wielu komórek grafiku jednej lokacji-miesiąca w jednej transakcji.
+
+    Komórka to (pracownik, data, godziny); puste godziny oznaczają wyczyszczenie.
+    Klucz naturalny (pracownik, lokacja, data) jest unikalny, więc powtórzenie
+    tego samego żądania nie zmienia już danych.
+
+    Zamiast przeliczania konfliktów po każdej komórce (sygnały są wstrzymane)
+    indeks konfliktów i wersje grafiku odświeżane są raz, na końcu.
+    """
+
+    MODE_MERGE = 'merge'
+    MODE_REPLACE = 'replace'
+
+    def __init__(self, location_id: str, month: int, year: int,
+                 cells: List[Dict[str, Any]], mode: str = MODE_MERGE):
+        """
+        Args:
+            location_id: UUID lokacji
+            month: Miesiąc grafiku (1-12) - wszystkie komórki muszą do niego należeć
+            year: Rok grafiku
+            cells: [{'employee': UUID, 'date': date, 'hours': str | None}, ...]
+            mode: 'merge' - zmieniane są tylko podane komórki,
+                  'replace' - podane komórki to cały grafik miesiąca (pozostałe są czyszczone)
+        """
+        self.location_id = location_id
+        self.month = month
+        self.year = year
+        self.cells = cells
+        self.mode = mode
+        self.month_start = date(year, month, 1)
+        self.month_end = date(year, month, monthrange(year, month)[1])
+
+    def apply(self) -> Dict[str, int]:
+        """
+        Wykonuje zapis.
+
+        Returns:
+            {'created': n, 'updated': n, 'deleted': n}
+        """
+        # Ostatnia zmiana danej komórki wygrywa
+        cells = {(str(cell['employee']), cell['date']): cell['hours'] or None for cell in self.cells}
+
+        existing = self._get_existing(cells)
+        to_create, to_update, to_delete = [], [], []
+
+        for (employee_id, work_date), hours in cells.items():
+            current = existing.pop((employee_id, work_date), None)
+            if hours is None:
+                if current is not None:
+                    to_delete.append(current)
+            elif current is None:
+                to_create.append(WorkHours(
+                    employee_id=employee_id,
+                    location_id=self.location_id,
+                    date=work_date,
+                    hours=hours
+                ))
+            elif current.hours != hours:
+                current.hours = hours
+                to_update.append(current)
+
+        if self.mode == self.MODE_REPLACE:
+            # Pozostałe wpisy miesiąca nie występują w nowym grafiku
+            to_delete.extend(existing.values())
+
+        for work_hours in to_create + to_update:
+            work_hours.normalize_hours()
+
+        changed = to_create + to_update + to_delete
+        if changed:
+            with transaction.atomic(), suspend_conflict_signals():
+                if to_delete:
+                    WorkHours.objects.filter(pk__in=[work_hours.pk for work_hours in to_delete]).delete()
+                WorkHours.objects.bulk_create(
+                    to_create,
+                    update_conflicts=True,
+                    unique_fields=['employee', 'location', 'date'],
+                    update_fields=['hours', *WorkHours.STRUCTURED_HOURS_FIELDS]
+                )
+                WorkHours.objects.bulk_update(
+                    to_update,
+                    fields=['hours', *WorkHours.STRUCTURED_HOURS_FIELDS]
+                )
+
+                # Jedno przeliczenie konfliktów: miesiąc grafiku i sąsiedni, jeśli
+                # zmiany leżą w tygodniu na przełomie miesięcy
+                changed_dates = [work_hours.date for work_hours in changed]
+                self._refresh_conflicts(min(changed_dates), max(changed_dates))
+
+                ScheduleChangeService.record(
+                    [ScheduleChangeService.upsert(work_hours) for work_hours in to_create + to_update]
+                    + [
+                        ScheduleChangeService.delete(self.location_id, work_hours.employee_id, work_hours.date, work_hours.pk)
+                        for work_hours in to_delete
+                    ]
+                )
+
+        return {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'deleted': len(to_delete)
+        }
+
+    def _refresh_conflicts(self, date_from: date, date_to: date) -> None:
+        months = ScheduleVersionService.affected_months(date_from, date_to)
+        first_year, first_month = months[0]
+        last_year, last_month = months[-1]
+        ConflictIndexService.rebuild_range(
+            self.location_id,
+            date(first_year, first_month, 1),
+            date(last_year, last_month, 1)
+        )
+        ScheduleVersionService.bump_range(self.location_id, date_from, date_to)
+        MonthlyHoursSummaryService.rebuild_range(self.location_id, date_from, date_to)
+
+    def _get_existing(self, cells) -> Dict[tuple, WorkHours]:
+        """Pobiera istniejące wpisy komórek (lub całego miesiąca w trybie replace) jednym zapytaniem."""
+        queryset = WorkHours.objects.filter(
+            location_id=self.location_id,
+            date__gte=self.month_start,
+            date__lte=self.month_end
+        ).only('id', 'employee_id', 'location_id', 'date', 'hours')
+
+        if self.mode != self.MODE_REPLACE:
+            queryset = queryset.filter(employee_id__in={employee_id for employee_id, _ in cells})
+
+        return {(str(work_hours.employee_id), work_hours.date): work_hours for work_hours in queryset}
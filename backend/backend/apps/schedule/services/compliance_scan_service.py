@@ -0,0 +1,178 @@
+"""
+Zbiorczy skan zgodności grafików (wiele lokacji i miesięcy naraz).
+"""
+import multiprocessing
+import time
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+import django
+from django.conf import settings
+
+from ...locations.models import Location
+from ..models import WorkHours
+from .conflict_detection_service import ConflictDetectionService
+from .conflict_index_service import ConflictIndexService
+from .conflict_rule_service import ConflictRuleService
+from .conflicts import ShiftIndex, ShiftInterval
+from .conflicts.shift_index import MINUTES_PER_DAY
+
+
+def scan_partition(partition: Tuple[str, int, int, Dict[str, List[ShiftInterval]], Set[str]]) -> Dict[str, Any]:
+    """
+    Waliduje jedną partycję (lokacja, rok, miesiąc) - wykonywane w procesie roboczym.
+
+    Dostaje gotowe zmiany z całego okna miesiąca i włączone reguły, więc nie odpytuje bazy.
+    """
+    location_id, year, month, shifts_by_employee, rules = partition
+    started = time.perf_counter()
+    shift_index = ShiftIndex(shifts_by_employee)
+    detection = ConflictDetectionService(location_id, month, year)
+    conflicts = detection.detect_for_shift_index(shift_index, rules=rules)
+    return {
+        'location': location_id,
+        'year': year,
+        'month': month,
+        'shift_count': len(shift_index),
+        'conflict_count': (
+            len(conflicts['rest_11h'])
+            + len(conflicts['exceed_12h'])
+            + sum(len(weeks) for weeks in conflicts['rest_35h'].values())
+        ),
+        'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        'validators': detection.get_timings(),
+        'conflicts': conflicts
+    }
+
+
+class ComplianceScanService:
+    """
+    Skan konfliktów dla zbioru lokacji i zakresu miesięcy.
+
+    - zmiany wszystkich lokacji pobierane są jednym zapytaniem zakresowym,
+    - w procesie głównym dzielone na partycje (lokacja, miesiąc) z oknem
+      miesiąca (ConflictDetectionService.month_window),
+    - partycje walidowane równolegle w ProcessPoolExecutor (procesy startowane
+      przez 'spawn' - nie dziedziczą połączeń z bazą) od
+      COMPLIANCE_SCAN_PARALLEL_THRESHOLD zmian, mniejsze skany w procesie głównym,
+    - wynik to jeden raport z czasem każdej partycji.
+
+    Skanowane są pełne miesiące, które przecina zakres dat.
+    """
+
+    def __init__(self, location_ids: Iterable[str], date_from: date, date_to: date,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            location_ids: UUID lokacji
+            date_from: Początek zakresu (miesiąc tej daty jest skanowany w całości)
+            date_to: Koniec zakresu (włącznie)
+            max_workers: Liczba procesów (domyślnie COMPLIANCE_SCAN_MAX_WORKERS); 1 = bez puli
+        """
+        self.location_ids = [str(location_id) for location_id in location_ids]
+        self.date_from = date_from
+        self.date_to = date_to
+        self.max_workers = max_workers or settings.COMPLIANCE_SCAN_MAX_WORKERS
+        self.months = list(ConflictIndexService.iter_months(date_from, date_to))
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Wykonuje skan.
+
+        Returns:
+            {
+                'date_from': 'YYYY-MM-DD', 'date_to': 'YYYY-MM-DD',
+                'partitions': [{'location', 'location_name', 'year', 'month', 'shift_count',
+                                'conflict_count', 'duration_ms', 'validators', 'conflicts'}, ...],
+                'summary': {'partitions', 'shifts', 'conflicts', 'workers',
+                            'fetch_ms', 'validate_ms', 'total_ms'}
+            }
+        """
+        started = time.perf_counter()
+        partitions = self._build_partitions(self._fetch_shifts())
+        fetched = time.perf_counter()
+
+        # Start procesów kosztuje ~sekundę - pula opłaca się dopiero przy dużych skanach
+        shift_count = sum(len(shifts) for partition in partitions for shifts in partition[3].values())
+        workers = min(self.max_workers, len(partitions))
+        if workers > 1 and shift_count >= settings.COMPLIANCE_SCAN_PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=django.setup
+            ) as executor:
+                results = list(executor.map(scan_partition, partitions))
+        else:
+            workers = 1
+            results = [scan_partition(partition) for partition in partitions]
+        finished = time.perf_counter()
+
+        location_names = {
+            str(location_id): name
+            for location_id, name in Location.objects.filter(id__in=self.location_ids).values_list('id', 'name')
+        }
+        for result in results:
+            result['location_name'] = location_names.get(result['location'])
+
+        return {
+            'date_from': self.date_from.isoformat(),
+            'date_to': self.date_to.isoformat(),
+            'partitions': results,
+            'summary': {
+                'partitions': len(results),
+                'shifts': sum(result['shift_count'] for result in results),
+                'conflicts': sum(result['conflict_count'] for result in results),
+                'workers': workers,
+                'fetch_ms': round((fetched - started) * 1000, 2),
+                'validate_ms': round((finished - fetched) * 1000, 2),
+                'total_ms': round((finished - started) * 1000, 2)
+            }
+        }
+
+    def _fetch_shifts(self) -> Dict[str, Tuple[List[date], List[tuple]]]:
+        """
+        Pobiera zmiany UoP wszystkich lokacji z okna całego zakresu jednym zapytaniem.
+
+        Returns:
+            {location_id: (posortowane daty, [(employee_id, ShiftInterval), ...])}
+        """
+        if not self.location_ids or not self.months:
+            return {}
+
+        window_from, _ = ConflictDetectionService.month_window(*self.months[0])
+        _, window_to = ConflictDetectionService.month_window(*self.months[-1])
+        rows = WorkHours.objects.filter(
+            location_id__in=self.location_ids,
+            date__gte=window_from,
+            date__lt=window_to,
+            start_minute__isnull=False,
+            employee__agreement_type='permanent'  # Tylko UoP
+        ).order_by('location_id', 'date').values_list(
+            'location_id', 'employee_id', 'date', 'start_minute', 'duration_minutes'
+        )
+
+        shifts_by_location = {}
+        for location_id, employee_id, work_date, start_minute, duration in rows:
+            dates, shifts = shifts_by_location.setdefault(str(location_id), ([], []))
+            start = work_date.toordinal() * MINUTES_PER_DAY + start_minute
+            dates.append(work_date)
+            shifts.append((str(employee_id), ShiftInterval(work_date, start, start + duration)))
+        return shifts_by_location
+
+    def _build_partitions(self, shifts_by_location) -> List[tuple]:
+        """Dzieli pobrane zmiany na partycje (lokacja, rok, miesiąc, zmiany okna, reguły)."""
+        rules_by_location = ConflictRuleService.get_enabled_rules_bulk(self.location_ids)
+        partitions = []
+        for location_id in self.location_ids:
+            dates, shifts = shifts_by_location.get(location_id, ([], []))
+            for year, month in self.months:
+                window_from, window_to = ConflictDetectionService.month_window(year, month)
+                shifts_by_employee = {}
+                for employee_id, interval in shifts[bisect_left(dates, window_from):bisect_left(dates, window_to)]:
+                    shifts_by_employee.setdefault(employee_id, []).append(interval)
+                for intervals in shifts_by_employee.values():
+                    intervals.sort()
+                partitions.append((location_id, year, month, shifts_by_employee, rules_by_location[location_id]))
+        return partitions
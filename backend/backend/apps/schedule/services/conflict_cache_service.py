@@ -0,0 +1,99 @@
+"""
+Cache wyników wykrywania konfliktów lokacji-miesiąca.
+"""
+from typing import Dict, Any, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from ..models import WorkHours
+from .conflict_detection_service import ConflictDetectionService
+from .schedule_version_service import ScheduleVersionService
+
+
+class ConflictCacheService:
+    """
+    Cache wokół ConflictDetectionService.detect_all_conflicts().
+
+    Klucz: (lokacja, miesiąc, rok, wersja grafiku). Każdy zapis WorkHours
+    podbija wersję, więc wpis z nieaktualnej wersji nigdy nie zostanie
+    odczytany - stare wpisy po prostu wygasają.
+
+    Backend to osobny alias CONFLICT_CACHE_ALIAS (domyślnie plikowy), wspólny
+    dla wszystkich workerów gunicorna. Liczniki trafień/chybień trzymane są
+    w tym samym cache (incr na backendzie plikowym/bazodanowym nie jest
+    atomowy - liczniki są przybliżone).
+    """
+
+    KEY_PREFIX = 'conflicts'
+    HITS_KEY = 'conflicts:stats:hits'
+    MISSES_KEY = 'conflicts:stats:misses'
+
+    @staticmethod
+    def detect_all_conflicts(location_id: str, month: int, year: int,
+                             work_hours: Optional[Iterable[WorkHours]] = None) -> Dict[str, Any]:
+        """
+        Zwraca konflikty lokacji-miesiąca z cache lub przelicza je i zapisuje.
+
+        Args:
+            work_hours: Opcjonalnie już pobrane wpisy (patrz ConflictDetectionService) -
+                używane tylko przy chybieniu
+        """
+        cache = ConflictCacheService._get_cache()
+        version = ScheduleVersionService.get_version(location_id, month, year)
+        key = ConflictCacheService.cache_key(location_id, month, year, version)
+
+        conflicts = cache.get(key)
+        if conflicts is not None:
+            ConflictCacheService._incr(ConflictCacheService.HITS_KEY)
+            return conflicts
+
+        ConflictCacheService._incr(ConflictCacheService.MISSES_KEY)
+        conflicts = ConflictDetectionService(
+            location_id=location_id,
+            month=month,
+            year=year
+        ).detect_all_conflicts(work_hours=work_hours)
+        cache.set(key, conflicts, settings.CONFLICT_CACHE_TIMEOUT)
+        return conflicts
+
+    @staticmethod
+    def cache_key(location_id: str, month: int, year: int, version: int) -> str:
+        return f"{ConflictCacheService.KEY_PREFIX}:{location_id}:{year}:{month}:v{version}"
+
+    # === STATYSTYKI ===
+
+    @staticmethod
+    def get_stats() -> Dict[str, Any]:
+        """Zwraca liczniki trafień/chybień i współczynnik trafień."""
+        cache = ConflictCacheService._get_cache()
+        hits = cache.get(ConflictCacheService.HITS_KEY, 0)
+        misses = cache.get(ConflictCacheService.MISSES_KEY, 0)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else None
+        }
+
+    @staticmethod
+    def reset_stats() -> None:
+        cache = ConflictCacheService._get_cache()
+        cache.delete_many([ConflictCacheService.HITS_KEY, ConflictCacheService.MISSES_KEY])
+
+    # === HELPER METHODS ===
+
+    @staticmethod
+    def _get_cache():
+        return caches[settings.CONFLICT_CACHE_ALIAS]
+
+    @staticmethod
+    def _incr(key: str) -> None:
+        cache = ConflictCacheService._get_cache()
+        # add() nie nadpisuje istniejącego licznika; liczniki nie wygasają
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Licznik usunięty równolegle (reset_stats)
+            cache.add(key, 1, timeout=None)
@@ -1,6 +1,13 @@
-from typing import Dict, Any
-from ..models import WorkHours, Employee
-from .conflicts import ConflictAggregator
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from django.db.models import Q
+
+from ..models import WorkHours
+from ..utils import month_range
+from .conflict_rule_service import ConflictRuleService
+from .conflicts import ShiftIndex, create_conflict_aggregator
 
 
 class ConflictDetectionService:
@@ -11,6 +18,9 @@ class ConflictDetectionService:
     Single Responsibility: dostarcza interfejs dla ViewSet.
     """
 
+    # Ile dni wstecz potrzeba, żeby zobaczyć poprzednią zmianę (także nocną)
+    LOOKBACK_DAYS = 2
+
     def __init__(self, location_id: str, month: int, year: int):
         """
         Inicjalizacja serwisu.
@@ -23,11 +33,41 @@ class ConflictDetectionService:
         self.location_id = location_id
         self.month = month
         self.year = year
+        self.aggregator = None  # ostatnio użyty agregator (silnik, czasy reguł)
+
+    def get_window(self) -> Tuple[date, date]:
+        """
+        Zwraca okno pobierania [date_from, date_to) wokół miesiąca.
+
+        - wstecz: od poniedziałku pierwszego tygodnia (pełny tydzień dla 35h)
+          i co najmniej LOOKBACK_DAYS dni (ostatnia zmiana poprzedniego miesiąca dla 11h),
+        - w przód: do niedzieli ostatniego tygodnia miesiąca.
+        """
+        return self.month_window(self.year, self.month)
+
+    @classmethod
+    def month_window(cls, year: int, month: int) -> Tuple[date, date]:
+        """Okno pobierania [date_from, date_to) dla dowolnego miesiąca (patrz get_window)."""
+        month_start = date(year, month, 1)
+        month_end = date(year, month, monthrange(year, month)[1])
+
+        first_monday = month_start - timedelta(days=month_start.weekday())
+        date_from = min(first_monday, month_start - timedelta(days=cls.LOOKBACK_DAYS))
+        last_sunday = month_end + timedelta(days=6 - month_end.weekday())
+        return date_from, last_sunday + timedelta(days=1)
 
-    def detect_all_conflicts(self) -> Dict[str, Any]:
+    def detect_all_conflicts(self, work_hours: Optional[Iterable[WorkHours]] = None) -> Dict[str, Any]:
         """
         Wykrywa wszystkie konflikty dla harmonogramu lokacji.
 
+        Walidacja obejmuje okno wokół miesiąca (poprzedni/następny miesiąc
+        na granicy tygodni), ale zwracane są tylko konflikty miesiąca.
+
+        Args:
+            work_hours: Opcjonalnie już pobrane wpisy lokacji-miesiąca
+                (z załadowanym employee, np. queryset widoku listy) -
+                wtedy serwis dociąga tylko brzegi okna.
+
         Returns:
             Słownik z konfliktami:
             {
@@ -36,27 +76,88 @@ class ConflictDetectionService:
                 'exceed_12h': [...]          # Lista przekroczeń 12h
             }
         """
-        # Pobierz godziny pracy dla lokacji i miesiąca
-        work_hours = WorkHours.objects.filter(
-            location_id=self.location_id,
-            date__month=self.month,
-            date__year=self.year
-        ).select_related('employee').order_by('date')
-
-        # Pobierz pracowników na umowie o pracę (tylko UoP podlega tym przepisom)
-        employee_ids = work_hours.values_list('employee_id', flat=True).distinct()
-        employees = Employee.objects.filter(
-            id__in=employee_ids,
-            agreement_type='permanent'  # Tylko UoP
-        )
+        if work_hours is not None:
+            # Współdzielone pobranie - filtr UoP na załadowanych pracownikach
+            rows = [wh for wh in work_hours if wh.employee.agreement_type == 'permanent']
+            rows.extend(self._get_window_margins())
+        else:
+            rows = self._get_work_hours()
 
-        # Deleguj do agregatora
-        aggregator = ConflictAggregator(work_hours, employees, self.month, self.year)
-        conflicts = aggregator.detect_all_conflicts()
+        return self.detect_for_shift_index(ShiftIndex.from_work_hours(rows))
 
-        # Mapuj klucze do formatu oczekiwanego przez frontend
-        return {
+    def detect_for_shift_index(self, shift_index: ShiftIndex,
+                               rules: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Wykrywa konflikty na gotowym ShiftIndex (zmiany z całego okna get_window()).
+
+        Args:
+            rules: Włączone reguły - podane jawnie (np. skan zgodności w procesach
+                roboczych) metoda nie odpytuje bazy; None = reguły lokacji z bazy
+        """
+        if rules is None:
+            rules = ConflictRuleService.get_enabled_rules(self.location_id)
+
+        # Deleguj do agregatora (Python lub NumPy - zależnie od ustawień i rozmiaru)
+        self.aggregator = create_conflict_aggregator(
+            shift_index, self.month, self.year, rules=rules, location_id=self.location_id
+        )
+        conflicts = self.aggregator.detect_all_conflicts()
+
+        # Mapuj klucze do formatu oczekiwanego przez frontend (tylko bieżący miesiąc)
+        return self._restrict_to_month({
             'rest_11h': conflicts['rest_11h_conflicts'],
             'rest_35h': conflicts['rest_35h_conflicts'],
             'exceed_12h': conflicts['shift_12h_conflicts']
+        })
+
+    def get_timings(self) -> List[Dict[str, Any]]:
+        """Czasy reguł z ostatniego wykrywania (pusta lista przed pierwszym)."""
+        return self.aggregator.timings if self.aggregator else []
+
+    def _base_queryset(self):
+        """
+        Zmiany lokacji - tylko pracownicy na umowie o pracę (tylko UoP podlega
+        tym przepisom) i tylko kolumny potrzebne do zbudowania ShiftIndex.
+        """
+        return WorkHours.objects.filter(
+            location_id=self.location_id,
+            employee__agreement_type='permanent'
+        ).only('employee_id', 'date', 'start_minute', 'duration_minutes')
+
+    def _get_work_hours(self):
+        """Pobiera całe okno jednym zapytaniem zakresowym po indeksie (location, date)."""
+        date_from, date_to = self.get_window()
+        return self._base_queryset().filter(
+            date__gte=date_from,
+            date__lt=date_to
+        ).order_by('date')
+
+    def _get_window_margins(self):
+        """Pobiera tylko brzegi okna (dni poza miesiącem) jednym zapytaniem."""
+        date_from, date_to = self.get_window()
+        month_start, next_month_start = month_range(self.year, self.month)
+        return self._base_queryset().filter(
+            Q(date__gte=date_from, date__lt=month_start) | Q(date__gte=next_month_start, date__lt=date_to)
+        ).order_by('date')
+
+    def _restrict_to_month(self, conflicts: Dict[str, Any]) -> Dict[str, Any]:
+        """Zostawia konflikty dni miesiąca i tygodni, które go przecinają."""
+        month_prefix = f"{self.year:04d}-{self.month:02d}-"
+        month_weeks = {
+            date(self.year, self.month, day).isocalendar()[1]
+            for day in range(1, monthrange(self.year, self.month)[1] + 1)
+        }
+
+        rest_35h = {}
+        for emp_id, weeks in conflicts['rest_35h'].items():
+            # Okno ma max ~6 tygodni, więc numery tygodni są w nim jednoznaczne
+            month_bad_weeks = [week for week in weeks if week in month_weeks]
+            if month_bad_weeks:
+                rest_35h[emp_id] = month_bad_weeks
+
+        return {
+            # Klucz kończy się datą "YYYY-MM-DD"
+            'rest_11h': [key for key in conflicts['rest_11h'] if key[-10:].startswith(month_prefix)],
+            'rest_35h': rest_35h,
+            'exceed_12h': [key for key in conflicts['exceed_12h'] if key[-10:].startswith(month_prefix)]
         }
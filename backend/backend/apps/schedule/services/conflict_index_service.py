@@ -0,0 +1,263 @@
+"""
+Utrzymanie i odczyt trwałego indeksu konfliktów (ScheduleConflict).
+"""
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from ..models import ScheduleConflict
+from .conflict_detection_service import ConflictDetectionService
+from .incremental_conflict_service import IncrementalConflictService
+
+
+class ConflictIndexService:
+    """
+    Serwis indeksu konfliktów.
+
+    - refresh_window(): aktualizacja po zapisie pojedynczego WorkHours
+    - rebuild_range(): pełna przebudowa dla zakresu dat (operacje masowe, komenda)
+    - get_conflicts(): odczyt konfliktów lokacji-miesiąca jednym zapytaniem
+    - get_conflict_counts(): liczniki konfliktów wielu lokacji jednym zapytaniem
+    """
+
+    # === ODCZYT ===
+
+    @staticmethod
+    def get_conflicts(location_id: str, month: int, year: int) -> Dict[str, Any]:
+        """
+        Zwraca konflikty lokacji-miesiąca z indeksu (format API).
+
+        Jedno zapytanie zakresowe po (location, date): dni miesiąca oraz
+        tygodnie 35h zaczynające się w poprzednim miesiącu.
+        """
+        rows = ScheduleConflict.objects.filter(
+            ConflictIndexService._month_filter(year, month),
+            location_id=location_id
+        ).values_list('employee_id', 'rule', 'date', 'week')
+        return ConflictIndexService.rows_to_conflicts(rows)
+
+    @staticmethod
+    def get_conflict_counts(location_ids: Iterable[str], month: int, year: int) -> Dict[str, Dict[str, int]]:
+        """
+        Liczba konfliktów per lokacja i reguła w miesiącu - jedno zapytanie
+        grupujące dla wszystkich lokacji.
+
+        Returns:
+            {location_id: {'rest_11h': n, 'rest_35h': n, 'exceed_12h': n}}
+            (lokacje bez konfliktów - same zera)
+        """
+        counts = {
+            str(location_id): {rule: 0 for rule, _ in ScheduleConflict.RULE_CHOICES}
+            for location_id in location_ids
+        }
+        rows = ScheduleConflict.objects.filter(
+            ConflictIndexService._month_filter(year, month),
+            location_id__in=list(counts)
+        ).values('location_id', 'rule').annotate(count=Count('id')).order_by().values_list(
+            'location_id', 'rule', 'count'
+        )
+        for location_id, rule, count in rows:
+            counts[str(location_id)][rule] = count
+        return counts
+
+    @staticmethod
+    def get_employee_conflicts(employee_id: str, month: int, year: int) -> List[Dict[str, Any]]:
+        """
+        Konflikty pracownika w miesiącu we wszystkich lokacjach (indeks employee, location, ...).
+
+        Returns:
+            [{'rule', 'date': 'YYYY-MM-DD', 'location'[, 'week']}, ...] posortowane po dacie
+        """
+        rows = ScheduleConflict.objects.filter(
+            ConflictIndexService._month_filter(year, month),
+            employee_id=employee_id
+        ).order_by('date', 'rule').values_list('rule', 'date', 'location_id', 'week')
+
+        conflicts = []
+        for rule, conflict_date, location_id, week in rows:
+            conflict = {'rule': rule, 'date': conflict_date.isoformat(), 'location': str(location_id)}
+            if rule == ScheduleConflict.RULE_REST_35H:
+                conflict['week'] = week
+            conflicts.append(conflict)
+        return conflicts
+
+    @staticmethod
+    def get_window_conflicts(location_id: str, employee_id: str, changed_date: date) -> Dict[str, Any]:
+        """
+        Zwraca z indeksu konflikty, na które wpływa zmiana pracownika w changed_date.
+        """
+        affected = IncrementalConflictService(location_id, employee_id, changed_date).get_affected_dates()
+        rows = ScheduleConflict.objects.filter(
+            ConflictIndexService._affected_filter(affected),
+            location_id=location_id,
+            employee_id=employee_id
+        ).values_list('employee_id', 'rule', 'date', 'week')
+        return ConflictIndexService.rows_to_conflicts(rows)
+
+    # === AKTUALIZACJA ===
+
+    @staticmethod
+    def refresh_window(location_id: str, employee_id: str, changed_date: date) -> None:
+        """
+        Przelicza konflikty pracownika w oknie wokół changed_date
+        i podmienia odpowiadające im wiersze indeksu.
+        """
+        service = IncrementalConflictService(location_id, employee_id, changed_date)
+        conflicts = service.detect_window_conflicts()
+        affected = service.get_affected_dates()
+
+        with transaction.atomic():
+            ScheduleConflict.objects.filter(
+                ConflictIndexService._affected_filter(affected),
+                location_id=location_id,
+                employee_id=employee_id
+            ).delete()
+            ScheduleConflict.objects.bulk_create(
+                ConflictIndexService.conflicts_to_rows(location_id, changed_date.year, changed_date.month, conflicts)
+            )
+
+    @staticmethod
+    def rebuild_range(location_id: str, date_from: date, date_to: date) -> int:
+        """
+        Przebudowuje indeks dla lokacji we wszystkich miesiącach zakresu.
+
+        Returns:
+            Liczba zapisanych konfliktów
+        """
+        total = 0
+        for year, month in ConflictIndexService.iter_months(date_from, date_to):
+            conflicts = ConflictDetectionService(location_id, month, year).detect_all_conflicts()
+            rows = ConflictIndexService.conflicts_to_rows(location_id, year, month, conflicts)
+
+            with transaction.atomic():
+                # Tydzień na przełomie miesięcy należy do obu - przepisujemy go razem z miesiącem
+                ScheduleConflict.objects.filter(
+                    ConflictIndexService._month_filter(year, month),
+                    location_id=location_id
+                ).delete()
+                ScheduleConflict.objects.bulk_create(rows)
+            total += len(rows)
+        return total
+
+    @staticmethod
+    def verify_range(location_id: str, date_from: date, date_to: date) -> List[Dict[str, Any]]:
+        """
+        Porównuje indeks z pełnym przeliczeniem.
+
+        Returns:
+            Lista rozbieżności per miesiąc: [{'year', 'month', 'missing', 'stale'}, ...]
+        """
+        mismatches = []
+        for year, month in ConflictIndexService.iter_months(date_from, date_to):
+            expected = ConflictDetectionService(location_id, month, year).detect_all_conflicts()
+            stored = ConflictIndexService.get_conflicts(location_id, month, year)
+            diff = IncrementalConflictService.diff_conflicts(stored, expected)
+
+            missing = ConflictIndexService._count(diff['added'])
+            stale = ConflictIndexService._count(diff['removed'])
+            if missing or stale:
+                mismatches.append({'year': year, 'month': month, 'missing': missing, 'stale': stale})
+        return mismatches
+
+    # === KONWERSJA ===
+
+    @staticmethod
+    def conflicts_to_rows(location_id: str, year: int, month: int,
+                          conflicts: Dict[str, Any]) -> List[ScheduleConflict]:
+        """Zamienia konflikty w formacie API na wiersze ScheduleConflict."""
+        rows = []
+        for rule in (ScheduleConflict.RULE_REST_11H, ScheduleConflict.RULE_EXCEED_12H):
+            for key in conflicts[rule]:
+                employee_id, conflict_date = ConflictIndexService._split_key(key)
+                rows.append(ScheduleConflict(
+                    employee_id=employee_id,
+                    location_id=location_id,
+                    rule=rule,
+                    date=conflict_date
+                ))
+
+        week_dates = ConflictIndexService._week_key_dates(year, month)
+        for employee_id, weeks in conflicts['rest_35h'].items():
+            for week in weeks:
+                rows.append(ScheduleConflict(
+                    employee_id=employee_id,
+                    location_id=location_id,
+                    rule=ScheduleConflict.RULE_REST_35H,
+                    date=week_dates[week],
+                    week=week
+                ))
+        return rows
+
+    @staticmethod
+    def rows_to_conflicts(rows: Iterable[Tuple]) -> Dict[str, Any]:
+        """Zamienia krotki (employee_id, rule, date, week) na format API."""
+        conflicts = IncrementalConflictService.empty_conflicts()
+        for employee_id, rule, conflict_date, week in rows:
+            if rule == ScheduleConflict.RULE_REST_35H:
+                conflicts['rest_35h'].setdefault(str(employee_id), []).append(week)
+            else:
+                conflicts[rule].append(f"{employee_id}-{conflict_date}")
+        return conflicts
+
+    # === HELPER METHODS ===
+
+    @staticmethod
+    def iter_months(date_from: date, date_to: date):
+        """Zwraca kolejne (rok, miesiąc) z zakresu dat (włącznie)."""
+        year, month = date_from.year, date_from.month
+        while (year, month) <= (date_to.year, date_to.month):
+            yield year, month
+            month += 1
+            if month > 12:
+                year, month = year + 1, 1
+
+    @staticmethod
+    def _month_range(year: int, month: int) -> Tuple[date, date]:
+        return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+    @staticmethod
+    def _month_filter(year: int, month: int) -> Q:
+        """
+        Wiersze indeksu należące do miesiąca: dni miesiąca oraz tygodnie 35h
+        zaczynające się w poprzednim miesiącu.
+        """
+        month_start, month_end = ConflictIndexService._month_range(year, month)
+        first_monday = month_start - timedelta(days=month_start.weekday())
+        return (
+            (Q(date__gte=month_start) | Q(rule=ScheduleConflict.RULE_REST_35H))
+            & Q(date__gte=first_monday, date__lte=month_end)
+        )
+
+    @staticmethod
+    def _week_key_dates(year: int, month: int) -> Dict[int, date]:
+        """Mapuje numer tygodnia ISO (tygodnie przecinające miesiąc) na jego poniedziałek."""
+        week_dates = {}
+        for day in range(1, monthrange(year, month)[1] + 1):
+            current = date(year, month, day)
+            week_dates.setdefault(current.isocalendar()[1], current - timedelta(days=current.weekday()))
+        return week_dates
+
+    @staticmethod
+    def _affected_filter(affected: Dict[str, List[date]]) -> Q:
+        condition = Q()
+        for rule, dates in affected.items():
+            condition |= Q(rule=rule, date__in=dates)
+        return condition
+
+    @staticmethod
+    def _split_key(key: str) -> Tuple[str, date]:
+        """Rozbija klucz "employee-id-YYYY-MM-DD" na (employee_id, date)."""
+        employee_id, year, month, day = key.rsplit('-', 3)
+        return employee_id, date(int(year), int(month), int(day))
+
+    @staticmethod
+    def _count(conflicts: Dict[str, Any]) -> int:
+        return (
+            len(conflicts['rest_11h'])
+            + len(conflicts['exceed_12h'])
+            + sum(len(weeks) for weeks in conflicts['rest_35h'].values())
+        )
+
@@ -0,0 +1,35 @@
+"""
+Reguły konfliktów włączone dla lokacji.
+"""
+from typing import Dict, Iterable, Set
+
+from ..models import LocationConflictRule
+from .conflicts import validator_registry
+
+
+class ConflictRuleService:
+    """
+    Wyznacza zbiór włączonych reguł (kluczy z rejestru walidatorów) dla lokacji.
+
+    Domyślnie włączone są wszystkie zarejestrowane reguły; LocationConflictRule
+    z enabled=False wyłącza regułę w danej lokacji.
+    """
+
+    @staticmethod
+    def get_enabled_rules(location_id: str) -> Set[str]:
+        """Zwraca klucze reguł włączonych dla lokacji (jedno zapytanie)."""
+        return ConflictRuleService.get_enabled_rules_bulk([location_id])[str(location_id)]
+
+    @staticmethod
+    def get_enabled_rules_bulk(location_ids: Iterable[str]) -> Dict[str, Set[str]]:
+        """Zwraca {location_id: włączone reguły} dla wielu lokacji jednym zapytaniem."""
+        all_rules = set(validator_registry.rule_keys())
+        enabled = {str(location_id): set(all_rules) for location_id in location_ids}
+
+        disabled = LocationConflictRule.objects.filter(
+            location_id__in=list(enabled),
+            enabled=False
+        ).values_list('location_id', 'rule')
+        for location_id, rule in disabled:
+            enabled[str(location_id)].discard(rule)
+        return enabled
@@ -3,6 +3,9 @@ from .base_validator import BaseConflictValidator
 from .rest_11h_validator import Rest11hValidator
 from .rest_35h_validator import Rest35hValidator
 from .shift_12h_validator import Shift12hValidator
+from .shift_index import ShiftIndex, ShiftInterval
+from .engine import create_conflict_aggregator
+from .registry import ValidatorRegistry, validator_registry, register_validator
 
 __all__ = [
     'ConflictAggregator',
@@ -10,4 +13,10 @@ __all__ = [
     'Rest11hValidator',
     'Rest35hValidator',
     'Shift12hValidator',
+    'ShiftIndex',
+    'ShiftInterval',
+    'create_conflict_aggregator',
+    'ValidatorRegistry',
+    'validator_registry',
+    'register_validator',
 ]
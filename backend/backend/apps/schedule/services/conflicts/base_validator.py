@@ -2,9 +2,9 @@
 Base class for conflict validators.
 """
 from abc import ABC, abstractmethod
-from typing import List, Set, Dict, Any
-from ...models import WorkHours
-from ....employees.models import Employee
+from datetime import datetime, timedelta
+from typing import Any
+from .shift_index import ShiftIndex
 
 
 class BaseConflictValidator(ABC):
@@ -12,24 +12,30 @@ class BaseConflictValidator(ABC):
     Abstrakcyjna klasa bazowa dla walidatorów konfliktów.
 
     Każdy walidator musi implementować metodę validate().
+    Walidatory nie pobierają ani nie parsują danych - dostają gotowy ShiftIndex.
+
+    Podklasa rejestruje się w rejestrze dekoratorem @register_validator
+    i definiuje:
+    - rule_key: klucz reguły (np. 'rest_11h') - po nim reguły są włączane per lokacja,
+    - result_key: klucz wyniku w słowniku zwracanym przez agregator.
     """
 
+    rule_key: str = None
+    result_key: str = None
+
     def __init__(
             self,
-            work_hours: List[WorkHours],
-            employees: List[Employee],
+            shift_index: ShiftIndex,
             month: int,
             year: int
     ):
         """
         Args:
-            work_hours: Lista WorkHours do walidacji
-            employees: Lista pracowników (tylko UoP)
+            shift_index: Zmiany pogrupowane po pracowniku (tylko UoP)
             month: Miesiąc (1-12)
             year: Rok
         """
-        self.work_hours = work_hours
-        self.employees = employees
+        self.shift_index = shift_index
         self.month = month
         self.year = year
 
@@ -43,39 +49,18 @@ class BaseConflictValidator(ABC):
         """
         pass
 
-    # === HELPER METHODS (współdzielone) ===
-
-    @staticmethod
-    def parse_shift_hours(hours_string: str) -> tuple:
-        """
-        Parsuje string godzin "8:00-16:00" na (start_hour, start_min, end_hour, end_min).
-        """
-        import re
-        match = re.match(r'(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})', hours_string)
-        if not match:
-            return None
-        return tuple(map(int, match.groups()))
-
-    @staticmethod
-    def calculate_shift_length(hours_string: str) -> float:
-        """
-        Oblicza długość zmiany w godzinach.
-        """
-        parsed = BaseConflictValidator.parse_shift_hours(hours_string)
-        if not parsed:
-            return 0.0
+    @classmethod
+    def empty_result(cls) -> Any:
+        """Wynik reguły wyłączonej dla lokacji (ten sam typ co validate())."""
+        return []
 
-        start_hour, start_min, end_hour, end_min = parsed
-        start_minutes = start_hour * 60 + start_min
-        end_minutes = end_hour * 60 + end_min
-        return (end_minutes - start_minutes) / 60
+    # === HELPER METHODS (współdzielone) ===
 
     @staticmethod
     def get_days_in_month(year: int, month: int) -> int:
         """
         Zwraca liczbę dni w miesiącu.
         """
-        from datetime import datetime, timedelta
         if month == 12:
             next_month = datetime(year + 1, 1, 1)
         else:
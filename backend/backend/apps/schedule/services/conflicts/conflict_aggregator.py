@@ -1,24 +1,40 @@
-from typing import Dict, Any
-from .rest_11h_validator import Rest11hValidator
-from .rest_35h_validator import Rest35hValidator
-from .shift_12h_validator import Shift12hValidator
+from typing import Dict, Any, Iterable, Optional
+from . import rest_11h_validator, rest_35h_validator, shift_12h_validator  # noqa: F401 - rejestracja walidatorów
+from .metrics import measure, report_validator_timings
+from .registry import validator_registry
+from .shift_index import ShiftIndex
 
 
 class ConflictAggregator:
     """
     Agregator łączący wszystkie walidatory konfliktów.
     Single Responsibility: koordynuje walidacje i zbiera wyniki.
+
+    Dostaje gotowy ShiftIndex (zmiany sparsowane i posortowane raz),
+    więc koszt to jedno liniowe przejście na walidator. Walidatory pochodzą
+    z rejestru; każdy jest mierzony, a czasy trafiają do self.timings
+    i hooka metryk.
     """
 
-    def __init__(self, work_hours, employees, month: int, year: int):
-        self.work_hours = work_hours
-        self.employees = employees
+    engine = 'python'
+
+    def __init__(self, shift_index: ShiftIndex, month: int, year: int,
+                 rules: Optional[Iterable[str]] = None, location_id: Optional[str] = None):
+        """
+        Args:
+            rules: Klucze włączonych reguł (None = wszystkie zarejestrowane)
+            location_id: Lokacja - tylko jako kontekst metryk
+        """
+        self.shift_index = shift_index
         self.month = month
         self.year = year
+        self.rules = set(rules) if rules is not None else None
+        self.location_id = location_id
+        self.timings = []
 
     def detect_all_conflicts(self) -> Dict[str, Any]:
         """
-        Uruchamia wszystkie walidatory i zwraca zagregowane wyniki.
+        Uruchamia wszystkie włączone walidatory i zwraca zagregowane wyniki.
 
         Returns:
             {
@@ -27,14 +43,25 @@ class ConflictAggregator:
                 'shift_12h_conflicts': [...]
             }
         """
-        # Inicjalizuj walidatory
-        rest_11h = Rest11hValidator(self.work_hours, self.employees, self.month, self.year)
-        rest_35h = Rest35hValidator(self.work_hours, self.employees, self.month, self.year)
-        shift_12h = Shift12hValidator(self.work_hours, self.employees, self.month, self.year)
-
-        # Uruchom walidacje
-        return {
-            'rest_11h_conflicts': rest_11h.validate(),
-            'rest_35h_conflicts': rest_35h.validate(),
-            'shift_12h_conflicts': shift_12h.validate()
-        }
+        self.timings = []
+        results = {}
+        for validator_class in validator_registry.validators():
+            if not validator_registry.is_enabled(validator_class.rule_key, self.rules):
+                results[validator_class.result_key] = validator_class.empty_result()
+                continue
+
+            with measure(self.timings, validator_class.rule_key, self.shift_index) as entry:
+                validator = validator_class(self.shift_index, self.month, self.year)
+                entry['result'] = results[validator_class.result_key] = validator.validate()
+
+        self.report_timings()
+        return results
+
+    def report_timings(self) -> None:
+        report_validator_timings(
+            self.timings,
+            engine=self.engine,
+            location_id=str(self.location_id) if self.location_id else None,
+            month=self.month,
+            year=self.year
+        )
@@ -0,0 +1,45 @@
+"""
+Wybór silnika konfliktów (czysty Python lub NumPy).
+"""
+import logging
+from typing import Iterable, Optional
+
+from django.conf import settings
+
+from .conflict_aggregator import ConflictAggregator
+from .shift_index import ShiftIndex
+
+try:
+    from .vectorized_aggregator import VectorizedConflictAggregator
+except ImportError:  # NumPy nie jest zainstalowany - zostaje silnik Pythonowy
+    VectorizedConflictAggregator = None
+
+logger = logging.getLogger(__name__)
+
+ENGINE_PYTHON = 'python'
+ENGINE_NUMPY = 'numpy'
+ENGINE_AUTO = 'auto'
+
+
+def create_conflict_aggregator(shift_index: ShiftIndex, month: int, year: int,
+                               rules: Optional[Iterable[str]] = None, location_id: Optional[str] = None):
+    """
+    Zwraca agregator konfliktów zgodnie z ustawieniem CONFLICT_ENGINE.
+
+    rules i location_id przekazywane są do agregatora (włączone reguły, kontekst metryk).
+
+    - 'python': zawsze ConflictAggregator
+    - 'numpy': zawsze VectorizedConflictAggregator (jeśli NumPy jest dostępny)
+    - 'auto': NumPy od CONFLICT_ENGINE_NUMPY_THRESHOLD zmian wzwyż
+    """
+    engine = getattr(settings, 'CONFLICT_ENGINE', ENGINE_AUTO)
+
+    if engine != ENGINE_PYTHON and VectorizedConflictAggregator is not None:
+        threshold = getattr(settings, 'CONFLICT_ENGINE_NUMPY_THRESHOLD', 5000)
+        if engine == ENGINE_NUMPY or len(shift_index) >= threshold:
+            return VectorizedConflictAggregator(shift_index, month, year, rules=rules, location_id=location_id)
+
+    if engine == ENGINE_NUMPY and VectorizedConflictAggregator is None:
+        logger.warning("CONFLICT_ENGINE='numpy', ale NumPy nie jest zainstalowany - używam silnika Python")
+
+    return ConflictAggregator(shift_index, month, year, rules=rules, location_id=location_id)
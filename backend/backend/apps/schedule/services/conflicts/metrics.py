@@ -0,0 +1,68 @@
+"""
+Pomiary czasu walidatorów konfliktów.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def measure(timings: List[Dict[str, Any]], rule: str, shift_index):
+    """
+    Mierzy czas jednej reguły i dopisuje wpis do timings.
+
+    Wynik reguły należy przypisać do entry['result'] - liczba konfliktów
+    jest z niego wyliczana po zakończeniu pomiaru.
+    """
+    entry = {'rule': rule, 'result': None}
+    started = time.perf_counter()
+    yield entry
+    duration_ms = (time.perf_counter() - started) * 1000
+
+    result = entry.pop('result')
+    if isinstance(result, dict):
+        conflict_count = sum(len(values) for values in result.values())
+    else:
+        conflict_count = len(result or [])
+
+    entry.update({
+        'duration_ms': round(duration_ms, 3),
+        'shifts': len(shift_index),
+        'employees': len(shift_index.shifts_by_employee),
+        'conflicts': conflict_count
+    })
+    timings.append(entry)
+
+
+def report_validator_timings(timings: List[Dict[str, Any]], **context) -> None:
+    """
+    Przekazuje czasy reguł do hooka CONFLICT_METRICS_HOOK (ścieżka do funkcji
+    wywoływanej jako hook(timings, **context)) i loguje je na poziomie DEBUG.
+
+    Błąd hooka nie może przerwać wykrywania konfliktów - jest tylko logowany.
+    """
+    logger.debug(
+        "Walidatory konfliktów %s: %s", context,
+        ", ".join(f"{entry['rule']}={entry['duration_ms']}ms" for entry in timings)
+    )
+
+    hook_path = getattr(settings, 'CONFLICT_METRICS_HOOK', None)
+    if not hook_path:
+        return
+
+    try:
+        _load_hook(hook_path)(timings, **context)
+    except Exception:
+        logger.exception("Błąd hooka metryk konfliktów %s", hook_path)
+
+
+@lru_cache(maxsize=None)
+def _load_hook(hook_path: str):
+    return import_string(hook_path)
@@ -0,0 +1,47 @@
+"""
+Rejestr walidatorów konfliktów.
+"""
+from typing import Dict, Iterable, List, Optional, Type
+
+
+class ValidatorRegistry:
+    """
+    Rejestr klas walidatorów (podklas BaseConflictValidator) po kluczu reguły.
+
+    Walidator rejestruje się dekoratorem @register_validator; agregatory
+    uruchamiają wszystkie zarejestrowane walidatory w kolejności rejestracji,
+    a wyłączone dla lokacji reguły dają pusty wynik.
+    """
+
+    def __init__(self):
+        self._validators: Dict[str, Type] = {}
+
+    def register(self, validator_class: Type) -> Type:
+        """Rejestruje klasę walidatora pod jej rule_key (do użycia jako dekorator)."""
+        rule_key = getattr(validator_class, 'rule_key', None)
+        if not rule_key or not getattr(validator_class, 'result_key', None):
+            raise ValueError(f"{validator_class.__name__}: walidator musi definiować rule_key i result_key")
+
+        registered = self._validators.get(rule_key)
+        if registered is not None and registered is not validator_class:
+            raise ValueError(f"Reguła '{rule_key}' jest już zarejestrowana przez {registered.__name__}")
+
+        self._validators[rule_key] = validator_class
+        return validator_class
+
+    def get(self, rule_key: str) -> Type:
+        return self._validators[rule_key]
+
+    def rule_keys(self) -> List[str]:
+        return list(self._validators)
+
+    def validators(self) -> List[Type]:
+        return list(self._validators.values())
+
+    def is_enabled(self, rule_key: str, rules: Optional[Iterable[str]]) -> bool:
+        """rules=None oznacza wszystkie reguły włączone."""
+        return rules is None or rule_key in rules
+
+
+validator_registry = ValidatorRegistry()
+register_validator = validator_registry.register
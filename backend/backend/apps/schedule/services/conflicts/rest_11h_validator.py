@@ -1,72 +1,30 @@
 from typing import List
-from datetime import datetime, timedelta
 from .base_validator import BaseConflictValidator
+from .registry import register_validator
 
 
+@register_validator
 class Rest11hValidator(BaseConflictValidator):
     """
     Walidator sprawdzający 11-godzinny odpoczynek między zmianami.
     Zgodnie z Kodeksem Pracy: między zmianami musi być min. 11h przerwy.
     """
 
+    rule_key = 'rest_11h'
+    result_key = 'rest_11h_conflicts'
+
+    MIN_REST_MINUTES = 11 * 60
+
     def validate(self) -> List[str]:
         """
         Zwraca listę konfliktów w formacie: ["employee-id-YYYY-MM-DD", ...]
         """
-        conflicts = []
-
-        # Grupujemy zmiany według pracownika
-        employee_shifts = {}
-        for wh in self.work_hours:
-            emp_id = wh.employee.id
-            if emp_id not in employee_shifts:
-                employee_shifts[emp_id] = []
-            employee_shifts[emp_id].append(wh)
-
-        # Sprawdzamy każdego pracownika
-        for emp_id, shifts in employee_shifts.items():
-            # Sortujemy zmiany chronologicznie
-            sorted_shifts = sorted(shifts, key=lambda x: x.date)
-
-            # Sprawdzamy kolejne pary zmian
-            for i in range(len(sorted_shifts) - 1):
-                current_shift = sorted_shifts[i]
-                next_shift = sorted_shifts[i + 1]
-
-                # Pobierz godziny zakończenia obecnej zmiany
-                try:
-                    _, current_end_str = self.parse_shift_hours(current_shift.hours)
-                    next_start_str, _ = self.parse_shift_hours(next_shift.hours)
-                except (ValueError, AttributeError):
-                    continue
-
-                # Parsuj do datetime
-                current_end = datetime.strptime(
-                    f"{current_shift.date} {current_end_str}",
-                    "%Y-%m-%d %H:%M"
-                )
-                next_start = datetime.strptime(
-                    f"{next_shift.date} {next_start_str}",
-                    "%Y-%m-%d %H:%M"
-                )
-
-                # Obsługa nocnych zmian (np. 22:00 - 06:00)
-                # Jeśli koniec < początek, to zmiana przechodzi przez północ
-                current_shift_start_str, _ = self.parse_shift_hours(current_shift.hours)
-                current_shift_start_time = datetime.strptime(current_shift_start_str, "%H:%M").time()
-                current_shift_end_time = datetime.strptime(current_end_str, "%H:%M").time()
-
-                if current_shift_end_time < current_shift_start_time:
-                    # Zmiana nocna - dodaj dzień do końca
-                    current_end += timedelta(days=1)
-
-                # Sprawdź różnicę czasu
-                time_diff = (next_start - current_end).total_seconds() / 3600
+        conflicts = {}  # dict zachowuje kolejność i deduplikuje w O(1)
 
-                # Jeśli mniej niż 11h odpoczynku
-                if time_diff < 11:
-                    conflict_key = f"{emp_id}-{next_shift.date}"
-                    if conflict_key not in conflicts:
-                        conflicts.append(conflict_key)
+        for emp_id, shifts in self.shift_index.items():
+            # Zmiany są już posortowane chronologicznie - sprawdzamy kolejne pary
+            for current_shift, next_shift in zip(shifts, shifts[1:]):
+                if next_shift.start - current_shift.end < self.MIN_REST_MINUTES:
+                    conflicts[f"{emp_id}-{next_shift.work_date}"] = True
 
-        return conflicts
+        return list(conflicts)
@@ -1,31 +1,29 @@
 from typing import List
 from .base_validator import BaseConflictValidator
+from .registry import register_validator
 
 
+@register_validator
 class Shift12hValidator(BaseConflictValidator):
     """
     Walidator sprawdzający czy zmiany nie przekraczają 12 godzin.
     Zgodnie z Kodeksem Pracy: doba pracownicza max 12h (z wyjątkami).
     """
 
+    rule_key = 'exceed_12h'
+    result_key = 'shift_12h_conflicts'
+
+    MAX_SHIFT_MINUTES = 12 * 60
+
     def validate(self) -> List[str]:
         """
         Zwraca listę konfliktów w formacie: ["employee-id-YYYY-MM-DD", ...]
         """
-        conflicts = []
-
-        for wh in self.work_hours:
-            try:
-                # Oblicz długość zmiany
-                shift_length = self.calculate_shift_length(wh.hours)
+        conflicts = {}  # dict zachowuje kolejność i deduplikuje w O(1)
 
-                # Jeśli przekracza 12h
-                if shift_length > 12:
-                    conflict_key = f"{wh.employee.id}-{wh.date}"
-                    if conflict_key not in conflicts:
-                        conflicts.append(conflict_key)
-            except (ValueError, AttributeError):
-                # Ignoruj błędne formaty godzin
-                continue
+        for emp_id, shifts in self.shift_index.items():
+            for shift in shifts:
+                if shift.duration > self.MAX_SHIFT_MINUTES:
+                    conflicts[f"{emp_id}-{shift.work_date}"] = True
 
-        return conflicts
+        return list(conflicts)
@@ -0,0 +1,70 @@
+"""
+Wspólna struktura zmian dla walidatorów konfliktów.
+"""
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+from datetime import date
+
+from ...models import WorkHours
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class ShiftInterval(NamedTuple):
+    """
+    Okres pracy jednej zmiany.
+
+    start/end to minuty od początku ery (date.toordinal() * 1440 + minuta doby),
+    więc zmiany nocne i przerwy między dniami liczone są na liczbach całkowitych.
+    """
+    work_date: date
+    start: int
+    end: int
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+
+class ShiftIndex:
+    """
+    Zmiany pogrupowane po pracowniku, posortowane chronologicznie.
+
+    Budowana raz z jednego pobrania WorkHours i współdzielona przez
+    wszystkie walidatory - każdy robi jedno liniowe przejście.
+    Wpisy bez godzin (np. "DWH") są pomijane.
+    """
+
+    def __init__(self, shifts_by_employee: Dict[str, List[ShiftInterval]]):
+        self.shifts_by_employee = shifts_by_employee
+
+    @classmethod
+    def from_work_hours(cls, work_hours: Iterable[WorkHours], permanent_only: bool = False) -> 'ShiftIndex':
+        """
+        Buduje indeks z listy/querysetu WorkHours.
+
+        Args:
+            work_hours: Wpisy WorkHours (z wypełnionymi kolumnami strukturalnymi)
+            permanent_only: Pomiń pracowników spoza UoP (wymaga załadowanego employee)
+        """
+        shifts_by_employee = {}
+        for wh in work_hours:
+            if wh.start_minute is None:
+                continue
+            if permanent_only and wh.employee.agreement_type != 'permanent':
+                continue
+
+            start = wh.date.toordinal() * MINUTES_PER_DAY + wh.start_minute
+            interval = ShiftInterval(wh.date, start, start + wh.duration_minutes)
+            shifts_by_employee.setdefault(str(wh.employee_id), []).append(interval)
+
+        for intervals in shifts_by_employee.values():
+            # Dane zwykle przychodzą posortowane po dacie - sortowanie jest wtedy liniowe
+            intervals.sort()
+
+        return cls(shifts_by_employee)
+
+    def items(self) -> Iterator[Tuple[str, List[ShiftInterval]]]:
+        return iter(self.shifts_by_employee.items())
+
+    def __len__(self) -> int:
+        return sum(len(intervals) for intervals in self.shifts_by_employee.values())
@@ -0,0 +1,148 @@
+"""
+Wektorowy (NumPy) silnik konfliktów dla dużych lokacji-miesięcy.
+"""
+from datetime import date
+from typing import Dict, Any, List
+
+import numpy as np
+
+from .conflict_aggregator import ConflictAggregator
+from .metrics import measure
+from .registry import validator_registry
+from .rest_11h_validator import Rest11hValidator
+from .rest_35h_validator import Rest35hValidator
+from .shift_12h_validator import Shift12hValidator
+from .shift_index import MINUTES_PER_DAY
+
+
+class VectorizedConflictAggregator(ConflictAggregator):
+    """
+    Alternatywa dla ConflictAggregator z identycznym kontraktem wyjścia.
+
+    Zmiany z ShiftIndex są pakowane do tablic (pracownik, start, koniec),
+    a przerwy, długości zmian i odpoczynek tygodniowy liczone są
+    operacjami wektorowymi zamiast pętli po zmianach. Reguły z rejestru
+    bez wersji wektorowej uruchamiane są zwykłym walidatorem.
+    """
+
+    engine = 'numpy'
+
+    def detect_all_conflicts(self) -> Dict[str, Any]:
+        """
+        Returns:
+            {
+                'rest_11h_conflicts': [...],
+                'rest_35h_conflicts': {...},
+                'shift_12h_conflicts': [...]
+            }
+        """
+        self.timings = []
+        shift_count = len(self.shift_index)
+        arrays = self._pack() if shift_count else None
+
+        vectorized_rules = {
+            Rest11hValidator.rule_key: self._rest_11h,
+            Rest35hValidator.rule_key: self._rest_35h,
+            Shift12hValidator.rule_key: self._shift_12h,
+        }
+
+        results = {}
+        for validator_class in validator_registry.validators():
+            rule_key = validator_class.rule_key
+            if not validator_registry.is_enabled(rule_key, self.rules):
+                results[validator_class.result_key] = validator_class.empty_result()
+                continue
+
+            with measure(self.timings, rule_key, self.shift_index) as entry:
+                if rule_key not in vectorized_rules:
+                    validator = validator_class(self.shift_index, self.month, self.year)
+                    result = validator.validate()
+                elif arrays is None:
+                    result = validator_class.empty_result()
+                else:
+                    result = vectorized_rules[rule_key](**arrays)
+                entry['result'] = results[validator_class.result_key] = result
+
+        self.report_timings()
+        return results
+
+    def _pack(self) -> Dict[str, Any]:
+        """Pakuje zmiany do tablic; wspólne dla wszystkich reguł wektorowych."""
+        employee_ids: List[str] = []
+        shift_lists = []
+        for emp_id, shifts in self.shift_index.items():
+            employee_ids.append(emp_id)
+            shift_lists.append(shifts)
+        shift_count = sum(len(shifts) for shifts in shift_lists)
+
+        # Pakowanie do tablic: zmiany każdego pracownika są już posortowane
+        emp_idx = np.repeat(
+            np.arange(len(shift_lists), dtype=np.int64),
+            [len(shifts) for shifts in shift_lists]
+        )
+        starts = np.fromiter(
+            (shift.start for shifts in shift_lists for shift in shifts),
+            dtype=np.int64, count=shift_count
+        )
+        ends = np.fromiter(
+            (shift.end for shifts in shift_lists for shift in shifts),
+            dtype=np.int64, count=shift_count
+        )
+
+        # Kolejne pary zmian tego samego pracownika
+        same_employee = emp_idx[1:] == emp_idx[:-1]
+        gaps = starts[1:] - ends[:-1]
+
+        return {
+            'employee_ids': employee_ids,
+            'emp_idx': emp_idx,
+            'starts': starts,
+            'ends': ends,
+            'same_employee': same_employee,
+            'gaps': gaps
+        }
+
+    @staticmethod
+    def _keys(employee_ids, emp_idx, starts, positions) -> List[str]:
+        """Buduje klucze "employee-id-YYYY-MM-DD" tylko dla wskazanych zmian."""
+        day_ordinals = (starts[positions] // MINUTES_PER_DAY).tolist()
+        keys = {
+            f"{employee_ids[emp]}-{date.fromordinal(day)}": True
+            for emp, day in zip(emp_idx[positions].tolist(), day_ordinals)
+        }
+        return list(keys)
+
+    def _rest_11h(self, employee_ids, emp_idx, starts, same_employee, gaps, **_) -> List[str]:
+        violations = same_employee & (gaps < Rest11hValidator.MIN_REST_MINUTES)
+        # Konflikt zapisywany na dacie drugiej zmiany z pary
+        return self._keys(employee_ids, emp_idx, starts, np.nonzero(violations)[0] + 1)
+
+    def _shift_12h(self, employee_ids, emp_idx, starts, ends, **_) -> List[str]:
+        violations = (ends - starts) > Shift12hValidator.MAX_SHIFT_MINUTES
+        return self._keys(employee_ids, emp_idx, starts, np.nonzero(violations)[0])
+
+    def _rest_35h(self, employee_ids, emp_idx, starts, same_employee, gaps, **_) -> Dict[str, List[int]]:
+        # Tydzień ISO identyfikowany przez ordinal poniedziałku (ordinal 1 = poniedziałek)
+        day_ordinals = starts // MINUTES_PER_DAY
+        week_mondays = day_ordinals - (day_ordinals - 1) % 7
+
+        # Grupa = (pracownik, tydzień); nowa grupa tam, gdzie para nie należy do tej samej
+        same_group = same_employee & (week_mondays[1:] == week_mondays[:-1])
+        group_ids = np.concatenate(([0], np.cumsum(~same_group)))
+        group_count = int(group_ids[-1]) + 1
+
+        # Tydzień ma odpoczynek, jeśli którakolwiek przerwa w grupie >= 35h
+        rested_pairs = same_group & (gaps >= Rest35hValidator.MIN_REST_MINUTES)
+        has_rest = np.bincount(group_ids[1:][rested_pairs], minlength=group_count) > 0
+
+        group_starts = np.nonzero(np.concatenate(([True], ~same_group)))[0]
+        bad_groups = np.nonzero(~has_rest)[0]
+
+        bad_positions = group_starts[bad_groups]
+        conflicts = {}
+        week_numbers = {}
+        for emp, monday in zip(emp_idx[bad_positions].tolist(), week_mondays[bad_positions].tolist()):
+            if monday not in week_numbers:
+                week_numbers[monday] = date.fromordinal(monday).isocalendar()[1]
+            conflicts.setdefault(employee_ids[emp], []).append(week_numbers[monday])
+        return conflicts
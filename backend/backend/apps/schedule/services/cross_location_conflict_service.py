@@ -0,0 +1,183 @@
+"""
+Wykrywanie konfliktów pracownika między lokacjami.
+"""
+from calendar import monthrange
+from datetime import date
+from typing import Dict, Any, Iterable, List, Optional
+
+from ..models import WorkHours
+from .conflict_detection_service import ConflictDetectionService
+from .conflicts import Rest11hValidator, Rest35hValidator
+from .conflicts.shift_index import MINUTES_PER_DAY
+
+
+class CrossLocationConflictService:
+    """
+    Konflikty pracownika liczone na wspólnej osi czasu wszystkich jego lokacji.
+
+    Zmiany wszystkich wskazanych pracowników pobierane są jednym zapytaniem
+    po indeksie (employee, date) - bez osobnego przejścia per lokacja.
+    Zwracane są tylko konflikty, w które zaangażowana jest więcej niż jedna
+    lokacja (konflikty w obrębie lokacji zwraca ConflictDetectionService):
+
+    - overlap: zmiany w dwóch lokacjach nakładają się w czasie (wszyscy pracownicy),
+    - rest_11h: mniej niż 11h przerwy między zmianami w różnych lokacjach (tylko UoP),
+    - rest_35h: tydzień bez 35h odpoczynku z pracą w kilku lokacjach (tylko UoP).
+    """
+
+    RULE_OVERLAP = 'overlap'
+    RULE_REST_11H = 'rest_11h'
+    RULE_REST_35H = 'rest_35h'
+
+    def __init__(self, employee_ids: Iterable[str], month: int, year: int):
+        """
+        Args:
+            employee_ids: UUID pracowników do sprawdzenia
+            month: Miesiąc (1-12)
+            year: Rok (np. 2024)
+        """
+        self.employee_ids = {str(employee_id) for employee_id in employee_ids}
+        self.month = month
+        self.year = year
+
+    def detect(self, location_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Wykrywa konflikty między lokacjami w danym miesiącu.
+
+        Args:
+            location_id: Opcjonalnie - tylko konflikty, w których bierze udział ta lokacja
+
+        Returns:
+            Lista konfliktów:
+            [
+                {'rule': 'overlap', 'employee': '...', 'date': 'YYYY-MM-DD', 'locations': ['...', '...']},
+                {'rule': 'rest_35h', 'employee': '...', 'date': 'YYYY-MM-DD', 'week': 10, 'locations': [...]},
+                ...
+            ]
+            Dla rest_35h data to poniedziałek tygodnia ISO.
+        """
+        if not self.employee_ids:
+            return []
+        return self.detect_for_shifts(self._get_shifts(), location_id=location_id)
+
+    def detect_for_shifts(self, shifts_by_employee: Dict[str, Any],
+                          location_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Jak detect(), ale dla już pobranych zmian z okna miesiąca
+        (np. grafik pracownika czytany przez wywołującego).
+
+        Args:
+            shifts_by_employee: {employee_id: ([shift_entry(...), ...] posortowane, is_permanent)}
+        """
+        conflicts = []
+        for employee_id, (shifts, is_permanent) in shifts_by_employee.items():
+            conflicts.extend(self._detect_pairs(employee_id, shifts, is_permanent))
+            if is_permanent:
+                conflicts.extend(self._detect_weeks(employee_id, shifts))
+
+        location_key = str(location_id) if location_id else None
+        return [
+            conflict for conflict in conflicts
+            if self._in_month(conflict) and (location_key is None or location_key in conflict['locations'])
+        ]
+
+    def _get_shifts(self) -> Dict[str, Any]:
+        """
+        Pobiera zmiany pracowników z okna miesiąca jednym zapytaniem (indeks employee, date).
+
+        Returns:
+            {employee_id: ([(start, end, location_id, work_date), ...], is_permanent)}
+        """
+        date_from, date_to = ConflictDetectionService.month_window(self.year, self.month)
+        rows = WorkHours.objects.filter(
+            employee_id__in=self.employee_ids,
+            date__gte=date_from,
+            date__lt=date_to,
+            start_minute__isnull=False
+        ).order_by('employee_id', 'date').values_list(
+            'employee_id', 'location_id', 'date', 'start_minute',
+            'duration_minutes', 'employee__agreement_type'
+        )
+
+        shifts_by_employee = {}
+        for employee_id, location_id, work_date, start_minute, duration, agreement_type in rows:
+            shifts, _ = shifts_by_employee.setdefault(
+                str(employee_id), ([], agreement_type == 'permanent')
+            )
+            shifts.append(self.shift_entry(location_id, work_date, start_minute, duration))
+
+        for shifts, _ in shifts_by_employee.values():
+            shifts.sort()
+        return shifts_by_employee
+
+    @staticmethod
+    def shift_entry(location_id, work_date: date, start_minute: int, duration: int) -> tuple:
+        """Zmiana na wspólnej osi czasu: (start, end, location_id, work_date) w minutach od epoki."""
+        start = work_date.toordinal() * MINUTES_PER_DAY + start_minute
+        return start, start + duration, str(location_id), work_date
+
+    def _detect_pairs(self, employee_id: str, shifts: List[tuple], is_permanent: bool) -> List[Dict[str, Any]]:
+        """Nakładanie się zmian i odpoczynek 11h między zmianami w różnych lokacjach."""
+        conflicts = []
+        latest = None  # zmiana kończąca się najpóźniej spośród dotychczasowych
+        for shift in shifts:
+            start, end, location_id, work_date = shift
+            if latest is not None and latest[2] != location_id:
+                gap = start - latest[1]
+                if gap < 0:
+                    rule = self.RULE_OVERLAP
+                elif is_permanent and gap < Rest11hValidator.MIN_REST_MINUTES:
+                    rule = self.RULE_REST_11H
+                else:
+                    rule = None
+
+                if rule:
+                    # Konflikt zapisywany na dacie późniejszej zmiany - jak w Rest11hValidator
+                    conflicts.append({
+                        'rule': rule,
+                        'employee': employee_id,
+                        'date': work_date.isoformat(),
+                        'locations': [latest[2], location_id]
+                    })
+
+            if latest is None or end >= latest[1]:
+                latest = shift
+        return conflicts
+
+    def _detect_weeks(self, employee_id: str, shifts: List[tuple]) -> List[Dict[str, Any]]:
+        """Tygodnie bez 35h odpoczynku na wspólnej osi czasu, z pracą w kilku lokacjach."""
+        conflicts = []
+        weeks = {}
+        for start, end, location_id, work_date in shifts:
+            monday = work_date.toordinal() - work_date.weekday()
+            weeks.setdefault(monday, []).append((start, end, location_id))
+
+        for monday, week_shifts in weeks.items():
+            locations = list(dict.fromkeys(location_id for _, _, location_id in week_shifts))
+            if len(locations) < 2:
+                continue
+
+            # Ta sama reguła co Rest35hValidator: przerwa między kolejnymi zmianami tygodnia
+            has_rest = any(
+                next_start - current_end >= Rest35hValidator.MIN_REST_MINUTES
+                for (_, current_end, _), (next_start, _, _) in zip(week_shifts, week_shifts[1:])
+            )
+            if not has_rest:
+                week_start = date.fromordinal(monday)
+                conflicts.append({
+                    'rule': self.RULE_REST_35H,
+                    'employee': employee_id,
+                    'date': week_start.isoformat(),
+                    'week': week_start.isocalendar()[1],
+                    'locations': locations
+                })
+        return conflicts
+
+    def _in_month(self, conflict: Dict[str, Any]) -> bool:
+        """Dzień konfliktu w miesiącu lub tydzień 35h przecinający miesiąc."""
+        month_start = date(self.year, self.month, 1)
+        month_end = date(self.year, self.month, monthrange(self.year, self.month)[1])
+        conflict_date = date.fromisoformat(conflict['date'])
+        if conflict['rule'] == self.RULE_REST_35H:
+            return conflict_date <= month_end and conflict_date.toordinal() + 6 >= month_start.toordinal()
+        return month_start <= conflict_date <= month_end
@@ -0,0 +1,177 @@
+"""
+Miesięczna karta czasu pracy pracownika ze wszystkich lokacji.
+"""
+import hashlib
+from datetime import timedelta
+from typing import Dict, Any, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from ..models import WorkHours
+from ..utils import format_minute, month_range
+from .conflict_detection_service import ConflictDetectionService
+from .conflict_index_service import ConflictIndexService
+from .cross_location_conflict_service import CrossLocationConflictService
+from .hours_breakdown_service import HoursBreakdownService
+
+
+class EmployeeTimesheetService:
+    """
+    Karta pracownika: zmiany dzień po dniu, sumy per lokacja, suma miesiąca i konflikty.
+
+    - wpisy z okna miesiąca (ConflictDetectionService.month_window) pobierane
+      jednym zapytaniem po indeksie (employee, date),
+    - jedno przejście po wierszach buduje dni, sumy ze składnikami
+      (HoursBreakdownService) i oś czasu dla konfliktów między lokacjami
+      (CrossLocationConflictService.detect_for_shifts),
+    - konflikty w obrębie lokacji czytane z indeksu ScheduleConflict.
+
+    get_cached() trzyma wynik w cache konfliktów pod tokenem wersji miesiąca
+    (ScheduleVersionService.get_user_month_marker) - każdy zapis w dowolnej
+    lokacji użytkownika zmienia token, więc nieaktualny wpis nie zostanie odczytany.
+    """
+
+    KEY_PREFIX = 'timesheet'
+
+    # Składniki zmiany (total_hours = duration_hours)
+    SHIFT_BUCKETS = ('night', 'sunday', 'holiday', 'weekend')
+
+    def __init__(self, employee, month: int, year: int):
+        """
+        Args:
+            employee: Instancja Employee
+            month, year: Miesiąc karty
+        """
+        self.employee = employee
+        self.month = month
+        self.year = year
+
+    def get_cached(self, token: Optional[str]) -> Dict[str, Any]:
+        """Karta z cache (token = znacznik wersji miesiąca; None - bez cache)."""
+        if token is None:
+            return self.build()
+
+        cache = caches[settings.CONFLICT_CACHE_ALIAS]
+        key = self.cache_key(token)
+        timesheet = cache.get(key)
+        if timesheet is None:
+            timesheet = self.build()
+            cache.set(key, timesheet, settings.CONFLICT_CACHE_TIMEOUT)
+        return timesheet
+
+    def cache_key(self, token: str) -> str:
+        digest = hashlib.md5(token.encode()).hexdigest()
+        return f"{self.KEY_PREFIX}:{self.employee.id}:{self.year}:{self.month}:{digest}"
+
+    def build(self) -> Dict[str, Any]:
+        """
+        Returns:
+            {
+                'employee': {'id', 'name'}, 'month', 'year',
+                'days': [{'date', 'shifts': [{'id', 'location', 'location_name', 'hours', 'start',
+                          'end', 'duration_hours', 'is_overnight', 'breakdown'}], <godziny>}, ...],
+                'locations': [{'id', 'name', 'shifts', 'days', <godziny>}, ...],
+                'summary': {'shifts', 'days_worked', <godziny>},
+                'conflicts': [{'rule', 'date', 'location'[, 'week']}, ...],
+                'cross_location_conflicts': [...]
+            }
+            <godziny> = total_hours, night_hours, sunday_hours, holiday_hours, weekend_hours
+            (HoursBreakdownService); breakdown zmiany - bez total_hours.
+        """
+        month_start, next_month_start = month_range(self.year, self.month)
+        window_from, window_to = ConflictDetectionService.month_window(self.year, self.month)
+        rows = WorkHours.objects.filter(
+            employee_id=self.employee.id,
+            date__gte=window_from,
+            date__lt=window_to
+        ).order_by('date', 'start_minute').values_list(
+            'id', 'location_id', 'location__name', 'date', 'hours',
+            'start_minute', 'end_minute', 'duration_minutes', 'is_overnight'
+        )
+
+        breakdown = HoursBreakdownService.for_range(month_start, next_month_start - timedelta(days=1))
+        days = {
+            month_start + timedelta(days=offset): {'shifts': [], 'totals': HoursBreakdownService.empty()}
+            for offset in range((next_month_start - month_start).days)
+        }
+        locations = {}
+        month_totals = HoursBreakdownService.empty()
+        timeline = []
+        for (work_hours_id, location_id, location_name, work_date, hours,
+             start_minute, end_minute, duration, is_overnight) in rows:
+            location_key = str(location_id) if location_id is not None else None
+            if start_minute is not None:
+                timeline.append(CrossLocationConflictService.shift_entry(location_key, work_date, start_minute, duration))
+
+            day = days.get(work_date)
+            if day is None:
+                # Dzień z okna spoza miesiąca - tylko dla konfliktów
+                continue
+
+            subtotal = locations.setdefault(location_key, {
+                'id': location_key, 'name': location_name, 'shifts': 0, 'days': set(),
+                'totals': HoursBreakdownService.empty()
+            })
+            subtotal['shifts'] += 1
+            subtotal['days'].add(work_date)
+
+            shift_breakdown = None
+            if start_minute is not None:
+                shift_breakdown = breakdown.add(day['totals'], work_date, start_minute, duration)
+                for bucket, minutes in shift_breakdown.items():
+                    subtotal['totals'][bucket] += minutes
+                    month_totals[bucket] += minutes
+
+            day['shifts'].append({
+                'id': str(work_hours_id),
+                'location': location_key,
+                'location_name': location_name,
+                'hours': hours,
+                'start': format_minute(start_minute),
+                'end': format_minute(end_minute),
+                'duration_hours': round(duration / 60, 2) if duration is not None else None,
+                'is_overnight': is_overnight,
+                'breakdown': (
+                    HoursBreakdownService.to_hours(shift_breakdown, self.SHIFT_BUCKETS)
+                    if shift_breakdown is not None else None
+                )
+            })
+
+        is_permanent = self.employee.agreement_type == 'permanent'
+        cross_location_conflicts = CrossLocationConflictService(
+            employee_ids=[self.employee.id],
+            month=self.month,
+            year=self.year
+        ).detect_for_shifts({str(self.employee.id): (sorted(timeline), is_permanent)} if timeline else {})
+
+        return {
+            'employee': {'id': str(self.employee.id), 'name': self.employee.full_name},
+            'month': self.month,
+            'year': self.year,
+            'days': [
+                {
+                    'date': work_date.isoformat(),
+                    'shifts': day['shifts'],
+                    **HoursBreakdownService.to_hours(day['totals'])
+                }
+                for work_date, day in days.items()
+            ],
+            'locations': [
+                {
+                    'id': subtotal['id'],
+                    'name': subtotal['name'],
+                    'shifts': subtotal['shifts'],
+                    'days': len(subtotal['days']),
+                    **HoursBreakdownService.to_hours(subtotal['totals'])
+                }
+                for subtotal in sorted(locations.values(), key=lambda item: item['name'] or '')
+            ],
+            'summary': {
+                'shifts': sum(len(day['shifts']) for day in days.values()),
+                'days_worked': sum(1 for day in days.values() if day['shifts']),
+                **HoursBreakdownService.to_hours(month_totals)
+            },
+            'conflicts': ConflictIndexService.get_employee_conflicts(self.employee.id, self.month, self.year),
+            'cross_location_conflicts': cross_location_conflicts
+        }
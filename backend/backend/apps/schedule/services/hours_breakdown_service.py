@@ -0,0 +1,89 @@
+"""
+Podział zmian na składniki czasu pracy dla dodatków płacowych (noc, niedziela, święto).
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from ...holidays.services.holiday_calendar_service import HolidayCalendarService
+from ..utils import (
+    MINUTES_PER_DAY, NIGHT_START_MINUTE, NIGHT_END_MINUTE, SUNDAY_HOLIDAY_START_MINUTE, overlap_minutes
+)
+
+NIGHT_LENGTH = MINUTES_PER_DAY - NIGHT_START_MINUTE + NIGHT_END_MINUTE
+
+
+class HoursBreakdownService:
+    """
+    Dzieli zmianę na przedziały wyznaczone przez granice okien:
+
+    - night: pora nocna NIGHT_START_MINUTE-NIGHT_END_MINUTE (21:00-7:00),
+    - sunday / holiday: doba niedzielna/świąteczna od SUNDAY_HOLIDAY_START_MINUTE
+      danego dnia do tej samej godziny dnia następnego (6:00-6:00); święto
+      w niedzielę liczone jest tylko jako holiday - dodatek się nie dubluje,
+    - weekend: minuty w kalendarzowej sobocie lub niedzieli.
+
+    Minuty liczone są od północy dnia zmiany. Zmiana trwa krócej niż dobę, więc
+    wystarczą okna zaczynające się dzień wcześniej, w dniu zmiany i dzień później.
+    Święta pochodzą z kalendarza w bazie (HolidayCalendarService) - wczytywane
+    raz dla całego zakresu (for_range), potem podział nie odpytuje bazy.
+    """
+
+    BUCKETS = ('total', 'night', 'sunday', 'holiday', 'weekend')
+
+    def __init__(self, holidays: Optional[Set[date]] = None):
+        """
+        Args:
+            holidays: Daty świąt (None = brak świąt)
+        """
+        self.holidays = holidays or set()
+
+    @classmethod
+    def for_range(cls, date_from: date, date_to: date) -> 'HoursBreakdownService':
+        """Serwis ze świętami dla zmian z dni date_from..date_to (z dobą świąteczną z dnia poprzedniego)."""
+        return cls(HolidayCalendarService.get_dates(date_from - timedelta(days=1), date_to + timedelta(days=1)))
+
+    @staticmethod
+    def empty() -> Dict[str, int]:
+        return {bucket: 0 for bucket in HoursBreakdownService.BUCKETS}
+
+    def split(self, work_date: date, start_minute: int, duration: int) -> Dict[str, int]:
+        """
+        Returns:
+            {'total', 'night', 'sunday', 'holiday', 'weekend'} w minutach
+        """
+        end = start_minute + duration
+        breakdown = self.empty()
+        breakdown['total'] = duration
+
+        for day_offset in (-1, 0, 1):
+            day = work_date + timedelta(days=day_offset)
+            day_start = day_offset * MINUTES_PER_DAY
+
+            night_start = day_start + NIGHT_START_MINUTE
+            breakdown['night'] += overlap_minutes(start_minute, end, night_start, night_start + NIGHT_LENGTH)
+
+            if day_offset >= 0 and day.weekday() >= 5:
+                breakdown['weekend'] += overlap_minutes(start_minute, end, day_start, day_start + MINUTES_PER_DAY)
+
+            if day in self.holidays:
+                bucket = 'holiday'
+            elif day.weekday() == 6:
+                bucket = 'sunday'
+            else:
+                continue
+            window_start = day_start + SUNDAY_HOLIDAY_START_MINUTE
+            breakdown[bucket] += overlap_minutes(start_minute, end, window_start, window_start + MINUTES_PER_DAY)
+
+        return breakdown
+
+    def add(self, totals: Dict[str, int], work_date: date, start_minute: int, duration: int) -> Dict[str, int]:
+        """Dodaje podział zmiany do sum (totals modyfikowane w miejscu) i zwraca podział zmiany."""
+        breakdown = self.split(work_date, start_minute, duration)
+        for bucket, minutes in breakdown.items():
+            totals[bucket] += minutes
+        return breakdown
+
+    @staticmethod
+    def to_hours(breakdown: Dict[str, int], buckets: Iterable[str] = BUCKETS) -> Dict[str, float]:
+        """Minuty składników jako godziny: {'<bucket>_hours': 8.5, ...}."""
+        return {f"{bucket}_hours": round(breakdown[bucket] / 60, 2) for bucket in buckets}
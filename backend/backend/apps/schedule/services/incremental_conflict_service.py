@@ -0,0 +1,167 @@
+"""
+Przyrostowe przeliczanie konfliktów po zapisie pojedynczej zmiany.
+"""
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Tuple
+
+from ..models import WorkHours
+from .conflict_rule_service import ConflictRuleService
+from .conflicts import ConflictAggregator, ShiftIndex
+
+
+class IncrementalConflictService:
+    """
+    Przelicza konflikty tylko dla jednego pracownika i tylko w oknie
+    wokół zmienionej daty (sąsiednie dni + tydzień ISO).
+
+    Zmiana zmiany w dniu D może wpłynąć wyłącznie na:
+    - odpoczynek 11h w dniach D i D+1,
+    - przekroczenie 12h w dniu D,
+    - odpoczynek 35h w tygodniu ISO zawierającym D.
+
+    Okno nie jest przycinane do miesiąca - tak jak pełne przeliczenie
+    ConflictDetectionService widzi zmiany z sąsiednich miesięcy.
+    """
+
+    # Ile dni wstecz potrzeba, żeby zobaczyć poprzednią zmianę (także nocną)
+    LOOKBACK_DAYS = 2
+
+    def __init__(self, location_id: str, employee_id: str, changed_date: date):
+        """
+        Args:
+            location_id: UUID lokacji
+            employee_id: UUID pracownika
+            changed_date: Data zmienionego wpisu WorkHours
+        """
+        self.location_id = location_id
+        self.employee_id = employee_id
+        self.changed_date = changed_date
+        self.month = changed_date.month
+        self.year = changed_date.year
+
+    def get_fetch_range(self) -> Tuple[date, date]:
+        """Zwraca zakres dat (włącznie) potrzebny do przeliczenia okna."""
+        week_start = self.changed_date - timedelta(days=self.changed_date.weekday())
+        week_end = week_start + timedelta(days=6)
+
+        date_from = min(week_start, self.changed_date - timedelta(days=self.LOOKBACK_DAYS))
+        date_to = max(week_end, self.changed_date + timedelta(days=1))
+        return date_from, date_to
+
+    def detect_window_conflicts(self) -> Dict[str, Any]:
+        """
+        Wykrywa konflikty pracownika w oknie wokół zmienionej daty.
+
+        Returns:
+            Słownik w formacie ConflictDetectionService.detect_all_conflicts(),
+            ograniczony do kluczy, na które mogła wpłynąć zmiana.
+        """
+        date_from, date_to = self.get_fetch_range()
+        work_hours = WorkHours.objects.filter(
+            location_id=self.location_id,
+            employee_id=self.employee_id,
+            date__gte=date_from,
+            date__lte=date_to,
+            employee__agreement_type='permanent'  # Tylko UoP
+        ).only('employee_id', 'date', 'start_minute', 'duration_minutes').order_by('date')
+
+        shift_index = ShiftIndex.from_work_hours(work_hours)
+        if not shift_index.shifts_by_employee:
+            return self.empty_conflicts()
+
+        aggregator = ConflictAggregator(
+            shift_index, self.month, self.year,
+            rules=ConflictRuleService.get_enabled_rules(self.location_id),
+            location_id=self.location_id
+        )
+        conflicts = aggregator.detect_all_conflicts()
+
+        return self._restrict_to_window({
+            'rest_11h': conflicts['rest_11h_conflicts'],
+            'rest_35h': conflicts['rest_35h_conflicts'],
+            'exceed_12h': conflicts['shift_12h_conflicts']
+        })
+
+    def get_affected_dates(self) -> Dict[str, List[date]]:
+        """
+        Zwraca daty kluczy konfliktów, na które wpływa zmiana w changed_date.
+
+        Dla rest_35h zwracana jest data klucza tygodnia (poniedziałek tygodnia ISO).
+        """
+        week_start = self.changed_date - timedelta(days=self.changed_date.weekday())
+        return {
+            'rest_11h': [self.changed_date, self.changed_date + timedelta(days=1)],
+            'rest_35h': [week_start],
+            'exceed_12h': [self.changed_date]
+        }
+
+    def _restrict_to_window(self, conflicts: Dict[str, Any]) -> Dict[str, Any]:
+        """Zostawia tylko klucze, na które wpływa zmiana w changed_date."""
+        affected = self.get_affected_dates()
+        rest_11h_keys = {f"{self.employee_id}-{day}" for day in affected['rest_11h']}
+        shift_12h_keys = {f"{self.employee_id}-{day}" for day in affected['exceed_12h']}
+        week_num = self.changed_date.isocalendar()[1]
+
+        rest_35h = {}
+        for emp_id, weeks in conflicts['rest_35h'].items():
+            if str(emp_id) == str(self.employee_id) and week_num in weeks:
+                rest_35h[str(emp_id)] = [week_num]
+
+        return {
+            'rest_11h': [key for key in conflicts['rest_11h'] if key in rest_11h_keys],
+            'rest_35h': rest_35h,
+            'exceed_12h': [key for key in conflicts['exceed_12h'] if key in shift_12h_keys]
+        }
+
+    # === HELPER METHODS ===
+
+    @staticmethod
+    def empty_conflicts() -> Dict[str, Any]:
+        """Pusty zbiór konfliktów w formacie API."""
+        return {
+            'rest_11h': [],
+            'rest_35h': {},
+            'exceed_12h': []
+        }
+
+    @staticmethod
+    def merge_conflicts(conflict_sets: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Łączy kilka zbiorów konfliktów (np. stare i nowe okno przy przeniesieniu zmiany)."""
+        merged = IncrementalConflictService.empty_conflicts()
+        for conflicts in conflict_sets:
+            for key in conflicts['rest_11h']:
+                if key not in merged['rest_11h']:
+                    merged['rest_11h'].append(key)
+            for key in conflicts['exceed_12h']:
+                if key not in merged['exceed_12h']:
+                    merged['exceed_12h'].append(key)
+            for emp_id, weeks in conflicts['rest_35h'].items():
+                emp_weeks = merged['rest_35h'].setdefault(str(emp_id), [])
+                emp_weeks.extend(week for week in weeks if week not in emp_weeks)
+        return merged
+
+    @staticmethod
+    def diff_conflicts(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Zwraca różnicę między dwoma zbiorami konfliktów.
+
+        Returns:
+            {'added': {...}, 'removed': {...}} - oba w formacie API
+        """
+        def _diff(source, other):
+            other_35h = {str(emp_id): weeks for emp_id, weeks in other['rest_35h'].items()}
+            rest_35h = {}
+            for emp_id, weeks in source['rest_35h'].items():
+                missing = [week for week in weeks if week not in other_35h.get(str(emp_id), [])]
+                if missing:
+                    rest_35h[str(emp_id)] = missing
+            return {
+                'rest_11h': [key for key in source['rest_11h'] if key not in other['rest_11h']],
+                'rest_35h': rest_35h,
+                'exceed_12h': [key for key in source['exceed_12h'] if key not in other['exceed_12h']]
+            }
+
+        return {
+            'added': _diff(after, before),
+            'removed': _diff(before, after)
+        }
@@ -0,0 +1,209 @@
+"""
+Utrzymanie i odczyt sum godzin pracownik-lokacja-miesiąc (MonthlyHoursSummary).
+"""
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from ..models import MonthlyHoursSummary, WorkHours
+from ..utils import DAILY_NORM_MINUTES, month_range
+from .conflict_index_service import ConflictIndexService
+from .hours_breakdown_service import HoursBreakdownService
+
+
+class MonthlyHoursSummaryService:
+    """
+    Serwis sum godzin.
+
+    - refresh(): przeliczenie sum pracownika w miesiącu po zapisie pojedynczego WorkHours
+    - rebuild_range(): przeliczenie wszystkich sum lokacji w miesiącach zakresu
+      (operacje masowe, komenda rebuild_hours_summary)
+    - get_month() / get_month_report(): odczyt sum lokacji-miesiąca jednym zapytaniem
+
+    Sumy liczone są z kolumn strukturalnych (start_minute, duration_minutes) -
+    bez parsowania tekstu godzin; podział na składniki robi HoursBreakdownService
+    ze świętami wczytanymi raz dla przeliczanych miesięcy.
+
+    daily_overtime_minutes liczone jest z sumy dnia pracownika we wszystkich
+    lokacjach: nadwyżkę ponad normę dobową dostają kolejne (wg godziny
+    rozpoczęcia) zmiany dnia, które ją przekraczają. Suma pola po lokacjach
+    pracownika to jego praca ponad normę dobową - dlatego zapis w jednej
+    lokacji przelicza sumy pracownika także w pozostałych.
+    """
+
+    FIELDS = (
+        'total_minutes', 'shift_count', 'night_minutes', 'weekend_minutes', 'sunday_minutes', 'holiday_minutes',
+        'daily_overtime_minutes'
+    )
+
+    # Kolumny WorkHours wczytywane do przeliczenia
+    ROW_FIELDS = ('employee_id', 'location_id', 'date', 'start_minute', 'duration_minutes')
+
+    # Składnik HoursBreakdownService -> pole sumy
+    BREAKDOWN_FIELDS = {
+        'total': 'total_minutes',
+        'night': 'night_minutes',
+        'weekend': 'weekend_minutes',
+        'sunday': 'sunday_minutes',
+        'holiday': 'holiday_minutes',
+    }
+
+    # === ODCZYT ===
+
+    @staticmethod
+    def get_month(location_id: str, month: int, year: int) -> Dict[str, Dict[str, int]]:
+        """
+        Returns:
+            {employee_id: {'total_minutes', 'shift_count', 'night_minutes', 'weekend_minutes',
+                           'sunday_minutes', 'holiday_minutes', 'daily_overtime_minutes'}}
+        """
+        rows = MonthlyHoursSummary.objects.filter(
+            location_id=location_id,
+            year=year,
+            month=month
+        ).values_list('employee_id', *MonthlyHoursSummaryService.FIELDS)
+        return {
+            str(employee_id): dict(zip(MonthlyHoursSummaryService.FIELDS, totals))
+            for employee_id, *totals in rows
+        }
+
+    @staticmethod
+    def get_month_report(location_id: str, month: int, year: int) -> List[Dict[str, Any]]:
+        """
+        Sumy lokacji-miesiąca w godzinach, z nazwami pracowników (jedno zapytanie).
+
+        Returns:
+            [{'employee', 'employee_name', 'shift_count', 'total_hours', 'night_hours',
+              'sunday_hours', 'holiday_hours', 'weekend_hours'}, ...]
+        """
+        rows = MonthlyHoursSummary.objects.filter(
+            location_id=location_id,
+            year=year,
+            month=month
+        ).order_by('employee__full_name').values_list(
+            'employee_id', 'employee__full_name', *MonthlyHoursSummaryService.FIELDS
+        )
+        report = []
+        for employee_id, full_name, *totals in rows:
+            totals = dict(zip(MonthlyHoursSummaryService.FIELDS, totals))
+            report.append({
+                'employee': str(employee_id),
+                'employee_name': full_name,
+                'shift_count': totals['shift_count'],
+                **MonthlyHoursSummaryService.to_hours(totals)
+            })
+        return report
+
+    @staticmethod
+    def to_hours(totals: Dict[str, int]) -> Dict[str, float]:
+        """Minuty sumy jako godziny: {'total_hours', 'night_hours', 'sunday_hours', 'holiday_hours', 'weekend_hours'}."""
+        return HoursBreakdownService.to_hours({
+            bucket: totals[field] for bucket, field in MonthlyHoursSummaryService.BREAKDOWN_FIELDS.items()
+        })
+
+    # === AKTUALIZACJA ===
+
+    @staticmethod
+    def refresh(employee_id: str, work_date: date) -> None:
+        """Przelicza sumy pracownika we wszystkich lokacjach w miesiącu zawierającym work_date."""
+        rows = WorkHours.objects.filter(
+            employee_id=employee_id,
+            location__isnull=False
+        ).in_month(work_date.year, work_date.month).values_list(*MonthlyHoursSummaryService.ROW_FIELDS)
+        first, next_first = month_range(work_date.year, work_date.month)
+        breakdown = HoursBreakdownService.for_range(first, next_first - timedelta(days=1))
+        totals = MonthlyHoursSummaryService.summarize_by_month(rows, breakdown)
+
+        summary_filter = {'employee_id': employee_id, 'year': work_date.year, 'month': work_date.month}
+        with transaction.atomic():
+            MonthlyHoursSummary.objects.filter(**summary_filter).exclude(
+                location_id__in=[location_id for _, location_id, _, _ in totals]
+            ).delete()
+            for (_, location_id, _, _), location_totals in totals.items():
+                MonthlyHoursSummary.objects.update_or_create(
+                    defaults=location_totals, location_id=location_id, **summary_filter
+                )
+
+    @staticmethod
+    def rebuild_range(location_id: str, date_from: date, date_to: date) -> int:
+        """
+        Przelicza sumy lokacji we wszystkich miesiącach zakresu - razem z sumami jej
+        pracowników w innych lokacjach (praca ponad normę dobową zależy od całego dnia).
+
+        Returns:
+            Liczba zapisanych sum
+        """
+        months = list(ConflictIndexService.iter_months(date_from, date_to))
+        first, _ = month_range(*months[0])
+        _, next_first = month_range(*months[-1])
+        months_filter = Q()
+        for year, month in months:
+            months_filter |= Q(year=year, month=month)
+
+        # Pracownicy z wpisami lokacji w zakresie lub z jej sumami sprzed zmiany
+        employee_ids = set(WorkHours.objects.filter(
+            location_id=location_id,
+            date__gte=first,
+            date__lt=next_first
+        ).values_list('employee_id', flat=True).order_by().distinct())
+        employee_ids.update(MonthlyHoursSummary.objects.filter(
+            months_filter, location_id=location_id
+        ).values_list('employee_id', flat=True).order_by().distinct())
+
+        rows = WorkHours.objects.filter(
+            employee_id__in=employee_ids,
+            location__isnull=False,
+            date__gte=first,
+            date__lt=next_first
+        ).values_list(*MonthlyHoursSummaryService.ROW_FIELDS)
+        breakdown = HoursBreakdownService.for_range(first, next_first - timedelta(days=1))
+
+        summaries = [
+            MonthlyHoursSummary(employee_id=employee_id, location_id=row_location_id, year=year, month=month, **totals)
+            for (employee_id, row_location_id, year, month), totals
+            in MonthlyHoursSummaryService.summarize_by_month(rows, breakdown).items()
+        ]
+
+        with transaction.atomic():
+            MonthlyHoursSummary.objects.filter(months_filter).filter(
+                Q(location_id=location_id) | Q(employee_id__in=employee_ids)
+            ).delete()
+            MonthlyHoursSummary.objects.bulk_create(summaries, batch_size=1000)
+        return len(summaries)
+
+    # === OBLICZENIA ===
+
+    @staticmethod
+    def summarize_by_month(rows: Iterable[Tuple],
+                           breakdown: HoursBreakdownService) -> Dict[Tuple[str, str, int, int], Dict[str, Any]]:
+        """
+        Jedno przejście po krotkach ROW_FIELDS (employee_id, location_id, date, start_minute, duration_minutes).
+
+        Returns:
+            {(employee_id, location_id, rok, miesiąc): {pole: minuty, ..., 'shift_count': n}} (pola jak FIELDS)
+            Wpisy bez godzin (np. "DWH") tworzą sumę z zerami. daily_overtime_minutes - nadwyżka dnia
+            pracownika ponad DAILY_NORM_MINUTES przypisana zmianom, które ją tworzą (krotki muszą
+            obejmować wszystkie lokacje pracownika w danym dniu).
+        """
+        totals = {}
+        days = {}
+        for employee_id, location_id, work_date, start_minute, duration in rows:
+            summary = totals.setdefault((str(employee_id), str(location_id), work_date.year, work_date.month), {
+                field: 0 for field in MonthlyHoursSummaryService.FIELDS
+            })
+            if start_minute is None:
+                continue
+            summary['shift_count'] += 1
+            for bucket, minutes in breakdown.split(work_date, start_minute, duration).items():
+                summary[MonthlyHoursSummaryService.BREAKDOWN_FIELDS[bucket]] += minutes
+            days.setdefault((str(employee_id), work_date), []).append((start_minute, str(location_id), duration))
+
+        for (employee_id, work_date), shifts in days.items():
+            worked = 0
+            for _, location_id, duration in sorted(shifts):
+                overtime = max(0, worked + duration - DAILY_NORM_MINUTES) - max(0, worked - DAILY_NORM_MINUTES)
+                worked += duration
+                totals[(employee_id, location_id, work_date.year, work_date.month)]['daily_overtime_minutes'] += overtime
+        return totals
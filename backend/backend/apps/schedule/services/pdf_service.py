@@ -8,7 +8,8 @@ from weasyprint import HTML
 
 
 from ..models import WorkHours
-from ..utils import calculate_hours, get_polish_weekday_name, get_polish_month_name
+from ..utils import get_polish_weekday_name, get_polish_month_name
+from .monthly_hours_summary_service import MonthlyHoursSummaryService
 from ...employees.models import Employee
 from ...locations.models import Location
 
@@ -57,7 +58,8 @@ class PDFGeneratorService:
         work_hours = self._get_work_hours()
         days = self._get_days_structure()
         hours_map = self._build_hours_map(work_hours)
-        employees_schedule = self._build_employees_schedule(employees, hours_map)
+        monthly_totals = MonthlyHoursSummaryService.get_month(self.location_id, self.month, self.year)
+        employees_schedule = self._build_employees_schedule(employees, hours_map, monthly_totals)
 
         return {
             'location_name': self.location.name,
@@ -89,10 +91,8 @@ class PDFGeneratorService:
     def _get_work_hours(self):
         """Pobiera WorkHours dla danego miesiąca i lokacji."""
         return WorkHours.objects.filter(
-            location_id=self.location_id,
-            date__month=self.month,
-            date__year=self.year
-        ).select_related('employee')
+            location_id=self.location_id
+        ).in_month(self.year, self.month).select_related('employee')
 
     def _get_days_structure(self):
         """Przygotowuje strukturę dni miesiąca."""
@@ -120,19 +120,21 @@ class PDFGeneratorService:
             hours_map[wh.employee_id][wh.date.day] = wh.hours
         return hours_map
 
-    def _build_employees_schedule(self, employees, hours_map):
-        """Przygotowuje dane pracowników z grafikiem i sumą godzin."""
+    def _build_employees_schedule(self, employees, hours_map, monthly_totals):
+        """
+        Przygotowuje dane pracowników z grafikiem i sumą godzin (z MonthlyHoursSummary):
+        total_hours oraz składniki night_hours, sunday_hours, holiday_hours, weekend_hours.
+        """
+        empty_totals = {field: 0 for field in MonthlyHoursSummaryService.FIELDS}
         employees_schedule = []
         for employee in employees:
             employee_hours = hours_map.get(employee.id, {})
-            total_hours = sum(
-                calculate_hours(hours) for hours in employee_hours.values()
-            )
+            totals = monthly_totals.get(str(employee.id), empty_totals)
 
             employees_schedule.append({
                 'name': employee.full_name,
                 'hours': employee_hours,
-                'total_hours': round(total_hours, 2)
+                **MonthlyHoursSummaryService.to_hours(totals)
             })
 
         return employees_schedule
@@ -0,0 +1,242 @@
+"""
+Generowanie grafiku z wzorców rotacji.
+"""
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+
+from ...employees.models import Employee
+from ..models import RotationPattern, WorkHours
+from ..signals import suspend_conflict_signals
+from ..utils import parse_shift_minutes, shift_duration_minutes
+from .conflict_detection_service import ConflictDetectionService
+from .conflict_index_service import ConflictIndexService
+from .conflict_rule_service import ConflictRuleService
+from .monthly_hours_summary_service import MonthlyHoursSummaryService
+from .schedule_change_service import ScheduleChangeService
+from .conflicts import ShiftIndex, ShiftInterval
+from .conflicts.shift_index import MINUTES_PER_DAY
+from .schedule_version_service import ScheduleVersionService
+
+
+class RotationGeneratorService:
+    """
+    Rozwija wzorzec rotacji w komórki WorkHours dla zakresu dat.
+
+    - rozwinięcie liczone w pamięci (cykl parsowany raz, nie per komórka),
+    - walidacja reguł 11h/35h/12h na połączeniu istniejącego grafiku
+      i wygenerowanych komórek - przed zapisem,
+    - dry_run zwraca podgląd (komórki + konflikty) bez zapisu,
+    - zapis porcjami bulk_create, konflikty indeksowane raz na końcu.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, pattern: RotationPattern, date_from: date, date_to: date,
+                 employee_ids: Optional[Iterable[str]] = None, overwrite: bool = False):
+        """
+        Args:
+            pattern: Wzorzec rotacji (z lokacją)
+            date_from, date_to: Zakres generowania (włącznie)
+            employee_ids: Opcjonalnie - tylko ci pracownicy wzorca
+            overwrite: Nadpisz istniejące komórki (domyślnie pomijane)
+        """
+        self.pattern = pattern
+        self.location_id = str(pattern.location_id)
+        self.date_from = date_from
+        self.date_to = date_to
+        self.employee_ids = {str(employee_id) for employee_id in employee_ids} if employee_ids else None
+        self.overwrite = overwrite
+        self.months = ScheduleVersionService.affected_months(date_from, date_to)
+
+    def generate(self, dry_run: bool = False, force: bool = False) -> Dict[str, Any]:
+        """
+        Rozwija wzorzec, waliduje i (jeśli nie dry_run) zapisuje.
+
+        Args:
+            dry_run: Tylko podgląd - nic nie jest zapisywane
+            force: Zapisz mimo wykrytych konfliktów
+
+        Returns:
+            {
+                'cells': [{'employee', 'date', 'hours'}, ...],   # komórki do zapisu
+                'skipped': n,                                     # istniejące komórki pominięte
+                'conflicts': [{'year', 'month', 'conflicts'}, ...],
+                'conflict_count': n,
+                'committed': bool
+            }
+        """
+        assignments = self._get_assignments()
+        existing = self._get_existing([employee_id for employee_id, _ in assignments])
+        cells, skipped = self._expand(assignments, existing)
+        conflicts = self._validate(cells, existing)
+        conflict_count = sum(self._count(month['conflicts']) for month in conflicts)
+
+        committed = False
+        if not dry_run and cells and (force or not conflict_count):
+            self._write(cells)
+            committed = True
+
+        return {
+            'cells': [
+                {'employee': employee_id, 'date': work_date.isoformat(), 'hours': hours}
+                for employee_id, work_date, hours in cells
+            ],
+            'skipped': skipped,
+            'conflicts': conflicts,
+            'conflict_count': conflict_count,
+            'committed': committed
+        }
+
+    # === ROZWINIĘCIE ===
+
+    def _expand(self, assignments: List[Tuple[str, int]],
+                existing: Dict[tuple, Optional[Tuple[int, int]]]) -> Tuple[List[tuple], int]:
+        """Zwraca komórki [(employee_id, data, hours), ...] i liczbę pominiętych istniejących."""
+        cycle = self.pattern.cycle
+        anchor = self.pattern.anchor_date.toordinal()
+
+        cells = []
+        skipped = 0
+        for employee_id, offset in assignments:
+            current = self.date_from
+            while current <= self.date_to:
+                hours = cycle[(current.toordinal() - anchor + offset) % len(cycle)]
+                if hours:
+                    if (employee_id, current) in existing and not self.overwrite:
+                        skipped += 1
+                    else:
+                        cells.append((employee_id, current, hours))
+                current += timedelta(days=1)
+        return cells, skipped
+
+    def _get_assignments(self) -> List[Tuple[str, int]]:
+        assignments = self.pattern.assignments.values_list('employee_id', 'start_offset')
+        return [
+            (str(employee_id), offset) for employee_id, offset in assignments
+            if self.employee_ids is None or str(employee_id) in self.employee_ids
+        ]
+
+    # === WALIDACJA ===
+
+    def _validate(self, cells: List[tuple], existing: Dict[tuple, Optional[Tuple[int, int]]]) -> List[Dict[str, Any]]:
+        """
+        Wykrywa konflikty pracowników wzorca na grafiku po zapisie (istniejące
+        wpisy + wygenerowane komórki) - bez zapisu i bez zapytań per miesiąc.
+
+        Sprawdzane są też miesiące sąsiednie, jeśli zakres dotyka tygodnia na przełomie.
+        """
+        shifts = dict(existing)
+        parsed = {}
+        for employee_id, work_date, hours in cells:
+            if hours not in parsed:
+                parsed[hours] = self._parse(hours)
+            shifts[(employee_id, work_date)] = parsed[hours]
+
+        permanent = self._get_permanent_employees({employee_id for employee_id, _ in shifts})
+        rules = ConflictRuleService.get_enabled_rules(self.location_id)
+
+        results = []
+        for year, month in self.months:
+            window_from, window_to = ConflictDetectionService.month_window(year, month)
+            shifts_by_employee = {}
+            for (employee_id, work_date), shift in shifts.items():
+                if shift is None or employee_id not in permanent or not window_from <= work_date < window_to:
+                    continue
+                start = work_date.toordinal() * MINUTES_PER_DAY + shift[0]
+                shifts_by_employee.setdefault(employee_id, []).append(
+                    ShiftInterval(work_date, start, start + shift[1])
+                )
+            for intervals in shifts_by_employee.values():
+                intervals.sort()
+
+            detection = ConflictDetectionService(self.location_id, month, year)
+            results.append({
+                'year': year,
+                'month': month,
+                'conflicts': detection.detect_for_shift_index(ShiftIndex(shifts_by_employee), rules=rules)
+            })
+        return results
+
+    def _get_existing(self, employee_ids: List[str]) -> Dict[tuple, Optional[Tuple[int, int]]]:
+        """
+        Istniejące wpisy pracowników wzorca z okna walidacji jednym zapytaniem:
+        {(employee_id, data): (minuta startu, długość) lub None dla wpisów bez godzin}.
+        """
+        window_from, _ = ConflictDetectionService.month_window(*self.months[0])
+        _, window_to = ConflictDetectionService.month_window(*self.months[-1])
+        rows = WorkHours.objects.filter(
+            location_id=self.location_id,
+            employee_id__in=employee_ids,
+            date__gte=window_from,
+            date__lt=window_to
+        ).values_list('employee_id', 'date', 'start_minute', 'duration_minutes')
+
+        return {
+            (str(employee_id), work_date): (start_minute, duration) if start_minute is not None else None
+            for employee_id, work_date, start_minute, duration in rows
+        }
+
+    @staticmethod
+    def _get_permanent_employees(employee_ids) -> set:
+        """Tylko UoP podlega regułom 11h/35h/12h."""
+        return {
+            str(employee_id) for employee_id in Employee.objects.filter(
+                id__in=employee_ids,
+                agreement_type='permanent'
+            ).values_list('id', flat=True)
+        }
+
+    # === ZAPIS ===
+
+    def _write(self, cells: List[tuple]) -> None:
+        """Zapisuje komórki porcjami i raz odświeża indeks konfliktów oraz wersje."""
+        objects = []
+        for employee_id, work_date, hours in cells:
+            work_hours = WorkHours(
+                employee_id=employee_id,
+                location_id=self.location_id,
+                date=work_date,
+                hours=hours
+            )
+            work_hours.normalize_hours()
+            objects.append(work_hours)
+
+        with transaction.atomic(), suspend_conflict_signals():
+            WorkHours.objects.bulk_create(
+                objects,
+                batch_size=self.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['employee', 'location', 'date'],
+                update_fields=['hours', *WorkHours.STRUCTURED_HOURS_FIELDS]
+            )
+
+            # Jedno przeliczenie konfliktów dla miesięcy zakresu (z sąsiednimi na przełomie tygodnia)
+            (first_year, first_month), (last_year, last_month) = self.months[0], self.months[-1]
+            ConflictIndexService.rebuild_range(
+                self.location_id,
+                date(first_year, first_month, 1),
+                date(last_year, last_month, 1)
+            )
+            ScheduleVersionService.bump_range(self.location_id, self.date_from, self.date_to)
+            MonthlyHoursSummaryService.rebuild_range(self.location_id, self.date_from, self.date_to)
+            ScheduleChangeService.record(ScheduleChangeService.upsert(work_hours) for work_hours in objects)
+
+    # === HELPER METHODS ===
+
+    @staticmethod
+    def _parse(hours: str) -> Optional[Tuple[int, int]]:
+        """(minuta startu, długość) albo None dla kodów bez godzin."""
+        parsed = parse_shift_minutes(hours)
+        if not parsed:
+            return None
+        return parsed[0], shift_duration_minutes(*parsed)
+
+    @staticmethod
+    def _count(conflicts: Dict[str, Any]) -> int:
+        return (
+            len(conflicts['rest_11h'])
+            + len(conflicts['exceed_12h'])
+            + sum(len(weeks) for weeks in conflicts['rest_35h'].values())
+        )
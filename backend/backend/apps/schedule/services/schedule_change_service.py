@@ -0,0 +1,151 @@
+"""
+Dziennik zmian grafiku - zapis i odczyt przyrostowy (synchronizacja klientów).
+"""
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef
+
+from ...locations.models import Location
+from ..models import ScheduleChange, ScheduleChangeFloor, WorkHours
+
+
+class ScheduleChangeService:
+    """
+    Dopisuje zmiany komórek WorkHours do ScheduleChange i zwraca zmiany od kursora.
+
+    Kolejność seq: przed dopisaniem blokowany jest wiersz lokacji (select_for_update),
+    więc transakcje jednej lokacji dostają seq w kolejności zatwierdzania - klient
+    z kursorem N nie przegapi zmiany z niższym seq zatwierdzonej później.
+    """
+
+    @staticmethod
+    def upsert(work_hours: WorkHours) -> ScheduleChange:
+        """Wpis dziennika dla zapisanej komórki (bez zapisu do bazy)."""
+        return ScheduleChange(
+            location_id=work_hours.location_id,
+            employee_id=work_hours.employee_id,
+            date=work_hours.date,
+            op=ScheduleChange.OP_UPSERT,
+            work_hours_id=work_hours.pk,
+            hours=work_hours.hours
+        )
+
+    @staticmethod
+    def delete(location_id, employee_id, work_date, work_hours_id=None) -> ScheduleChange:
+        """Wpis dziennika dla wyczyszczonej komórki (bez zapisu do bazy)."""
+        return ScheduleChange(
+            location_id=location_id,
+            employee_id=employee_id,
+            date=work_date,
+            op=ScheduleChange.OP_DELETE,
+            work_hours_id=work_hours_id
+        )
+
+    @staticmethod
+    def record(changes: Iterable[ScheduleChange]) -> None:
+        """Dopisuje zmiany (komórki bez lokacji są pomijane - nie należą do żadnego grafiku)."""
+        changes = [change for change in changes if change.location_id is not None]
+        if not changes:
+            return
+
+        with transaction.atomic():
+            location_ids = sorted({str(change.location_id) for change in changes})
+            list(Location.objects.select_for_update().filter(id__in=location_ids).order_by('id').values_list('id', flat=True))
+            ScheduleChange.objects.bulk_create(changes, batch_size=1000)
+
+    @staticmethod
+    def get_cursor(location_id: str) -> int:
+        """Aktualny kursor lokacji (najwyższy seq; 0 dla pustego dziennika)."""
+        cursor = ScheduleChange.objects.filter(location_id=location_id).aggregate(cursor=Max('seq'))['cursor']
+        if cursor is None:
+            floor = ScheduleChangeFloor.objects.filter(location_id=location_id).values_list('purged_seq', flat=True).first()
+            return floor or 0
+        return cursor
+
+    @staticmethod
+    def get_changes(location_id: str, since: int, limit: int) -> Dict[str, Any]:
+        """
+        Zmiany lokacji z seq > since (najwyżej limit).
+
+        Returns:
+            {
+                'changes': [{'seq', 'op', 'id', 'employee', 'date', 'hours'}, ...],
+                'cursor': seq ostatniej zwróconej zmiany (kolejne since),
+                'has_more': czy są dalsze zmiany,
+                'reset': True, jeśli część zmian od since usunięto - klient pobiera grafik od nowa
+            }
+        """
+        purged_seq = ScheduleChangeFloor.objects.filter(
+            location_id=location_id
+        ).values_list('purged_seq', flat=True).first() or 0
+        if since < purged_seq:
+            return {
+                'changes': [],
+                'cursor': ScheduleChangeService.get_cursor(location_id),
+                'has_more': False,
+                'reset': True
+            }
+
+        rows = list(ScheduleChange.objects.filter(
+            location_id=location_id,
+            seq__gt=since
+        ).order_by('seq').values_list('seq', 'op', 'work_hours_id', 'employee_id', 'date', 'hours')[:limit + 1])
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'changes': [
+                {
+                    'seq': seq,
+                    'op': op,
+                    'id': str(work_hours_id) if work_hours_id else None,
+                    'employee': str(employee_id),
+                    'date': work_date.isoformat(),
+                    'hours': hours
+                }
+                for seq, op, work_hours_id, employee_id, work_date, hours in rows
+            ],
+            'cursor': rows[-1][0] if rows else since,
+            'has_more': has_more,
+            'reset': False
+        }
+
+    @staticmethod
+    def compact(older_than: datetime, purge_before: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Kompaktuje dziennik.
+
+        - zmiany starsze niż older_than, po których ta sama komórka zmieniła się
+          ponownie, są usuwane - klient i tak dostanie nowszy stan komórki
+          (bezpieczne dla każdego kursora),
+        - opcjonalnie wszystkie zmiany starsze niż purge_before są usuwane,
+          a granica lokacji (ScheduleChangeFloor) przesuwana - klienci ze
+          starszym kursorem dostaną reset.
+
+        Returns:
+            {'superseded': n, 'purged': n}
+        """
+        newer = ScheduleChange.objects.filter(
+            location_id=OuterRef('location_id'),
+            employee_id=OuterRef('employee_id'),
+            date=OuterRef('date'),
+            seq__gt=OuterRef('seq')
+        )
+        superseded, _ = ScheduleChange.objects.filter(created_at__lt=older_than).filter(Exists(newer)).delete()
+
+        purged = 0
+        if purge_before is not None:
+            with transaction.atomic():
+                expired = ScheduleChange.objects.filter(created_at__lt=purge_before)
+                for location_id, max_seq in expired.values('location_id').annotate(
+                    max_seq=Max('seq')
+                ).order_by().values_list('location_id', 'max_seq'):
+                    floor, _ = ScheduleChangeFloor.objects.select_for_update().get_or_create(location_id=location_id)
+                    if max_seq > floor.purged_seq:
+                        floor.purged_seq = max_seq
+                        floor.save(update_fields=['purged_seq', 'purged_at'])
+                purged, _ = expired.delete()
+
+        return {'superseded': superseded, 'purged': purged}
@@ -0,0 +1,170 @@
+"""
+Kopiowanie grafiku (np. poprzedni tydzień/miesiąc na kolejny) po stronie serwera.
+"""
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Optional
+
+from django.db import transaction
+
+from ..models import WorkHours
+from ..signals import suspend_conflict_signals
+from .conflict_index_service import ConflictIndexService
+from .monthly_hours_summary_service import MonthlyHoursSummaryService
+from .schedule_change_service import ScheduleChangeService
+from .schedule_version_service import ScheduleVersionService
+
+
+class ScheduleCopyService:
+    """
+    Kopiuje wpisy WorkHours lokacji z zakresu źródłowego do docelowego.
+
+    Wyrównanie:
+    - 'weekday': przesunięcie zaokrąglone do pełnych tygodni, więc poniedziałek
+      trafia na poniedziałek; dni docelowe poza zakresem źródła biorą ten sam
+      dzień tygodnia z sąsiedniego tygodnia źródła (wzorzec tygodniowy się powtarza),
+    - 'date': dzień po dniu od początku zakresu (np. 1. na 1.).
+
+    Istniejące komórki docelowe są pomijane albo nadpisywane (overwrite).
+    Wpisy tworzone są porcjami bulk_create (bez zapisu wiersz po wierszu),
+    a konflikty przeliczane raz na końcu.
+    """
+
+    ALIGN_WEEKDAY = 'weekday'
+    ALIGN_DATE = 'date'
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, location_id: str, source_from: date, source_to: date,
+                 target_from: date, target_to: Optional[date] = None,
+                 align: str = ALIGN_WEEKDAY, employee_ids: Optional[Iterable[str]] = None,
+                 overwrite: bool = False):
+        """
+        Args:
+            location_id: UUID lokacji
+            source_from, source_to: Zakres źródłowy (włącznie)
+            target_from, target_to: Zakres docelowy (włącznie); domyślnie tej samej długości co źródło
+            align: 'weekday' lub 'date'
+            employee_ids: Opcjonalnie - kopiuj tylko tych pracowników
+            overwrite: Nadpisz istniejące komórki docelowe (domyślnie pomijane)
+        """
+        self.location_id = location_id
+        self.source_from = source_from
+        self.source_to = source_to
+        self.target_from = target_from
+        self.target_to = target_to or target_from + (source_to - source_from)
+        self.align = align
+        self.employee_ids = [str(employee_id) for employee_id in employee_ids] if employee_ids else None
+        self.overwrite = overwrite
+
+    def copy(self) -> Dict[str, int]:
+        """
+        Wykonuje kopiowanie.
+
+        Returns:
+            {'created': n, 'updated': n, 'skipped': n}
+        """
+        source = self._get_source_cells()
+        existing = self._get_existing_cells()
+
+        to_create: List[WorkHours] = []
+        to_update: List[WorkHours] = []
+        skipped = 0
+
+        current = self.target_from
+        while current <= self.target_to:
+            source_date = self.map_to_source(current)
+            for employee_id, row in source.get(source_date, {}).items():
+                current_hours = existing.get((employee_id, current))
+                if current_hours is not None and (not self.overwrite or current_hours == row['hours']):
+                    skipped += 1
+                    continue
+
+                work_hours = WorkHours(
+                    employee_id=employee_id,
+                    location_id=self.location_id,
+                    date=current,
+                    **row
+                )
+                (to_update if current_hours is not None else to_create).append(work_hours)
+            current += timedelta(days=1)
+
+        if to_create or to_update:
+            with transaction.atomic(), suspend_conflict_signals():
+                WorkHours.objects.bulk_create(
+                    to_create + to_update,
+                    batch_size=self.BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=['employee', 'location', 'date'],
+                    update_fields=['hours', *WorkHours.STRUCTURED_HOURS_FIELDS]
+                )
+
+                # Jedno przeliczenie konfliktów dla miesięcy zakresu docelowego
+                ConflictIndexService.rebuild_range(self.location_id, *self._rebuild_range())
+                ScheduleVersionService.bump_range(self.location_id, self.target_from, self.target_to)
+                MonthlyHoursSummaryService.rebuild_range(self.location_id, self.target_from, self.target_to)
+                ScheduleChangeService.record(ScheduleChangeService.upsert(work_hours) for work_hours in to_create + to_update)
+
+        return {
+            'created': len(to_create),
+            'updated': len(to_update),
+            'skipped': skipped
+        }
+
+    def map_to_source(self, target_date: date) -> Optional[date]:
+        """Zwraca datę źródłową dla dnia docelowego (None, jeśli brak odpowiednika)."""
+        if self.align == self.ALIGN_DATE:
+            source_date = self.source_from + (target_date - self.target_from)
+            return source_date if source_date <= self.source_to else None
+
+        # Przesunięcie o pełne tygodnie najbliższe przesunięciu zakresów
+        shift_weeks = round((self.target_from - self.source_from).days / 7)
+        source_date = target_date - timedelta(weeks=shift_weeks)
+        while source_date > self.source_to:
+            source_date -= timedelta(weeks=1)
+        while source_date < self.source_from:
+            source_date += timedelta(weeks=1)
+        # Źródło krótsze niż tydzień nie ma każdego dnia tygodnia
+        return source_date if source_date <= self.source_to else None
+
+    def target_months(self) -> List[tuple]:
+        """(rok, miesiąc) zakresu docelowego."""
+        return list(ConflictIndexService.iter_months(self.target_from, self.target_to))
+
+    # === HELPER METHODS ===
+
+    def _get_source_cells(self) -> Dict[date, Dict[str, Dict[str, Any]]]:
+        """Wpisy źródłowe jednym zapytaniem: {data: {employee_id: pola do skopiowania}}."""
+        fields = ['hours', *WorkHours.STRUCTURED_HOURS_FIELDS]
+        queryset = WorkHours.objects.filter(
+            location_id=self.location_id,
+            date__gte=self.source_from,
+            date__lte=self.source_to
+        )
+        if self.employee_ids is not None:
+            queryset = queryset.filter(employee_id__in=self.employee_ids)
+
+        cells = {}
+        for row in queryset.values('employee_id', 'date', *fields):
+            cells.setdefault(row['date'], {})[str(row['employee_id'])] = {field: row[field] for field in fields}
+        return cells
+
+    def _get_existing_cells(self) -> Dict[tuple, str]:
+        """Istniejące komórki docelowe jednym zapytaniem: {(employee_id, data): hours}."""
+        queryset = WorkHours.objects.filter(
+            location_id=self.location_id,
+            date__gte=self.target_from,
+            date__lte=self.target_to
+        )
+        if self.employee_ids is not None:
+            queryset = queryset.filter(employee_id__in=self.employee_ids)
+
+        return {
+            (str(employee_id), work_date): hours
+            for employee_id, work_date, hours in queryset.values_list('employee_id', 'date', 'hours')
+        }
+
+    def _rebuild_range(self) -> tuple:
+        """Miesiące do przebudowy indeksu - z sąsiednimi, jeśli zakres dotyka tygodnia na przełomie."""
+        months = ScheduleVersionService.affected_months(self.target_from, self.target_to)
+        (first_year, first_month), (last_year, last_month) = months[0], months[-1]
+        return date(first_year, first_month, 1), date(last_year, last_month, 1)
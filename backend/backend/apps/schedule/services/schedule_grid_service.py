@@ -0,0 +1,148 @@
+"""
+Kolumnowa (macierzowa) reprezentacja grafiku dla siatki pracownicy × dni.
+"""
+from datetime import date, timedelta
+from typing import Dict, Any, Iterable, List, Optional
+
+from ...employees.models import Employee
+
+
+class ScheduleGridService:
+    """
+    Buduje odpowiedź ?format=grid listy grafiku.
+
+    Zamiast wiersza na wpis (z powtarzanym pracownikiem i lokacją) zwraca:
+    - 'days': oś dni,
+    - 'employees': słownik pracowników (kolejność wierszy macierzy),
+    - 'hours' / 'ids': tablice per pracownik, indeksowane jak 'days'
+      (None = brak wpisu),
+    - konflikty jako pary [indeks pracownika, indeks dnia]; dla rest_35h
+      dzień to pierwszy dzień osi w tygodniu z konfliktem.
+
+    Wiersze pobierane są przez values_list - bez instancji modelu i serializera.
+    """
+
+    def __init__(self, queryset, date_from: date, date_to: date):
+        """
+        Args:
+            queryset: Wpisy WorkHours jednej lokacji (już przefiltrowane)
+            date_from, date_to: Oś dni (włącznie)
+        """
+        self.queryset = queryset
+        self.days = [date_from + timedelta(days=offset) for offset in range((date_to - date_from).days + 1)]
+        self.employees: List[Dict[str, str]] = []
+        self._employee_index: Dict[str, int] = {}
+        self._hours: List[list] = []
+        self._ids: List[list] = []
+
+    def load(self) -> 'ScheduleGridService':
+        """Wypełnia macierz wpisami (jedno zapytanie values_list)."""
+        rows = self.queryset.order_by('employee__full_name', 'employee_id', 'date').values_list(
+            'id', 'employee_id', 'employee__full_name', 'date', 'hours'
+        )
+        first_ordinal = self.days[0].toordinal()
+        for work_hours_id, employee_id, full_name, work_date, hours in rows:
+            row = self._add_employee(str(employee_id), full_name)
+            day = work_date.toordinal() - first_ordinal
+            self._hours[row][day] = hours
+            self._ids[row][day] = str(work_hours_id)
+        return self
+
+    @property
+    def employee_ids(self) -> List[str]:
+        """Pracownicy z wpisami na osi (po load())."""
+        return [employee['id'] for employee in self.employees]
+
+    def build(self, conflicts: Optional[Dict[str, Any]] = None,
+              cross_location_conflicts: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """
+        Składa odpowiedź (po load()).
+
+        Args:
+            conflicts: Konflikty w formacie listy ({'rest_11h', 'rest_35h', 'exceed_12h'}) lub None
+            cross_location_conflicts: Wynik CrossLocationConflictService.detect() lub None
+        """
+        encoded_conflicts = self._encode_conflicts(conflicts) if conflicts is not None else None
+        encoded_cross = (
+            self._encode_cross_location(cross_location_conflicts)
+            if cross_location_conflicts is not None else None
+        )
+        self._fill_missing_names()
+
+        return {
+            'format': 'grid',
+            'days': [day.isoformat() for day in self.days],
+            'employees': self.employees,
+            'hours': self._hours,
+            'ids': self._ids,
+            'conflicts': encoded_conflicts,
+            'cross_location_conflicts': encoded_cross
+        }
+
+    # === HELPER METHODS ===
+
+    def _add_employee(self, employee_id: str, full_name: Optional[str] = None) -> int:
+        """Zwraca indeks wiersza pracownika (dodaje wiersz przy pierwszym wystąpieniu)."""
+        row = self._employee_index.get(employee_id)
+        if row is None:
+            row = len(self.employees)
+            self._employee_index[employee_id] = row
+            self.employees.append({'id': employee_id, 'name': full_name})
+            self._hours.append([None] * len(self.days))
+            self._ids.append([None] * len(self.days))
+        return row
+
+    def _fill_missing_names(self) -> None:
+        """Nazwy pracowników, którzy mają konflikt bez wpisu na osi (np. tydzień na przełomie miesięcy)."""
+        missing = [employee['id'] for employee in self.employees if employee['name'] is None]
+        if not missing:
+            return
+        names = {
+            str(employee_id): full_name
+            for employee_id, full_name in Employee.objects.filter(id__in=missing).values_list('id', 'full_name')
+        }
+        for employee in self.employees:
+            if employee['name'] is None:
+                employee['name'] = names.get(employee['id'])
+
+    def _day_index(self, work_date: date) -> int:
+        """Indeks dnia na osi (daty spoza osi - np. poniedziałek tygodnia z poprzedniego miesiąca - przycięte)."""
+        return max(0, min(len(self.days) - 1, work_date.toordinal() - self.days[0].toordinal()))
+
+    def _week_index(self, week: int) -> Optional[int]:
+        """Pierwszy dzień osi w tygodniu ISO o danym numerze."""
+        for index, day in enumerate(self.days):
+            if day.isocalendar()[1] == week:
+                return index
+        return None
+
+    def _encode_conflicts(self, conflicts: Dict[str, Any]) -> Dict[str, List[List[int]]]:
+        encoded = {}
+        for rule in ('rest_11h', 'exceed_12h'):
+            # Klucz "<employee_id>-YYYY-MM-DD"
+            encoded[rule] = [
+                [self._add_employee(key[:-11]), self._day_index(date.fromisoformat(key[-10:]))]
+                for key in conflicts[rule]
+            ]
+
+        encoded['rest_35h'] = []
+        for employee_id, weeks in conflicts['rest_35h'].items():
+            for week in weeks:
+                day = self._week_index(week)
+                if day is not None:
+                    encoded['rest_35h'].append([self._add_employee(employee_id), day])
+        return encoded
+
+    def _encode_cross_location(self, conflicts: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        encoded = []
+        for conflict in conflicts:
+            item = {
+                'rule': conflict['rule'],
+                'employee': self._add_employee(conflict['employee']),
+                'day': self._day_index(date.fromisoformat(conflict['date'])),
+                'locations': conflict['locations']
+            }
+            if 'week' in conflict:
+                item['week'] = conflict['week']
+            encoded.append(item)
+        return encoded
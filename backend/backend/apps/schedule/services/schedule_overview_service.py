@@ -0,0 +1,130 @@
+"""
+Przegląd miesiąca wszystkich lokacji użytkownika (dashboard właściciela).
+"""
+from datetime import timedelta
+from typing import Dict, Any, List
+
+from django.db.models import Count, Sum
+
+from ...locations.models import Location
+from ..models import ScheduleConflict, WorkHours
+from ..utils import month_range
+from .compliance_scan_service import ComplianceScanService
+from .conflict_index_service import ConflictIndexService
+
+
+class ScheduleOverviewService:
+    """
+    Podsumowanie grafików wszystkich lokacji użytkownika w miesiącu.
+
+    Liczba zapytań nie zależy od liczby lokacji:
+    - lokacje - jedno zapytanie,
+    - obsada i godziny - jedno zapytanie grupujące WorkHours po lokacji,
+    - konflikty - jedno zapytanie grupujące indeks ScheduleConflict
+      (full=True: jeden przebieg ComplianceScanService dla wszystkich lokacji
+      zamiast indeksu).
+    """
+
+    RULES = [rule for rule, _ in ScheduleConflict.RULE_CHOICES]
+
+    def __init__(self, user, month: int, year: int, full: bool = False):
+        """
+        Args:
+            user: Właściciel lokacji
+            month, year: Miesiąc przeglądu
+            full: Przelicz konflikty zamiast odczytu z indeksu
+        """
+        self.user = user
+        self.month = month
+        self.year = year
+        self.full = full
+
+    def build(self) -> Dict[str, Any]:
+        """
+        Returns:
+            {
+                'month', 'year', 'days_in_month',
+                'locations': [{'id', 'name', 'staffed_days', 'employees', 'shifts',
+                               'total_hours', 'conflicts': {reguła: n}, 'conflict_count'}, ...],
+                'summary': {'locations', 'shifts', 'total_hours', 'conflicts': {reguła: n}, 'conflict_count'}
+            }
+        """
+        locations = list(Location.objects.filter(user=self.user).order_by('name').values_list('id', 'name'))
+        location_ids = [str(location_id) for location_id, _ in locations]
+
+        totals = self._get_totals(location_ids)
+        conflicts = self._get_conflict_counts(location_ids)
+        empty_totals = {'staffed_days': 0, 'employees': 0, 'shifts': 0, 'total_hours': 0}
+
+        rows = []
+        for location_id, name in locations:
+            location_id = str(location_id)
+            location_conflicts = conflicts[location_id]
+            rows.append({
+                'id': location_id,
+                'name': name,
+                **totals.get(location_id, empty_totals),
+                'conflicts': location_conflicts,
+                'conflict_count': sum(location_conflicts.values())
+            })
+
+        _, next_first = month_range(self.year, self.month)
+        summary_conflicts = {rule: sum(row['conflicts'][rule] for row in rows) for rule in self.RULES}
+        return {
+            'month': self.month,
+            'year': self.year,
+            'days_in_month': (next_first - timedelta(days=1)).day,
+            'locations': rows,
+            'summary': {
+                'locations': len(rows),
+                'shifts': sum(row['shifts'] for row in rows),
+                'total_hours': round(sum(row['total_hours'] for row in rows), 2),
+                'conflicts': summary_conflicts,
+                'conflict_count': sum(summary_conflicts.values())
+            }
+        }
+
+    # === HELPER METHODS ===
+
+    def _get_totals(self, location_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Obsadzone dni, pracownicy, wpisy i suma godzin per lokacja (jedno zapytanie)."""
+        if not location_ids:
+            return {}
+
+        rows = WorkHours.objects.filter(location_id__in=location_ids).in_month(self.year, self.month).values(
+            'location_id'
+        ).annotate(
+            staffed_days=Count('date', distinct=True),
+            employees=Count('employee_id', distinct=True),
+            shifts=Count('id'),
+            minutes=Sum('duration_minutes')
+        ).order_by()
+
+        return {
+            str(row['location_id']): {
+                'staffed_days': row['staffed_days'],
+                'employees': row['employees'],
+                'shifts': row['shifts'],
+                'total_hours': round((row['minutes'] or 0) / 60, 2)
+            }
+            for row in rows
+        }
+
+    def _get_conflict_counts(self, location_ids: List[str]) -> Dict[str, Dict[str, int]]:
+        if not self.full:
+            return ConflictIndexService.get_conflict_counts(location_ids, self.month, self.year)
+
+        counts = {location_id: {rule: 0 for rule in self.RULES} for location_id in location_ids}
+        if not location_ids:
+            return counts
+
+        first, next_first = month_range(self.year, self.month)
+        report = ComplianceScanService(location_ids, first, next_first - timedelta(days=1)).run()
+        for partition in report['partitions']:
+            conflicts = partition['conflicts']
+            counts[partition['location']] = {
+                'rest_11h': len(conflicts['rest_11h']),
+                'rest_35h': sum(len(weeks) for weeks in conflicts['rest_35h'].values()),
+                'exceed_12h': len(conflicts['exceed_12h'])
+            }
+        return counts
@@ -0,0 +1,137 @@
+"""
+Wersjonowanie grafików lokacji-miesięcy (unieważnianie cache wyników).
+"""
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import ScheduleVersion
+from .conflict_detection_service import ConflictDetectionService
+from .conflict_index_service import ConflictIndexService
+
+
+class ScheduleVersionService:
+    """
+    Serwis wersji grafiku.
+
+    Zapis w dniu D zmienia wynik wykrywania konfliktów każdego miesiąca,
+    którego okno (ConflictDetectionService.month_window) obejmuje D - czyli
+    także sąsiedniego miesiąca, gdy D leży w tygodniu na przełomie miesięcy.
+    Wszystkie takie miesiące dostają nową wersję.
+    """
+
+    # Okno miesiąca wychodzi poza miesiąc najwyżej o tydzień
+    WINDOW_MARGIN_DAYS = 7
+
+    @staticmethod
+    def get_version(location_id: str, month: int, year: int) -> int:
+        """Zwraca aktualną wersję grafiku (0, jeśli nie było jeszcze zapisów)."""
+        version = ScheduleVersion.objects.filter(
+            location_id=location_id,
+            year=year,
+            month=month
+        ).values_list('version', flat=True).first()
+        return version or 0
+
+    @staticmethod
+    def get_month_marker(location_id: str, month: int, year: int, user_id: int) -> Optional[Tuple[str, datetime]]:
+        """
+        Znacznik zmian grafiku miesiąca dla warunkowego GET: (token, czas ostatniej zmiany).
+
+        Obejmuje wersje wszystkich lokacji użytkownika w tym miesiącu - lista
+        grafiku zawiera też konflikty pracowników z innymi lokacjami.
+        Zwraca None, jeśli lokacja nie ma jeszcze wiersza wersji (np. dane
+        sprzed wersjonowania) - wtedy odpowiedzi nie da się bezpiecznie warunkować.
+        """
+        rows = ScheduleVersionService._get_user_month_rows(user_id, month, year)
+        if str(location_id) not in {str(row_location_id) for row_location_id, _, _ in rows}:
+            return None
+        return ScheduleVersionService._marker(rows)
+
+    @staticmethod
+    def get_user_month_marker(user_id: int, month: int, year: int) -> Optional[Tuple[str, datetime]]:
+        """
+        Znacznik zmian miesiąca wszystkich lokacji użytkownika (widoki per pracownik,
+        obejmujące każdą lokację). None, jeśli żadna lokacja nie ma wiersza wersji.
+        """
+        rows = ScheduleVersionService._get_user_month_rows(user_id, month, year)
+        return ScheduleVersionService._marker(rows) if rows else None
+
+    @staticmethod
+    def touch_user_schedules(user_id: int) -> None:
+        """
+        Oznacza grafiki użytkownika jako zmienione bez podbijania wersji - zmienia
+        znacznik warunkowego GET (np. zmiana nazwy pracownika/lokacji), ale nie klucze
+        cache wyników. Zmiany wpływające na konflikty (np. rodzaj umowy) muszą
+        podbić wersje (bump_month/bump_range).
+        """
+        ScheduleVersion.objects.filter(location__user_id=user_id).update(updated_at=timezone.now())
+
+    @staticmethod
+    def bump_for_date(location_id: str, changed_date: date) -> None:
+        """Podbija wersje miesięcy, na które wpływa zapis w changed_date."""
+        ScheduleVersionService.bump_range(location_id, changed_date, changed_date)
+
+    @staticmethod
+    def bump_range(location_id: str, date_from: date, date_to: date) -> None:
+        """Podbija wersje miesięcy, na które wpływają zapisy w zakresie dat (włącznie)."""
+        for year, month in ScheduleVersionService.affected_months(date_from, date_to):
+            ScheduleVersionService._bump(location_id, year, month)
+
+    @staticmethod
+    def bump_month(location_id: str, year: int, month: int) -> None:
+        """Podbija wersję jednego miesiąca (bez miesięcy sąsiednich)."""
+        ScheduleVersionService._bump(location_id, year, month)
+
+    @staticmethod
+    def affected_months(date_from: date, date_to: date) -> List[Tuple[int, int]]:
+        """Zwraca (rok, miesiąc), których okno wykrywania konfliktów przecina zakres dat."""
+        margin = timedelta(days=ScheduleVersionService.WINDOW_MARGIN_DAYS)
+        months = []
+        for year, month in ConflictIndexService.iter_months(date_from - margin, date_to + margin):
+            window_from, window_to = ConflictDetectionService.month_window(year, month)
+            if window_from <= date_to and date_from < window_to:
+                months.append((year, month))
+        return months
+
+    # === HELPER METHODS ===
+
+    @staticmethod
+    def _get_user_month_rows(user_id: int, month: int, year: int) -> List[tuple]:
+        return list(ScheduleVersion.objects.filter(
+            location__user_id=user_id,
+            year=year,
+            month=month
+        ).order_by('location_id').values_list('location_id', 'version', 'updated_at'))
+
+    @staticmethod
+    def _marker(rows: List[tuple]) -> Tuple[str, datetime]:
+        token = ';'.join(
+            f"{row_location_id}:{version}:{updated_at.timestamp()}"
+            for row_location_id, version, updated_at in rows
+        )
+        return token, max(updated_at for _, _, updated_at in rows)
+
+    @staticmethod
+    def _bump(location_id: str, year: int, month: int) -> None:
+        """Atomowo zwiększa wersję (tworzy wiersz przy pierwszym zapisie)."""
+        version_filter = {'location_id': location_id, 'year': year, 'month': month}
+        updated = ScheduleVersion.objects.filter(**version_filter).update(
+            version=F('version') + 1,
+            updated_at=timezone.now()
+        )
+        if updated:
+            return
+
+        try:
+            with transaction.atomic():
+                ScheduleVersion.objects.create(version=1, **version_filter)
+        except IntegrityError:
+            # Równoległy zapis utworzył wiersz pierwszy
+            ScheduleVersion.objects.filter(**version_filter).update(
+                version=F('version') + 1,
+                updated_at=timezone.now()
+            )
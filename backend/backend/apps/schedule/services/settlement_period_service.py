@@ -0,0 +1,261 @@
+"""
+Rozliczenie czasu pracy pracowników lokacji w okresie rozliczeniowym.
+"""
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from django.db.models import Q, Sum
+
+from ...employees.models import Employee
+from ...holidays.services.holiday_calendar_service import HolidayCalendarService
+from ..models import MonthlyHoursSummary, SettlementPeriod
+from ..utils import DAILY_NORM_MINUTES, job_fraction, month_range
+
+
+class SettlementPeriodService:
+    """
+    Norma, czas przepracowany i nadgodziny pracowników lokacji w okresie rozliczeniowym
+    (art. 129-130, 151 KP).
+
+    - okres: SettlementPeriod lokacji (brak wiersza - okres jednomiesięczny),
+    - norma: 8h za każdy dzień pon.-pt. minus 8h za każde święto w dniu innym
+      niż niedziela (art. 130 §1-2), w wymiarze etatu i tylko za dni trwania umowy;
+      pracownicy bez umowy o pracę nie mają normy,
+    - czas przepracowany: miesięczny szereg MonthlyHoursSummary zsumowany ze wszystkich
+      lokacji pracownika - norma jest jedna, niezależnie od liczby lokacji,
+    - nadgodziny: praca ponad normę dobową (daily_overtime_minutes - liczone z sumy
+      dnia pracownika we wszystkich lokacjach, więc dwie zmiany po 6h w różnych
+      lokacjach to 4h ponad normę) plus przekroczenie normy okresu przez pozostały
+      czas pracy (przeciętna norma tygodniowa).
+
+    Norma jest szeregiem dziennym okresu z sumami narastającymi - norma dowolnego
+    podokresu (miesiąc, dni umowy) to różnica dwóch sum; godziny narastająco
+    od początku okresu liczone są tak samo z szeregu miesięcznego.
+    Zapytania: okres lokacji, święta, pracownicy, sumy miesięcy - bez odczytu wpisów WorkHours.
+    """
+
+    DEFAULT_MONTHS = 1
+
+    def __init__(self, location_id: str, month: int, year: int):
+        """
+        Args:
+            location_id: ID lokacji
+            month, year: Miesiąc wyznaczający okres rozliczeniowy (okres, który go zawiera)
+        """
+        self.location_id = location_id
+        self.month = month
+        self.year = year
+
+    def build(self) -> Dict[str, Any]:
+        """
+        Returns:
+            {
+                'location', 'month', 'year',
+                'period': {'months', 'date_from', 'date_to', 'norm_hours'},
+                'months': [{'year', 'month', 'norm_hours'}, ...],
+                'employees': [{'employee', 'employee_name', 'job_fraction', 'norm_hours', 'worked_hours',
+                               'balance_hours', 'average_weekly_hours', 'daily_overtime_hours',
+                               'average_overtime_hours', 'overtime_hours',
+                               'months': [{'year', 'month', 'worked_hours', 'cumulative_worked_hours',
+                                           'cumulative_norm_hours', 'balance_hours'}, ...]}, ...]
+            }
+            Pola normy i nadgodzin są None dla pracowników bez umowy o pracę.
+        """
+        months_count, start_date = self.get_config(self.location_id)
+        period_from, period_to = self.period_bounds(months_count, start_date, self.year, self.month)
+        months = self._iter_period_months(period_from, months_count)
+
+        norm_prefix = self.norm_prefix(period_from, period_to, HolidayCalendarService.get_dates(period_from, period_to))
+        month_bounds = [self._month_bounds(year, month) for year, month in months]
+        months_filter = self._months_filter(months)
+
+        # Pracownicy przypisani do lokacji lub z godzinami w niej w okresie
+        employees = list(Employee.objects.filter(
+            Q(locations=self.location_id) | Q(id__in=MonthlyHoursSummary.objects.filter(
+                months_filter, location_id=self.location_id
+            ).values('employee_id'))
+        ).distinct().order_by('full_name').values_list(
+            'id', 'full_name', 'agreement_type', 'job', 'contract_date_start', 'contract_date_end'
+        ))
+        employee_ids = [row[0] for row in employees]
+        series = self._get_series(months_filter, employee_ids)
+
+        rows = []
+        for employee_id, full_name, agreement_type, job, contract_start, contract_end in employees:
+            employee_series = series.get(str(employee_id), {})
+            worked = [employee_series.get(key, (0, 0))[0] for key in months]
+            daily_overtime = sum(minutes for _, minutes in employee_series.values())
+            cumulative_worked = list(accumulate(worked))
+
+            if agreement_type == 'permanent':
+                fraction = job_fraction(job)
+                employed_from = max(period_from, contract_start or period_from)
+                employed_to = min(period_to, contract_end or period_to)
+                month_norms = [
+                    self._norm(norm_prefix, period_from, max(first, employed_from), min(last, employed_to), fraction)
+                    for first, last in month_bounds
+                ]
+                cumulative_norm = list(accumulate(month_norms))
+                norm = cumulative_norm[-1]
+                employed_days = max(0, (employed_to - employed_from).days + 1)
+            else:
+                fraction = None
+                cumulative_norm = [None] * len(months)
+                norm = None
+                employed_days = (period_to - period_from).days + 1
+
+            rows.append(self._employee_row(
+                employee_id, full_name, fraction, norm, cumulative_worked[-1], daily_overtime, employed_days,
+                [
+                    {
+                        'year': year,
+                        'month': month,
+                        'worked_hours': self._to_hours(worked[index]),
+                        'cumulative_worked_hours': self._to_hours(cumulative_worked[index]),
+                        'cumulative_norm_hours': self._to_hours(cumulative_norm[index]),
+                        'balance_hours': self._to_hours(
+                            cumulative_worked[index] - cumulative_norm[index]
+                            if cumulative_norm[index] is not None else None
+                        )
+                    }
+                    for index, (year, month) in enumerate(months)
+                ]
+            ))
+
+        return {
+            'location': str(self.location_id),
+            'month': self.month,
+            'year': self.year,
+            'period': {
+                'months': months_count,
+                'date_from': period_from.isoformat(),
+                'date_to': period_to.isoformat(),
+                'norm_hours': self._to_hours(self._norm(norm_prefix, period_from, period_from, period_to)),
+            },
+            'months': [
+                {
+                    'year': year,
+                    'month': month,
+                    'norm_hours': self._to_hours(self._norm(norm_prefix, period_from, first, last))
+                }
+                for (year, month), (first, last) in zip(months, month_bounds)
+            ],
+            'employees': rows
+        }
+
+    # === OKRES I NORMA ===
+
+    @staticmethod
+    def get_config(location_id: str) -> Tuple[int, Optional[date]]:
+        """Zwraca (długość okresu w miesiącach, początek okresu) lokacji; brak konfiguracji - (1, None)."""
+        config = SettlementPeriod.objects.filter(location_id=location_id).values_list('months', 'start_date').first()
+        return config or (SettlementPeriodService.DEFAULT_MONTHS, None)
+
+    @staticmethod
+    def period_bounds(months: int, start_date: Optional[date], year: int, month: int) -> Tuple[date, date]:
+        """
+        Okres rozliczeniowy zawierający miesiąc (pierwszy i ostatni dzień, włącznie).
+
+        Okresy po months miesięcy liczone od start_date w obie strony; bez start_date
+        okresy liczone są od stycznia.
+        """
+        anchor = start_date.year * 12 + start_date.month - 1 if start_date else 0
+        offset = year * 12 + month - 1 - anchor
+        first_index = anchor + (offset // months) * months
+        last_index = first_index + months - 1
+
+        period_from, _ = month_range(first_index // 12, first_index % 12 + 1)
+        _, next_first = month_range(last_index // 12, last_index % 12 + 1)
+        return period_from, next_first - timedelta(days=1)
+
+    @staticmethod
+    def norm_prefix(date_from: date, date_to: date, holidays: Set[date]) -> List[int]:
+        """
+        Sumy narastające dziennej normy (minuty) dla dni date_from..date_to.
+
+        prefix[i] = norma dni date_from..date_from + i - 1 (prefix[0] = 0). Dzień pon.-pt.
+        dodaje normę dobową; święto w dniu innym niż niedziela ją odejmuje - także
+        w sobotę, co obniża normę tygodnia z innym dniem wolnym (art. 130 §2).
+        """
+        prefix = [0]
+        day = date_from
+        while day <= date_to:
+            minutes = DAILY_NORM_MINUTES if day.weekday() < 5 else 0
+            if day in holidays and day.weekday() != 6:
+                minutes -= DAILY_NORM_MINUTES
+            prefix.append(prefix[-1] + minutes)
+            day += timedelta(days=1)
+        return prefix
+
+    @staticmethod
+    def _norm(prefix: List[int], period_from: date, date_from: date, date_to: date, fraction: float = 1.0) -> int:
+        """Norma (minuty) dni date_from..date_to okresu - różnica dwóch sum narastających."""
+        if date_from > date_to:
+            return 0
+        minutes = prefix[(date_to - period_from).days + 1] - prefix[(date_from - period_from).days]
+        return round(max(0, minutes) * fraction)
+
+    # === HELPER METHODS ===
+
+    @staticmethod
+    def _iter_period_months(period_from: date, months: int) -> List[Tuple[int, int]]:
+        first_index = period_from.year * 12 + period_from.month - 1
+        return [(index // 12, index % 12 + 1) for index in range(first_index, first_index + months)]
+
+    @staticmethod
+    def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+        first, next_first = month_range(year, month)
+        return first, next_first - timedelta(days=1)
+
+    @staticmethod
+    def _months_filter(months: List[Tuple[int, int]]) -> Q:
+        months_filter = Q()
+        for year, month in months:
+            months_filter |= Q(year=year, month=month)
+        return months_filter
+
+    @staticmethod
+    def _get_series(months_filter: Q, employee_ids: List) -> Dict[str, Dict[Tuple[int, int], Tuple[int, int]]]:
+        """
+        {employee_id: {(rok, miesiąc): (total_minutes, daily_overtime_minutes)}} - sumy ze wszystkich
+        lokacji pracownika, jedno zapytanie.
+        """
+        rows = MonthlyHoursSummary.objects.filter(months_filter, employee_id__in=employee_ids).values(
+            'employee_id', 'year', 'month'
+        ).annotate(
+            total=Sum('total_minutes'),
+            daily_overtime=Sum('daily_overtime_minutes')
+        ).order_by().values_list('employee_id', 'year', 'month', 'total', 'daily_overtime')
+        series = {}
+        for employee_id, year, month, total, daily_overtime in rows:
+            series.setdefault(str(employee_id), {})[(year, month)] = (total, daily_overtime)
+        return series
+
+    def _employee_row(self, employee_id, full_name: str, fraction: Optional[float], norm: Optional[int],
+                      worked: int, daily_overtime: int, employed_days: int,
+                      months: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if norm is None:
+            average_overtime = daily_overtime = overtime = None
+        else:
+            # Godziny ponad normę dobową są już nadgodzinami - nie liczą się drugi raz do normy okresu
+            average_overtime = max(0, worked - daily_overtime - norm)
+            overtime = daily_overtime + average_overtime
+
+        return {
+            'employee': str(employee_id),
+            'employee_name': full_name,
+            'job_fraction': fraction,
+            'norm_hours': self._to_hours(norm),
+            'worked_hours': self._to_hours(worked),
+            'balance_hours': self._to_hours(worked - norm if norm is not None else None),
+            'average_weekly_hours': round(worked / 60 / (employed_days / 7), 2) if employed_days else 0,
+            'daily_overtime_hours': self._to_hours(daily_overtime),
+            'average_overtime_hours': self._to_hours(average_overtime),
+            'overtime_hours': self._to_hours(overtime),
+            'months': months
+        }
+
+    @staticmethod
+    def _to_hours(minutes: Optional[int]) -> Optional[float]:
+        return round(minutes / 60, 2) if minutes is not None else None
@@ -0,0 +1,95 @@
+"""
+Strumieniowy eksport WorkHours (NDJSON / CSV) dla dowolnych zakresów dat.
+"""
+import csv
+import json
+from typing import Iterator, Optional
+
+from django.conf import settings
+
+from ..utils import format_minute
+
+
+class _EchoBuffer:
+    """Bufor dla csv.writer, który zamiast zapisywać zwraca wiersz (generator bez kopii w pamięci)."""
+
+    def write(self, value):
+        return value
+
+
+class WorkHoursExportService:
+    """
+    Eksport wpisów grafiku wiersz po wierszu.
+
+    - wpisy czytane przez values_list(...).iterator(chunk_size) - w pamięci
+      jest tylko bieżąca porcja, niezależnie od długości zakresu,
+    - każdy wiersz zawiera wyliczone godziny (start, koniec, minuty, godziny),
+    - wynik to generator tekstu dla StreamingHttpResponse.
+    """
+
+    FORMAT_NDJSON = 'ndjson'
+    FORMAT_CSV = 'csv'
+    FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+
+    CONTENT_TYPES = {
+        FORMAT_NDJSON: 'application/x-ndjson',
+        FORMAT_CSV: 'text/csv; charset=utf-8',
+    }
+
+    COLUMNS = (
+        'id', 'date', 'employee', 'employee_name', 'location', 'location_name',
+        'hours', 'start', 'end', 'duration_minutes', 'duration_hours', 'is_overnight'
+    )
+
+    QUERY_COLUMNS = (
+        'id', 'date', 'employee_id', 'employee__full_name', 'location_id', 'location__name',
+        'hours', 'start_minute', 'end_minute', 'duration_minutes', 'is_overnight'
+    )
+
+    def __init__(self, queryset, export_format: str = FORMAT_NDJSON, chunk_size: Optional[int] = None):
+        """
+        Args:
+            queryset: Przefiltrowany queryset WorkHours
+            export_format: 'ndjson' lub 'csv'
+            chunk_size: Wielkość porcji odczytu (domyślnie WORK_HOURS_EXPORT_CHUNK_SIZE)
+        """
+        self.queryset = queryset
+        self.export_format = export_format
+        self.chunk_size = chunk_size or settings.WORK_HOURS_EXPORT_CHUNK_SIZE
+
+    @property
+    def content_type(self) -> str:
+        return self.CONTENT_TYPES[self.export_format]
+
+    def stream(self) -> Iterator[str]:
+        """Generator kolejnych linii eksportu."""
+        rows = self._iter_rows()
+        if self.export_format == self.FORMAT_CSV:
+            writer = csv.writer(_EchoBuffer())
+            yield writer.writerow(self.COLUMNS)
+            for row in rows:
+                yield writer.writerow(row)
+        else:
+            for row in rows:
+                yield json.dumps(dict(zip(self.COLUMNS, row)), ensure_ascii=False) + '\n'
+
+    # === HELPER METHODS ===
+
+    def _iter_rows(self) -> Iterator[tuple]:
+        rows = self.queryset.order_by('date', 'location_id', 'employee_id').values_list(*self.QUERY_COLUMNS)
+        for (work_hours_id, work_date, employee_id, full_name, location_id, location_name,
+             hours, start_minute, end_minute, duration, is_overnight) in rows.iterator(chunk_size=self.chunk_size):
+            yield (
+                str(work_hours_id),
+                work_date.isoformat(),
+                str(employee_id),
+                full_name,
+                str(location_id) if location_id is not None else None,
+                location_name,
+                hours,
+                format_minute(start_minute),
+                format_minute(end_minute),
+                duration,
+                round(duration / 60, 2) if duration is not None else None,
+                is_overnight,
+            )
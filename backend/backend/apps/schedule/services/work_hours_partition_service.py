@@ -0,0 +1,279 @@
+"""
+Miesięczne partycje tabeli WorkHours na PostgreSQL.
+"""
+import logging
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from django.db import connection, transaction
+
+from ..models import WorkHours
+from ..utils import month_range
+from .conflict_index_service import ConflictIndexService
+
+logger = logging.getLogger(__name__)
+
+# Granice partycji z pg_get_expr(relpartbound): FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')
+PARTITION_BOUND_PATTERN = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+class WorkHoursPartitionService:
+    """
+    Zarządzanie partycjami PARTITION BY RANGE (date) tabeli WorkHours.
+
+    Tabelę partycjonuje jawnie partition_table() (komenda manage_work_hours_partitions
+    --convert, tylko PostgreSQL) - migracje nie zmieniają jej układu. Na SQLite
+    i bez partycjonowania is_partitioned() zwraca False, a metody utrzymania
+    partycji nic nie zmieniają.
+
+    - partycja na miesiąc: <tabela>_pRRRR_MM, zakres [1. dzień, 1. dzień następnego),
+    - partycja domyślna <tabela>_default przyjmuje wpisy spoza utworzonych miesięcy,
+      więc zapis nigdy nie kończy się błędem braku partycji,
+    - nowa partycja powstaje jako osobna tabela, przejmuje wiersze swojego miesiąca
+      z partycji domyślnej i jest dołączana przez ATTACH PARTITION - w jednej transakcji.
+      Tabela główna dostaje blokadę SHARE UPDATE EXCLUSIVE (odczyty i zapisy
+      pozostałych partycji nie czekają), partycja domyślna najpierw SHARE ROW
+      EXCLUSIVE (zapisy poza utworzonymi miesiącami czekają, odczyty nie), a przy
+      ATTACH ACCESS EXCLUSIVE do końca transakcji - wtedy czekają też jej odczyty,
+      w tym zapytania bez warunku na datę. Ograniczenie CHECK zakresu dat na nowej
+      tabeli pozwala ATTACH pominąć jej skanowanie, więc czas blokady zależy
+      głównie od liczby przenoszonych wierszy,
+    - odłączona partycja zostaje zwykłą tabelą (archiwum) - wpisy znikają z grafiku,
+      sumy MonthlyHoursSummary i indeks konfliktów zostają.
+    """
+
+    TABLE = WorkHours._meta.db_table
+    DEFAULT_PARTITION = f"{TABLE}_default"
+
+    @staticmethod
+    def partition_name(year: int, month: int) -> str:
+        return f"{WorkHoursPartitionService.TABLE}_p{year}_{month:02d}"
+
+    @staticmethod
+    def is_partitioned() -> bool:
+        """Czy tabela WorkHours jest partycjonowana (zawsze False poza PostgreSQL)."""
+        if connection.vendor != 'postgresql':
+            return False
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))",
+                [WorkHoursPartitionService.TABLE]
+            )
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def get_partitions() -> List[Tuple[str, Optional[date], Optional[date]]]:
+        """
+        Returns:
+            [(nazwa, od, do), ...] dołączonych partycji, posortowane po dacie;
+            partycja domyślna ma od = do = None
+        """
+        if not WorkHoursPartitionService.is_partitioned():
+            return []
+
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = to_regclass(%s)
+            """, [WorkHoursPartitionService.TABLE])
+            rows = cursor.fetchall()
+
+        partitions = []
+        for name, bound in rows:
+            match = PARTITION_BOUND_PATTERN.search(bound)
+            if match:
+                partitions.append((name, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))))
+            else:
+                partitions.append((name, None, None))
+        return sorted(partitions, key=lambda partition: (partition[1] is not None, partition[1]))
+
+    @staticmethod
+    def ensure_partitions(date_from: date, date_to: date) -> List[str]:
+        """
+        Tworzy brakujące partycje miesięcy zakresu.
+
+        Returns:
+            Nazwy utworzonych partycji
+        """
+        if not WorkHoursPartitionService.is_partitioned():
+            return []
+
+        existing = {name for name, _, _ in WorkHoursPartitionService.get_partitions()}
+        created = []
+        for year, month in ConflictIndexService.iter_months(date_from, date_to):
+            name = WorkHoursPartitionService.partition_name(year, month)
+            if name not in existing:
+                WorkHoursPartitionService._create_partition(name, *month_range(year, month))
+                created.append(name)
+        return created
+
+    @staticmethod
+    def detach_before(before: date, drop: bool = False) -> List[str]:
+        """
+        Odłącza partycje miesięcy kończących się najpóźniej w dniu before (opcjonalnie je usuwa).
+
+        Returns:
+            Nazwy odłączonych partycji
+        """
+        quote = connection.ops.quote_name
+        detached = []
+        for name, _, partition_to in WorkHoursPartitionService.get_partitions():
+            if partition_to is None or partition_to > before:
+                continue
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {quote(WorkHoursPartitionService.TABLE)} DETACH PARTITION {quote(name)}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {quote(name)}")
+            logger.info(f"{'Usunięto' if drop else 'Odłączono'} partycję {name}")
+            detached.append(name)
+        return detached
+
+    # === KONWERSJA TABELI ===
+
+    @staticmethod
+    def partition_table(months_ahead: int) -> List[str]:
+        """
+        Przepisuje zwykłą tabelę WorkHours do partycjonowanej (jedna transakcja).
+
+        Powstają partycja domyślna i partycje miesięcy od najstarszego wpisu
+        do months_ahead miesięcy naprzód. Tabela jest zablokowana na czas
+        kopiowania wierszy (ACCESS EXCLUSIVE) - uruchamiać w oknie serwisowym.
+
+        Returns:
+            Nazwy utworzonych partycji miesięcy
+
+        Raises:
+            ValueError: baza inna niż PostgreSQL lub tabela już partycjonowana
+        """
+        if connection.vendor != 'postgresql':
+            raise ValueError(f"Partycjonowanie WorkHours wymaga PostgreSQL (baza: {connection.vendor})")
+        if WorkHoursPartitionService.is_partitioned():
+            raise ValueError("Tabela WorkHours jest już partycjonowana")
+        return WorkHoursPartitionService._rebuild_table(partitioned=True, months_ahead=months_ahead)
+
+    @staticmethod
+    def unpartition_table() -> None:
+        """
+        Przepisuje partycjonowaną tabelę WorkHours do zwykłej - tylko dane dołączonych
+        partycji (odłączone partycje zostają osobnymi tabelami).
+
+        Raises:
+            ValueError: tabela nie jest partycjonowana
+        """
+        if not WorkHoursPartitionService.is_partitioned():
+            raise ValueError("Tabela WorkHours nie jest partycjonowana")
+        WorkHoursPartitionService._rebuild_table(partitioned=False)
+
+    # === HELPER METHODS ===
+
+    @staticmethod
+    def _rebuild_table(partitioned: bool, months_ahead: int = 0) -> List[str]:
+        """
+        Przepisuje tabelę WorkHours do nowej (partycjonowanej lub zwykłej) z tymi samymi
+        kolumnami, ograniczeniami i indeksami.
+
+        Klucz główny partycjonowanej tabeli musi zawierać kolumnę partycjonującą - (id, date);
+        unikalność komórki (employee, location, date) już ją zawiera.
+        """
+        quote = connection.ops.quote_name
+        table = WorkHoursPartitionService.TABLE
+        created = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {quote(table)} IN ACCESS EXCLUSIVE MODE")
+            # Definicje zapisane przed zmianą nazwy - odwołują się do docelowej nazwy tabeli
+            cursor.execute("""
+                SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint
+                WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'u', 'f', 'c')
+                ORDER BY contype DESC
+            """, [table])
+            constraints = cursor.fetchall()
+            cursor.execute("""
+                SELECT indexdef FROM pg_indexes
+                WHERE schemaname = current_schema() AND tablename = %s
+                  AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s))
+            """, [table, table])
+            indexes = [row[0] for row in cursor.fetchall()]
+            cursor.execute(f"SELECT MIN(date), MAX(date) FROM {quote(table)}")
+            min_date, max_date = cursor.fetchone()
+
+            old_table = f"{table}_old"
+            cursor.execute(f"ALTER TABLE {quote(table)} RENAME TO {quote(old_table)}")
+            partition_clause = " PARTITION BY RANGE (date)" if partitioned else ""
+            cursor.execute(f"CREATE TABLE {quote(table)} (LIKE {quote(old_table)} INCLUDING DEFAULTS){partition_clause}")
+
+            if partitioned:
+                cursor.execute(
+                    f"CREATE TABLE {quote(WorkHoursPartitionService.DEFAULT_PARTITION)} PARTITION OF {quote(table)} DEFAULT"
+                )
+                today = date.today()
+                last_index = today.year * 12 + today.month - 1 + months_ahead
+                if max_date:
+                    last_index = max(last_index, max_date.year * 12 + max_date.month - 1)
+                for year, month in ConflictIndexService.iter_months(
+                    min(min_date or today, today), date(last_index // 12, last_index % 12 + 1, 1)
+                ):
+                    name = WorkHoursPartitionService.partition_name(year, month)
+                    partition_from, partition_to = month_range(year, month)
+                    cursor.execute(
+                        f"CREATE TABLE {quote(name)} PARTITION OF {quote(table)} "
+                        f"FOR VALUES FROM ('{partition_from.isoformat()}') TO ('{partition_to.isoformat()}')"
+                    )
+                    created.append(name)
+
+            cursor.execute(f"INSERT INTO {quote(table)} SELECT * FROM {quote(old_table)}")
+            # Usunięcie starej tabeli zwalnia nazwy ograniczeń i indeksów
+            cursor.execute(f"DROP TABLE {quote(old_table)}")
+
+            for name, constraint_type, definition in constraints:
+                if constraint_type == 'p':
+                    definition = "PRIMARY KEY (id, date)" if partitioned else "PRIMARY KEY (id)"
+                cursor.execute(f"ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}")
+            for definition in indexes:
+                cursor.execute(definition)
+
+        logger.info(f"Tabela {table} {'partycjonowana' if partitioned else 'bez partycji'}")
+        return created
+
+    @staticmethod
+    def _create_partition(name: str, partition_from: date, partition_to: date) -> None:
+        """
+        Partycja miesiąca z wierszami przeniesionymi z partycji domyślnej (jedna transakcja).
+
+        Blokada partycji domyślnej przed przeniesieniem - wpis miesiąca zapisany
+        między przeniesieniem a ATTACH zostałby w partycji domyślnej i ATTACH
+        zakończyłby się błędem.
+        """
+        quote = connection.ops.quote_name
+        table = quote(WorkHoursPartitionService.TABLE)
+        default_partition = quote(WorkHoursPartitionService.DEFAULT_PARTITION)
+        check_name = quote(f"{name}_date_check")
+        # Granice partycji (DDL) nie przyjmują parametrów - daty wstawiane jako literały ISO
+        bounds_from, bounds_to = partition_from.isoformat(), partition_to.isoformat()
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {default_partition} IN SHARE ROW EXCLUSIVE MODE")
+            cursor.execute(f"CREATE TABLE {quote(name)} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            # CHECK zgodny z granicami - ATTACH nie skanuje nowej tabeli
+            cursor.execute(
+                f"ALTER TABLE {quote(name)} ADD CONSTRAINT {check_name} "
+                f"CHECK (date IS NOT NULL AND date >= '{bounds_from}' AND date < '{bounds_to}')"
+            )
+            cursor.execute(f"""
+                WITH moved AS (
+                    DELETE FROM {default_partition}
+                    WHERE date >= %s AND date < %s
+                    RETURNING *
+                )
+                INSERT INTO {quote(name)} SELECT * FROM moved
+            """, [partition_from, partition_to])
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {quote(name)} "
+                f"FOR VALUES FROM ('{bounds_from}') TO ('{bounds_to}')"
+            )
+            # Po dołączeniu zakres wymusza granica partycji
+            cursor.execute(f"ALTER TABLE {quote(name)} DROP CONSTRAINT {check_name}")
+        logger.info(f"Utworzono partycję {name}")
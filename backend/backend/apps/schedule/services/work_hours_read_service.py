@@ -0,0 +1,46 @@
+"""
+Szybki odczyt listy WorkHours (bez instancji modeli i serializera).
+"""
+from typing import Any, Dict, List
+
+
+class WorkHoursReadService:
+    """
+    Buduje reprezentację WorkHoursSerializer bezpośrednio z values_list.
+
+    Wynik po wyrenderowaniu do JSON jest bajt w bajt taki sam jak
+    WorkHoursSerializer(many=True).data - te same klucze w tej samej
+    kolejności, te same typy (UUID i daty jako tekst). Wpis bez lokacji nie ma
+    klucza location_name, tak jak w serializerze (źródło location.name pomijane).
+
+    Każda zmiana pól WorkHoursSerializer wymaga zmiany tutaj -
+    zgodność sprawdza: python manage.py benchmark_work_hours_list.
+    """
+
+    COLUMNS = ('id', 'employee_id', 'employee__full_name', 'location_id', 'location__name', 'date', 'hours')
+
+    @classmethod
+    def serialize(cls, queryset) -> List[Dict[str, Any]]:
+        """
+        Args:
+            queryset: Przefiltrowany queryset WorkHours (kolejność zachowana)
+
+        Returns:
+            [{'id', 'employee', 'employee_name', 'location', 'location_name', 'date', 'hours'}, ...]
+        """
+        data = []
+        for work_hours_id, employee_id, full_name, location_id, location_name, work_date, hours in (
+            queryset.values_list(*cls.COLUMNS)
+        ):
+            row = {
+                'id': str(work_hours_id),
+                'employee': employee_id,
+                'employee_name': str(full_name),  # Employee.__str__
+                'location': location_id,
+            }
+            if location_id is not None:
+                row['location_name'] = location_name
+            row['date'] = work_date.isoformat()
+            row['hours'] = hours
+            data.append(row)
+        return data
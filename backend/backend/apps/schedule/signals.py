@@ -0,0 +1,267 @@
+"""
+Sygnały utrzymujące indeks konfliktów, wersje grafików i sumy godzin przy zapisach WorkHours.
+
+Działają także dla zapisów z panelu admina i dla QuerySet.delete().
+Każda zmiana komórki trafia też do dziennika zmian (ScheduleChange).
+Operacje masowe (bulk_create/bulk_update/update) nie wysyłają sygnałów -
+po nich należy wywołać ConflictIndexService.rebuild_range(),
+ScheduleVersionService.bump_range(), MonthlyHoursSummaryService.rebuild_range()
+i ScheduleChangeService.record() (patrz suspend_conflict_signals()).
+
+Zmiany pracowników i lokacji (nazwy widoczne w grafiku) odświeżają czas
+zmiany grafików - dla nagłówków ETag/Last-Modified listy. Zmiana rodzaju umowy
+pracownika (reguły konfliktów dotyczą tylko umów o pracę) przebudowuje indeks
+i podbija wersje miesięcy, w których pracownik ma wpisy. Zmiana kalendarza
+świąt przelicza sumy godzin i podbija wersje miesięcy z dotkniętymi zmianami.
+
+Kaskadowe usunięcia (origin inny niż usuwany model) nie są obsługiwane per wiersz:
+przy usuwaniu lokacji lub użytkownika dane grafiku lokacji znikają razem z nią
+(zapis wersji czy dziennika z kluczem usuwanej lokacji naruszyłby klucz obcy),
+a usunięcie pracownika podbija wersje i dopisuje zmiany do dziennika raz
+dla jego wszystkich wpisów.
+"""
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.db.models import Max, Min, QuerySet
+from django.db.models.functions import TruncMonth
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from ..employees.models import Employee
+from ..holidays.signals import holidays_changed
+from ..locations.models import Location
+from .models import WorkHours, LocationConflictRule
+from .services.conflict_index_service import ConflictIndexService
+from .services.monthly_hours_summary_service import MonthlyHoursSummaryService
+from .services.schedule_change_service import ScheduleChangeService
+from .services.schedule_version_service import ScheduleVersionService
+from .utils import month_range
+
+_state = threading.local()
+
+
+@contextmanager
+def suspend_conflict_signals():
+    """
+    Wyłącza odświeżanie indeksu, wersji, sum godzin i dziennika zmian przy zapisach WorkHours w bloku.
+
+    Dla operacji masowych, które same przeliczają konflikty i sumy raz na końcu
+    (ConflictIndexService.rebuild_range + ScheduleVersionService.bump_range
+    + MonthlyHoursSummaryService.rebuild_range) i dopisują zmiany jednym
+    ScheduleChangeService.record().
+    """
+    previous = getattr(_state, 'suspended', False)
+    _state.suspended = True
+    try:
+        yield
+    finally:
+        _state.suspended = previous
+
+
+def _suspended():
+    return getattr(_state, 'suspended', False)
+
+
+def _deleted_by(origin, *models) -> bool:
+    """Czy usunięcie zaczęło się od obiektu (lub QuerySetu) jednego z modeli."""
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return issubclass(model, models)
+
+
+def _cascaded(origin, sender) -> bool:
+    """Czy usunięcie obiektu sender jest kaskadą usunięcia innego obiektu."""
+    return origin is not None and not _deleted_by(origin, sender)
+
+
+@receiver(pre_save, sender=WorkHours)
+def remember_previous_position(sender, instance, raw=False, **kwargs):
+    """Zapamiętuje poprzednie położenie wpisu (zmiana daty/pracownika/lokacji)."""
+    instance._previous_position = None
+    if raw or instance._state.adding or _suspended():
+        return
+
+    instance._previous_position = WorkHours.objects.filter(pk=instance.pk).values_list(
+        'location_id', 'employee_id', 'date'
+    ).first()
+
+
+@receiver(post_save, sender=WorkHours)
+def refresh_conflicts_after_save(sender, instance, raw=False, **kwargs):
+    """Odświeża indeks, wersje grafiku i sumy godzin dla starego i nowego położenia wpisu, dopisuje zmianę do dziennika."""
+    if raw or _suspended():
+        return
+
+    positions = [(instance.location_id, instance.employee_id, instance.date)]
+    previous = getattr(instance, '_previous_position', None)
+    if previous and previous not in positions:
+        positions.append(previous)
+
+    with transaction.atomic():
+        for location_id, employee_id, work_date in positions:
+            if location_id is not None:
+                ConflictIndexService.refresh_window(location_id, employee_id, work_date)
+                ScheduleVersionService.bump_for_date(location_id, work_date)
+                MonthlyHoursSummaryService.refresh(employee_id, work_date)
+
+        # Przeniesienie wpisu to zapis nowej komórki i wyczyszczenie starej
+        changes = [ScheduleChangeService.upsert(instance)]
+        if previous and previous != positions[0]:
+            changes.append(ScheduleChangeService.delete(*previous, work_hours_id=instance.pk))
+        ScheduleChangeService.record(changes)
+
+
+@receiver(post_delete, sender=WorkHours)
+def refresh_conflicts_after_delete(sender, instance, origin=None, **kwargs):
+    """
+    Odświeża indeks, wersje grafiku i sumy godzin po usunięciu wpisu, dopisuje zmianę do dziennika.
+
+    Wpisy usuwane kaskadowo z pracownikiem obsługuje refresh_after_employee_delete,
+    z lokacją lub użytkownikiem - nie ma już czego odświeżać.
+    """
+    if instance.location_id is None or _suspended() or _cascaded(origin, WorkHours):
+        return
+
+    with transaction.atomic():
+        ConflictIndexService.refresh_window(instance.location_id, instance.employee_id, instance.date)
+        ScheduleVersionService.bump_for_date(instance.location_id, instance.date)
+        MonthlyHoursSummaryService.refresh(instance.employee_id, instance.date)
+        ScheduleChangeService.record([ScheduleChangeService.delete(
+            instance.location_id, instance.employee_id, instance.date, work_hours_id=instance.pk
+        )])
+
+
+@receiver(post_save, sender=LocationConflictRule)
+@receiver(post_delete, sender=LocationConflictRule)
+def rebuild_after_rule_change(sender, instance, raw=False, origin=None, **kwargs):
+    """
+    Zmiana reguł lokacji zmienia wynik wykrywania we wszystkich jej miesiącach -
+    przebudowa indeksu i nowe wersje grafików (unieważnienie cache).
+    """
+    if raw or _cascaded(origin, LocationConflictRule):
+        return
+
+    date_range = WorkHours.objects.filter(location_id=instance.location_id).aggregate(
+        date_from=Min('date'),
+        date_to=Max('date')
+    )
+    if date_range['date_from'] is None:
+        return
+
+    with transaction.atomic():
+        ConflictIndexService.rebuild_range(instance.location_id, date_range['date_from'], date_range['date_to'])
+        ScheduleVersionService.bump_range(instance.location_id, date_range['date_from'], date_range['date_to'])
+
+
+@receiver(holidays_changed)
+def rebuild_hours_after_holiday_change(sender, dates, **kwargs):
+    """
+    Święto w dniu D zmienia składniki sunday/holiday zmian z dni D-1 (zmiana nocna
+    wchodząca w dobę świąteczną), D i D+1 (część przed 6:00 należy do doby D).
+    Przeliczenie sum lokacji w miesiącach tych dni i nowe wersje - zmienia też
+    token cache kart pracowników (ScheduleVersionService.get_user_month_marker).
+    """
+    months = set()
+    for holiday_date in dates:
+        for day_offset in (-1, 0, 1):
+            day = holiday_date + timedelta(days=day_offset)
+            months.add((day.year, day.month))
+
+    with transaction.atomic():
+        for year, month in sorted(months):
+            location_ids = WorkHours.objects.filter(location__isnull=False).in_month(year, month).values_list(
+                'location_id', flat=True
+            ).order_by().distinct()
+            first, _ = month_range(year, month)
+            for location_id in location_ids:
+                MonthlyHoursSummaryService.rebuild_range(location_id, first, first)
+                ScheduleVersionService.bump_month(location_id, year, month)
+
+
+@receiver(pre_save, sender=Employee)
+def remember_previous_agreement_type(sender, instance, raw=False, **kwargs):
+    """Zapamiętuje poprzedni rodzaj umowy pracownika."""
+    instance._previous_agreement_type = None
+    if raw or instance._state.adding:
+        return
+
+    instance._previous_agreement_type = Employee.objects.filter(pk=instance.pk).values_list(
+        'agreement_type', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=Employee)
+def rebuild_after_agreement_change(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Reguły konfliktów obejmują tylko umowy o pracę - zmiana rodzaju umowy zmienia
+    wynik wykrywania w każdym miesiącu z wpisami pracownika (i w miesiącach, których
+    okno je obejmuje). Przebudowa indeksu i nowe wersje (unieważnienie cache).
+    """
+    if raw or created:
+        return
+    previous = getattr(instance, '_previous_agreement_type', None)
+    if previous is None or previous == instance.agreement_type:
+        return
+
+    months = WorkHours.objects.filter(employee_id=instance.pk, location__isnull=False).annotate(
+        month_start=TruncMonth('date')
+    ).values_list('location_id', 'month_start').order_by().distinct()
+
+    affected = set()
+    for location_id, month_start in months:
+        _, next_first = month_range(month_start.year, month_start.month)
+        for year, month in ScheduleVersionService.affected_months(month_start, next_first - timedelta(days=1)):
+            affected.add((location_id, year, month))
+
+    with transaction.atomic():
+        for location_id, year, month in sorted(affected):
+            first, _ = month_range(year, month)
+            ConflictIndexService.rebuild_range(location_id, first, first)
+            ScheduleVersionService.bump_month(location_id, year, month)
+
+
+@receiver(pre_delete, sender=Employee)
+def remember_deleted_cells(sender, instance, origin=None, **kwargs):
+    """Zapamiętuje komórki grafiku usuwanego pracownika (kaskada usunie je przed post_delete)."""
+    instance._deleted_cells = []
+    if _deleted_by(origin, Location, get_user_model()):
+        return
+
+    instance._deleted_cells = list(WorkHours.objects.filter(
+        employee_id=instance.pk,
+        location__isnull=False
+    ).values_list('id', 'location_id', 'date'))
+
+
+@receiver(post_delete, sender=Employee)
+def refresh_after_employee_delete(sender, instance, **kwargs):
+    """
+    Nowe wersje miesięcy z wpisami usuniętego pracownika - raz na lokację - i wpisy
+    usunięcia w dzienniku zmian. Jego konflikty i sumy godzin usuwa kaskada kluczy obcych.
+    """
+    cells = getattr(instance, '_deleted_cells', [])
+    dates_by_location = {}
+    for _, location_id, work_date in cells:
+        dates_by_location.setdefault(location_id, []).append(work_date)
+
+    with transaction.atomic():
+        for location_id, dates in dates_by_location.items():
+            ScheduleVersionService.bump_range(location_id, min(dates), max(dates))
+        ScheduleChangeService.record([
+            ScheduleChangeService.delete(location_id, instance.pk, work_date, work_hours_id=work_hours_id)
+            for work_hours_id, location_id, work_date in cells
+        ])
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Location)
+def touch_schedules_after_rename(sender, instance, raw=False, **kwargs):
+    """Nazwy pracowników i lokacji są w odpowiedzi listy - nieaktualny ETag zwróciłby stare dane."""
+    if raw:
+        return
+    ScheduleVersionService.touch_user_schedules(instance.user_id)
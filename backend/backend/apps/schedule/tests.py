@@ -1,3 +1,635 @@
-from django.test import TestCase
+import json
+import random
+import unittest
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from ..employees.models import Employee
+from ..locations.models import Location
+from .models import (
+    LocationConflictRule, MonthlyHoursSummary, ScheduleChange, ScheduleConflict, ScheduleVersion, WorkHours
+)
+from .services.conflict_detection_service import ConflictDetectionService
+from .services.conflict_index_service import ConflictIndexService
+from .services.conflicts import ConflictAggregator, ShiftIndex
+from .serializers import WorkHoursSerializer
+from .services.conflicts.shift_index import ShiftInterval, MINUTES_PER_DAY
+from .services.monthly_hours_summary_service import MonthlyHoursSummaryService
+from .services.schedule_change_service import ScheduleChangeService
+from .services.schedule_version_service import ScheduleVersionService
+from .services.settlement_period_service import SettlementPeriodService
+from .services.work_hours_export_service import WorkHoursExportService
+
+try:
+    from .services.conflicts.vectorized_aggregator import VectorizedConflictAggregator
+except ImportError:
+    VectorizedConflictAggregator = None
+
+
+def build_index(shifts):
+    """ShiftIndex z krotek (pracownik, 'RRRR-MM-DD', minuta początku, długość w minutach)."""
+    shifts_by_employee = {}
+    for employee_id, work_date, start_minute, duration in shifts:
+        work_date = date.fromisoformat(work_date)
+        start = work_date.toordinal() * MINUTES_PER_DAY + start_minute
+        shifts_by_employee.setdefault(employee_id, []).append(ShiftInterval(work_date, start, start + duration))
+    for intervals in shifts_by_employee.values():
+        intervals.sort()
+    return ShiftIndex(shifts_by_employee)
+
+
+@unittest.skipIf(VectorizedConflictAggregator is None, "NumPy nie jest zainstalowany")
+class ConflictEngineParityTests(SimpleTestCase):
+    """Silnik NumPy musi zwracać dokładnie to samo co walidatory Pythonowe."""
+
+    def assert_parity(self, shift_index, month, year):
+        expected = ConflictAggregator(shift_index, month, year).detect_all_conflicts()
+        actual = VectorizedConflictAggregator(shift_index, month, year).detect_all_conflicts()
+        self.assertEqual(actual, expected)
+        return expected
+
+    def test_overlapping_shifts(self):
+        # Zmiana nocna zachodzi na poranną zmianę następnego dnia (ujemna przerwa)
+        conflicts = self.assert_parity(build_index([
+            ('a', '2025-03-10', 22 * 60, 8 * 60),
+            ('a', '2025-03-11', 4 * 60, 8 * 60),
+        ]), 3, 2025)
+        self.assertEqual(conflicts['rest_11h_conflicts'], ['a-2025-03-11'])
+
+    def test_rest_11h(self):
+        conflicts = self.assert_parity(build_index([
+            ('a', '2025-03-10', 14 * 60, 8 * 60),
+            ('a', '2025-03-11', 6 * 60, 8 * 60),
+            ('b', '2025-03-10', 8 * 60, 8 * 60),
+            ('b', '2025-03-11', 8 * 60, 8 * 60),
+        ]), 3, 2025)
+        self.assertEqual(conflicts['rest_11h_conflicts'], ['a-2025-03-11'])
+
+    def test_rest_35h(self):
+        # Praca codziennie w tygodniu 10 (3-9.03.2025) - najdłuższy odpoczynek 16h
+        conflicts = self.assert_parity(build_index([
+            ('a', (date(2025, 3, 3) + timedelta(days=offset)).isoformat(), 8 * 60, 8 * 60)
+            for offset in range(7)
+        ]), 3, 2025)
+        self.assertEqual(conflicts['rest_35h_conflicts'], {'a': [10]})
+
+    def test_exceed_12h(self):
+        conflicts = self.assert_parity(build_index([
+            ('a', '2025-03-10', 6 * 60, 14 * 60),
+            ('a', '2025-03-12', 8 * 60, 12 * 60),
+        ]), 3, 2025)
+        self.assertEqual(conflicts['shift_12h_conflicts'], ['a-2025-03-10'])
+
+    def test_overnight_shifts(self):
+        conflicts = self.assert_parity(build_index([
+            ('a', '2025-03-10', 22 * 60, 13 * 60),
+            ('a', '2025-03-11', 20 * 60, 10 * 60),
+            ('a', '2025-03-13', 23 * 60, 8 * 60),
+        ]), 3, 2025)
+        self.assertEqual(conflicts['shift_12h_conflicts'], ['a-2025-03-10'])
+        self.assertEqual(conflicts['rest_11h_conflicts'], ['a-2025-03-11'])
+
+    def test_month_boundary_weeks(self):
+        # Tydzień 31.03-6.04.2025 należy do marca i kwietnia; nocka 31.03 kończy się 1.04
+        shift_index = build_index([
+            ('a', (date(2025, 3, 31) + timedelta(days=offset)).isoformat(), 22 * 60, 8 * 60)
+            for offset in range(7)
+        ] + [
+            ('b', '2025-03-31', 20 * 60, 8 * 60),
+            ('b', '2025-04-01', 12 * 60, 8 * 60),
+        ])
+        for month in (3, 4):
+            conflicts = self.assert_parity(shift_index, month, 2025)
+            self.assertEqual(conflicts['rest_11h_conflicts'], ['b-2025-04-01'])
+            self.assertIn(14, conflicts['rest_35h_conflicts']['a'])
+
+    def test_random_schedules(self):
+        for seed in range(5):
+            rng = random.Random(seed)
+            shifts = []
+            for employee_no in range(20):
+                for offset in range(-7, 38):
+                    if rng.random() < 0.3:
+                        continue
+                    work_date = date(2025, 3, 1) + timedelta(days=offset)
+                    shifts.append((
+                        f"employee-{employee_no}", work_date.isoformat(),
+                        rng.randrange(0, MINUTES_PER_DAY, 30), rng.choice([240, 480, 600, 720, 750, 840])
+                    ))
+            with self.subTest(seed=seed):
+                self.assert_parity(build_index(shifts), 3, 2025)
+
+
+class MonthQueryPlanTests(TestCase):
+    """
+    Zapytania miesiąca i okna konfliktów muszą być zakresami po indeksach (lokacja/pracownik, data).
+
+    Na PostgreSQL planer dla małych tabel testowych wybrałby skan sekwencyjny -
+    enable_seqscan = off sprawdza, czy zapytanie w ogóle da się obsłużyć indeksem.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(username='plan', password='plan')
+        cls.location = Location.objects.create(user=user, name='Lokacja')
+        cls.employee = Employee.objects.create(user=user, full_name='Pracownik')
+        WorkHours.objects.create(employee=cls.employee, location=cls.location, date=date(2025, 3, 3), hours='8:00-16:00')
+
+    def assert_index_range_scan(self, queryset, index_name):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+            self.assertIn(index_name, plan)
+            self.assertRegex(plan, r"Index Cond: .*date >=")
+        elif connection.vendor == 'sqlite':
+            plan = queryset.explain()
+            self.assertIn(f"USING INDEX {index_name}", plan)
+            self.assertIn("date>? AND date<?", plan)
+        else:
+            self.skipTest(f"Brak sprawdzenia planu dla {connection.vendor}")
+
+    def test_month_list_uses_location_date_index(self):
+        self.assert_index_range_scan(
+            WorkHours.objects.filter(location=self.location).in_month(2025, 3),
+            'workhours_loc_date_idx'
+        )
+
+    def test_conflict_window_uses_location_date_index(self):
+        self.assert_index_range_scan(
+            ConflictDetectionService(str(self.location.id), 3, 2025)._get_work_hours(),
+            'workhours_loc_date_idx'
+        )
+
+    def test_conflict_index_read_uses_location_date_index(self):
+        self.assert_index_range_scan(
+            ScheduleConflict.objects.filter(ConflictIndexService._month_filter(2025, 3), location_id=self.location.id),
+            'conflict_loc_date_idx'
+        )
+
+    def test_employee_range_uses_employee_date_index(self):
+        self.assert_index_range_scan(
+            WorkHours.objects.filter(employee=self.employee).in_range(date(2025, 3, 1), date(2025, 3, 31)),
+            'workhours_emp_date_idx'
+        )
+
+
+class CascadeDeleteTests(TestCase):
+    """Usunięcie lokacji, pracownika lub użytkownika z wpisami grafiku (kaskada do WorkHours)."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='kaskada', password='kaskada')
+        self.location = Location.objects.create(user=self.user, name='Lokacja 1')
+        self.other_location = Location.objects.create(user=self.user, name='Lokacja 2')
+        self.employee = Employee.objects.create(user=self.user, full_name='Pracownik')
+        LocationConflictRule.objects.create(location=self.location, rule='rest_11h', enabled=False)
+        for location, hours in ((self.location, '6:00-14:00'), (self.other_location, '18:00-22:00')):
+            for day in (3, 4):
+                WorkHours.objects.create(employee=self.employee, location=location, date=date(2025, 3, day), hours=hours)
+
+    def test_location_delete_with_shifts(self):
+        self.location.delete()
+        connection.check_constraints()
+        self.assertFalse(ScheduleVersion.objects.filter(location_id=self.location.id).exists())
+        self.assertEqual(WorkHours.objects.filter(location=self.other_location).count(), 2)
+
+    def test_user_delete_with_shifts(self):
+        self.user.delete()
+        connection.check_constraints()
+        self.assertFalse(ScheduleVersion.objects.exists())
+
+    def test_employee_delete_bumps_versions(self):
+        version = ScheduleVersionService.get_version(self.other_location.id, 3, 2025)
+        self.assertTrue(ScheduleConflict.objects.exists())
+        self.employee.delete()
+        connection.check_constraints()
+        self.assertGreater(ScheduleVersionService.get_version(self.other_location.id, 3, 2025), version)
+        self.assertFalse(ScheduleConflict.objects.exists())
+
+
+class ScheduleChangeLogTests(TestCase):
+    """Dziennik zmian: kursor, stronicowanie, reset po usunięciu starych zmian i kaskady."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='dziennik', password='dziennik')
+        self.location = Location.objects.create(user=self.user, name='Lokacja 1')
+        self.other_location = Location.objects.create(user=self.user, name='Lokacja 2')
+        self.employee = Employee.objects.create(user=self.user, full_name='Pracownik')
+
+    def changes(self, since=0, limit=100, location=None):
+        return ScheduleChangeService.get_changes((location or self.location).id, since, limit)
+
+    def test_cursor_returns_only_newer_changes(self):
+        work_hours = WorkHours.objects.create(
+            employee=self.employee, location=self.location, date=date(2025, 3, 3), hours='8:00-16:00'
+        )
+        first = self.changes()
+        self.assertEqual([(change['op'], change['hours']) for change in first['changes']], [('upsert', '8:00-16:00')])
+        self.assertEqual(first['changes'][0]['id'], str(work_hours.id))
+        self.assertEqual(first['cursor'], ScheduleChangeService.get_cursor(self.location.id))
+        self.assertFalse(first['has_more'])
+        self.assertFalse(first['reset'])
+
+        work_hours.hours = '10:00-18:00'
+        work_hours.save()
+        work_hours.delete()
+        newer = self.changes(first['cursor'])
+        self.assertEqual(
+            [(change['op'], change['hours']) for change in newer['changes']],
+            [('upsert', '10:00-18:00'), ('delete', None)]
+        )
+        self.assertEqual(self.changes(newer['cursor'])['changes'], [])
+        self.assertEqual(self.changes(newer['cursor'])['cursor'], newer['cursor'])
+
+    def test_limit_pages_changes(self):
+        for day in (3, 4, 5):
+            WorkHours.objects.create(employee=self.employee, location=self.location, date=date(2025, 3, day), hours='8:00-16:00')
+        page = self.changes(limit=2)
+        self.assertEqual([change['date'] for change in page['changes']], ['2025-03-03', '2025-03-04'])
+        self.assertTrue(page['has_more'])
+        rest = self.changes(page['cursor'], limit=2)
+        self.assertEqual([change['date'] for change in rest['changes']], ['2025-03-05'])
+        self.assertFalse(rest['has_more'])
+
+    def test_move_records_cleared_cell(self):
+        work_hours = WorkHours.objects.create(
+            employee=self.employee, location=self.location, date=date(2025, 3, 3), hours='8:00-16:00'
+        )
+        cursor = self.changes()['cursor']
+        work_hours.location = self.other_location
+        work_hours.save()
+        self.assertEqual([change['op'] for change in self.changes(cursor)['changes']], ['delete'])
+        self.assertEqual([change['op'] for change in self.changes(location=self.other_location)['changes']], ['upsert'])
+
+    def test_record_skips_cells_without_location(self):
+        ScheduleChangeService.record([ScheduleChangeService.delete(None, self.employee.id, date(2025, 3, 3))])
+        self.assertFalse(ScheduleChange.objects.exists())
+
+    def test_reset_after_purge(self):
+        work_hours = WorkHours.objects.create(
+            employee=self.employee, location=self.location, date=date(2025, 3, 3), hours='8:00-16:00'
+        )
+        work_hours.hours = '9:00-17:00'
+        work_hours.save()
+        cursor = ScheduleChangeService.get_cursor(self.location.id)
+
+        later = timezone.now() + timedelta(seconds=1)
+        self.assertEqual(ScheduleChangeService.compact(later, purge_before=later), {'superseded': 1, 'purged': 1})
+        # Kursor nie cofa się po usunięciu wszystkich zmian
+        self.assertEqual(ScheduleChangeService.get_cursor(self.location.id), cursor)
+
+        stale = self.changes(0)
+        self.assertTrue(stale['reset'])
+        self.assertEqual((stale['changes'], stale['cursor']), ([], cursor))
+
+        current = self.changes(cursor)
+        self.assertFalse(current['reset'])
+        work_hours.delete()
+        self.assertEqual([change['op'] for change in self.changes(cursor)['changes']], ['delete'])
+
+    def test_location_delete_with_shifts(self):
+        for location in (self.location, self.other_location):
+            WorkHours.objects.create(employee=self.employee, location=location, date=date(2025, 3, 3), hours='8:00-16:00')
+        self.location.delete()
+        connection.check_constraints()
+        self.assertFalse(ScheduleChange.objects.filter(location_id=self.location.id).exists())
+        self.assertEqual([change['op'] for change in self.changes(location=self.other_location)['changes']], ['upsert'])
+
+    def test_employee_delete_records_cleared_cells(self):
+        for location in (self.location, self.other_location):
+            WorkHours.objects.create(employee=self.employee, location=location, date=date(2025, 3, 3), hours='8:00-16:00')
+        employee_id = str(self.employee.id)
+        self.employee.delete()
+        connection.check_constraints()
+        for location in (self.location, self.other_location):
+            changes = self.changes(location=location)['changes']
+            self.assertEqual([change['op'] for change in changes], ['upsert', 'delete'])
+            self.assertEqual(changes[1]['employee'], employee_id)
+
+
+class ConflictIndexParityTests(TestCase):
+    """Indeks utrzymywany przez sygnały zapisu musi zgadzać się z pełnym przeliczeniem."""
+
+    MONTHS = ((3, 2025), (4, 2025))
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='indeks', password='indeks')
+        self.location = Location.objects.create(user=user, name='Lokacja')
+        self.employee = Employee.objects.create(user=user, full_name='Pracownik')
+
+    def assert_index_matches(self):
+        for month, year in self.MONTHS:
+            with self.subTest(month=month, year=year):
+                self.assertEqual(
+                    ConflictIndexService.get_conflicts(self.location.id, month, year),
+                    ConflictDetectionService(str(self.location.id), month, year).detect_all_conflicts()
+                )
+
+    def add(self, work_date, hours):
+        return WorkHours.objects.create(
+            employee=self.employee, location=self.location, date=date.fromisoformat(work_date), hours=hours
+        )
+
+    def test_create_update_delete(self):
+        # Tydzień 31.03-6.04.2025 na przełomie miesięcy: praca codziennie, nocka 31.03 i 12h+ 30.03
+        self.add('2025-03-30', '8:00-22:00')
+        night = self.add('2025-03-31', '22:00-6:00')
+        for day in range(1, 7):
+            self.add(f'2025-04-{day:02d}', '8:00-16:00')
+        self.assert_index_matches()
+        self.assertTrue(ScheduleConflict.objects.filter(rule=ScheduleConflict.RULE_REST_11H).exists())
+        self.assertTrue(ScheduleConflict.objects.filter(rule=ScheduleConflict.RULE_REST_35H).exists())
+
+        night.hours = '18:00-22:00'
+        night.save()
+        self.assert_index_matches()
+
+        night.date = date(2025, 3, 28)
+        night.save()
+        self.assert_index_matches()
+
+        WorkHours.objects.filter(date__gte=date(2025, 4, 3)).delete()
+        self.assert_index_matches()
+
+        night.delete()
+        self.assert_index_matches()
+
+
+class SettlementAcrossLocationsTests(TestCase):
+    """Rozliczenie pracownika z kilku lokacji: jedna norma, nadgodziny dobowe z całego dnia."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='rozliczenie', password='rozliczenie')
+        self.locations = [Location.objects.create(user=user, name=f'Lokacja {index}') for index in (1, 2)]
+        self.employee = Employee.objects.create(user=user, full_name='Pracownik')
+        self.employee.locations.set(self.locations)
+
+    def add(self, location, work_date, hours):
+        return WorkHours.objects.create(
+            employee=self.employee, location=location, date=date.fromisoformat(work_date), hours=hours
+        )
+
+    def settle(self, location):
+        with self.assertNumQueries(4):
+            return SettlementPeriodService(location.id, 3, 2025).build()['employees'][0]
+
+    def test_split_day_counts_daily_overtime_once(self):
+        first, second = self.locations
+        self.add(first, '2025-03-03', '6:00-12:00')
+        split = self.add(second, '2025-03-03', '13:00-19:00')
+        self.add(second, '2025-03-04', '8:00-16:00')
+
+        for location in self.locations:
+            row = self.settle(location)
+            self.assertEqual(row['norm_hours'], 168.0)
+            self.assertEqual(row['worked_hours'], 20.0)
+            self.assertEqual(row['daily_overtime_hours'], 4.0)
+
+        split.hours = '13:00-15:00'
+        split.save()
+        self.assertEqual(self.settle(first)['daily_overtime_hours'], 0.0)
+
+
+class BulkScheduleTests(TestCase):
+    """POST /api/schedule/bulk/: merge/replace, powtórzenia i jedno przeliczenie na końcu."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='masowo', password='masowo')
+        self.location = Location.objects.create(user=user, name='Lokacja')
+        self.employee = Employee.objects.create(user=user, full_name='Pracownik')
+        self.other = Employee.objects.create(user=user, full_name='Drugi')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def add(self, employee, work_date, hours):
+        return WorkHours.objects.create(
+            employee=employee, location=self.location, date=date.fromisoformat(work_date), hours=hours
+        )
+
+    def bulk(self, cells, month=3, mode='merge', status=200):
+        response = self.client.post('/api/schedule/bulk/', {
+            'location': str(self.location.id), 'month': month, 'year': 2025, 'mode': mode,
+            'cells': [{'employee': str(employee.id), 'date': work_date, 'hours': hours} for employee, work_date, hours in cells]
+        }, format='json')
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    def cells(self):
+        return sorted(
+            (str(employee_id), work_date.isoformat(), hours)
+            for employee_id, work_date, hours in WorkHours.objects.values_list('employee_id', 'date', 'hours')
+        )
+
+    def versions(self):
+        return dict(((year, month), version) for year, month, version in ScheduleVersion.objects.filter(
+            location=self.location
+        ).values_list('year', 'month', 'version'))
+
+    def assert_derived_data_current(self):
+        for month in (3, 4):
+            with self.subTest(month=month):
+                self.assertEqual(
+                    ConflictIndexService.get_conflicts(self.location.id, month, 2025),
+                    ConflictDetectionService(str(self.location.id), month, 2025).detect_all_conflicts()
+                )
+        summaries = sorted(MonthlyHoursSummary.objects.values_list(
+            'employee_id', 'year', 'month', *MonthlyHoursSummaryService.FIELDS
+        ))
+        MonthlyHoursSummaryService.rebuild_range(self.location.id, date(2025, 3, 1), date(2025, 4, 30))
+        self.assertEqual(summaries, sorted(MonthlyHoursSummary.objects.values_list(
+            'employee_id', 'year', 'month', *MonthlyHoursSummaryService.FIELDS
+        )))
+
+    def test_merge_changes_only_given_cells(self):
+        self.add(self.employee, '2025-03-03', '8:00-16:00')
+        self.add(self.employee, '2025-03-04', '8:00-16:00')
+        self.add(self.other, '2025-03-05', '8:00-16:00')
+
+        result = self.bulk([
+            (self.employee, '2025-03-03', '6:00-14:00'),
+            (self.employee, '2025-03-04', None),
+            (self.employee, '2025-03-06', '14:00-22:00'),
+        ])
+        self.assertEqual((result['created'], result['updated'], result['deleted']), (1, 1, 1))
+        self.assertEqual(len(result['work_hours']), 3)
+        self.assertEqual(self.cells(), sorted([
+            (str(self.employee.id), '2025-03-03', '6:00-14:00'),
+            (str(self.employee.id), '2025-03-06', '14:00-22:00'),
+            (str(self.other.id), '2025-03-05', '8:00-16:00'),
+        ]))
+        self.assert_derived_data_current()
+
+    def test_replace_clears_other_cells_of_month(self):
+        self.add(self.employee, '2025-03-03', '8:00-16:00')
+        self.add(self.other, '2025-03-05', '8:00-16:00')
+        self.add(self.other, '2025-04-07', '8:00-16:00')
+
+        result = self.bulk([(self.employee, '2025-03-03', '8:00-16:00')], mode='replace')
+        self.assertEqual((result['created'], result['updated'], result['deleted']), (0, 0, 1))
+        self.assertEqual(self.cells(), sorted([
+            (str(self.employee.id), '2025-03-03', '8:00-16:00'),
+            (str(self.other.id), '2025-04-07', '8:00-16:00'),
+        ]))
+        self.assert_derived_data_current()
+
+    def test_repeated_request_changes_nothing(self):
+        cells = [(self.employee, '2025-03-03', '8:00-16:00'), (self.other, '2025-03-04', '22:00-6:00')]
+        self.bulk(cells)
+        state = (self.cells(), self.versions(), ScheduleChange.objects.count())
+
+        for mode in ('merge', 'replace'):
+            result = self.bulk(cells, mode=mode)
+            self.assertEqual((result['created'], result['updated'], result['deleted']), (0, 0, 0))
+            self.assertEqual((self.cells(), self.versions(), ScheduleChange.objects.count()), state)
+
+    def test_single_refresh_at_the_end(self):
+        cells = [(self.employee, f'2025-03-{day:02d}', '8:00-16:00') for day in range(3, 10)]
+        with mock.patch.object(ConflictIndexService, 'refresh_window') as refresh_window, \
+                mock.patch.object(ConflictIndexService, 'rebuild_range', wraps=ConflictIndexService.rebuild_range) as rebuild, \
+                mock.patch.object(MonthlyHoursSummaryService, 'refresh') as refresh_summary, \
+                mock.patch.object(MonthlyHoursSummaryService, 'rebuild_range',
+                                  wraps=MonthlyHoursSummaryService.rebuild_range) as rebuild_summary:
+            result = self.bulk(cells)
+
+        self.assertEqual(result['created'], 7)
+        refresh_window.assert_not_called()
+        refresh_summary.assert_not_called()
+        self.assertEqual(rebuild.call_count, 1)
+        self.assertEqual(rebuild_summary.call_count, 1)
+        self.assertEqual(self.versions(), {(2025, 3): 1})
+        self.assertEqual(ScheduleChange.objects.count(), 7)
+        self.assertEqual(result['conflicts']['rest_35h'], {str(self.employee.id): [10]})
+        self.assert_derived_data_current()
+
+    def test_week_across_month_boundary(self):
+        # Tydzień 31.03-6.04.2025: wpis 31.03 i bulk kwietnia zmieniają konflikty obu miesięcy
+        self.add(self.employee, '2025-03-31', '8:00-16:00')
+        march_version = self.versions()[(2025, 3)]
+
+        self.bulk([(self.employee, f'2025-04-{day:02d}', '8:00-16:00') for day in range(1, 7)], month=4)
+        self.assertGreater(self.versions()[(2025, 3)], march_version)
+        self.assertIn(14, ConflictIndexService.get_conflicts(self.location.id, 3, 2025)['rest_35h'][str(self.employee.id)])
+        self.assert_derived_data_current()
+
+        self.bulk([], month=4, mode='replace')
+        self.assertFalse(WorkHours.objects.filter(date__month=4).exists())
+        self.assert_derived_data_current()
+
+    def test_cells_outside_month_rejected(self):
+        self.bulk([(self.employee, '2025-04-01', '8:00-16:00')], status=400)
+        self.assertFalse(WorkHours.objects.exists())
+
+
+class LayoutFormatTests(TestCase):
+    """Domyślny JSON listy bez zmian względem serializera, ?format=grid oraz eksport csv/ndjson."""
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='formaty', password='formaty')
+        self.location = Location.objects.create(user=user, name='Lokacja')
+        self.anna = Employee.objects.create(user=user, full_name='Anna')
+        self.bartek = Employee.objects.create(user=user, full_name='Bartek')
+        for employee, location, work_date, hours in (
+            (self.bartek, self.location, '2025-03-03', '8:00-16:00'),
+            (self.anna, self.location, '2025-03-03', '22:00-6:00'),
+            (self.anna, self.location, '2025-03-04', '8:00-20:00'),
+            (self.anna, None, '2025-03-05', '8:00-16:00'),
+        ):
+            WorkHours.objects.create(employee=employee, location=location, date=date.fromisoformat(work_date), hours=hours)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def serializer_data(self, queryset):
+        # Odczyt sprzed WorkHoursReadService: instancje modelu + WorkHoursSerializer
+        return WorkHoursSerializer(queryset.select_related('employee', 'location'), many=True).data
+
+    def export(self, export_format):
+        response = self.client.get('/api/schedule/export/', {
+            'date_from': '2025-03-01', 'date_to': '2025-03-31', 'format': export_format
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], WorkHoursExportService.CONTENT_TYPES[export_format])
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_default_list_is_byte_identical_to_serializer(self):
+        # Wszystkie wpisy, także bez lokacji (bez klucza location_name)
+        response = self.client.get('/api/schedule/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, JSONRenderer().render({
+            'work_hours': self.serializer_data(WorkHours.objects.all()),
+            'conflicts': None,
+            'cross_location_conflicts': None
+        }))
+        self.assertNotIn('location_name', response.json()['work_hours'][-1])
+
+    def test_location_month_list_is_byte_identical_to_serializer(self):
+        response = self.client.get('/api/schedule/', {'location': str(self.location.id), 'month': 3, 'year': 2025})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, JSONRenderer().render({
+            'work_hours': self.serializer_data(WorkHours.objects.filter(location=self.location).in_month(2025, 3)),
+            'conflicts': ConflictIndexService.get_conflicts(self.location.id, 3, 2025),
+            'cross_location_conflicts': response.data['cross_location_conflicts']
+        }))
+
+    def test_grid_shape(self):
+        response = self.client.get('/api/schedule/', {
+            'location': str(self.location.id), 'month': 3, 'year': 2025, 'format': 'grid'
+        })
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(
+            list(data), ['format', 'days', 'employees', 'hours', 'ids', 'conflicts', 'cross_location_conflicts']
+        )
+        self.assertEqual(data['format'], 'grid')
+        self.assertEqual(len(data['days']), 31)
+        self.assertEqual((data['days'][0], data['days'][-1]), ('2025-03-01', '2025-03-31'))
+        self.assertEqual(data['employees'], [
+            {'id': str(self.anna.id), 'name': 'Anna'}, {'id': str(self.bartek.id), 'name': 'Bartek'}
+        ])
+        for row in data['hours'] + data['ids']:
+            self.assertEqual(len(row), 31)
+        # Wpis bez lokacji (5.03) nie należy do siatki lokacji
+        self.assertEqual(data['hours'][0][2:5], ['22:00-6:00', '8:00-20:00', None])
+        self.assertEqual(data['hours'][1][2], '8:00-16:00')
+        self.assertEqual(data['ids'][1][2], str(WorkHours.objects.get(employee=self.bartek).id))
+        self.assertEqual(set(data['conflicts']), {'rest_11h', 'rest_35h', 'exceed_12h'})
+        # Nocka 3.03 kończy się o 6:00, zmiana 4.03 zaczyna o 8:00 - [wiersz Anny, dzień 4.03]
+        self.assertEqual(data['conflicts']['rest_11h'], [[0, 3]])
+
+    def test_grid_requires_location(self):
+        response = self.client.get('/api/schedule/', {'month': 3, 'year': 2025, 'format': 'grid'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+    def test_export_csv(self):
+        lines = self.export('csv').splitlines()
+        self.assertEqual(lines[0].split(','), list(WorkHoursExportService.COLUMNS))
+        # Eksport obejmuje tylko lokacje użytkownika - bez wpisu bez lokacji
+        self.assertEqual(len(lines), 4)
+        first = dict(zip(WorkHoursExportService.COLUMNS, lines[1].split(',')))
+        self.assertEqual(first['date'], '2025-03-03')
+        self.assertEqual(first['location'], str(self.location.id))
+
+    def test_export_ndjson(self):
+        rows = [json.loads(line) for line in self.export('ndjson').splitlines()]
+        self.assertEqual(len(rows), 3)
+        for row in rows:
+            self.assertEqual(list(row), list(WorkHoursExportService.COLUMNS))
+        self.assertEqual(
+            {row['id'] for row in rows},
+            {str(work_hours_id) for work_hours_id in WorkHours.objects.filter(location=self.location).values_list('id', flat=True)}
+        )
+        night = next(row for row in rows if row['hours'] == '22:00-6:00')
+        self.assertEqual((night['duration_minutes'], night['is_overnight']), (480, True))
+
+    def test_export_rejects_unsupported_format(self):
+        response = self.client.get('/api/schedule/export/', {
+            'date_from': '2025-03-01', 'date_to': '2025-03-31', 'format': 'grid'
+        })
+        self.assertEqual(response.status_code, 400)
@@ -1,10 +1,12 @@
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
-from .views import WorkHoursViewSet
-
-router = DefaultRouter()
-router.register(r'', WorkHoursViewSet, basename='work-hours')
-
-urlpatterns = [
-    path('', include(router.urls)),
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import WorkHoursViewSet, RotationPatternViewSet
+
+router = DefaultRouter()
+# Przed trasą '' - inaczej 'rotation-patterns' zostałby potraktowany jak pk wpisu
+router.register(r'rotation-patterns', RotationPatternViewSet, basename='rotation-patterns')
+router.register(r'', WorkHoursViewSet, basename='work-hours')
+
+urlpatterns = [
+    path('', include(router.urls)),
 ]
\ No newline at end of file
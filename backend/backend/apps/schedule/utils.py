@@ -2,6 +2,105 @@
 Funkcje pomocnicze dla modułu work_hours.
 """
 import re
+from datetime import date
+
+# Format: "8:00-16:00" lub "08:00-16:00"
+SHIFT_HOURS_PATTERN = re.compile(r'(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})')
+# Format: "8-16" lub "08-16"
+SHIFT_HOURS_SHORT_PATTERN = re.compile(r'(\d{1,2})-(\d{1,2})')
+
+MINUTES_PER_DAY = 24 * 60
+
+# Pora nocna (przedział z art. 151^7 KP): 21:00-7:00
+NIGHT_START_MINUTE = 21 * 60
+NIGHT_END_MINUTE = 7 * 60
+
+# Doba niedzielna/świąteczna (art. 151^10 KP): od 6:00 danego dnia do 6:00 dnia następnego
+SUNDAY_HOLIDAY_START_MINUTE = 6 * 60
+
+# Dobowa norma czasu pracy (art. 129 §1 KP)
+DAILY_NORM_MINUTES = 8 * 60
+
+# Wymiar etatu: "1/2", "3/4 etatu" lub "0,5"
+JOB_FRACTION_PATTERN = re.compile(r'(\d+)\s*/\s*(\d+)')
+JOB_DECIMAL_PATTERN = re.compile(r'\d+(?:[.,]\d+)?')
+
+
+def parse_shift_minutes(hours_str):
+    """
+    Parsuje godziny 'HH:MM-HH:MM' lub 'H-H' na (start_minute, end_minute).
+
+    Zwraca None dla wpisów bez godzin (np. '-', 'DWH').
+    Rzuca ValueError dla godzin spoza zakresu (np. '25:00', '8:75').
+    """
+    if not hours_str or hours_str == '-':
+        return None
+
+    match = SHIFT_HOURS_PATTERN.match(hours_str)
+    if match:
+        start_h, start_m, end_h, end_m = map(int, match.groups())
+    else:
+        match = SHIFT_HOURS_SHORT_PATTERN.match(hours_str)
+        if not match:
+            return None
+        start_h, end_h = map(int, match.groups())
+        start_m = end_m = 0
+
+    if start_m >= 60 or end_m >= 60:
+        raise ValueError(f"Nieprawidłowe minuty w godzinach: {hours_str}")
+
+    start_minute = start_h * 60 + start_m
+    end_minute = end_h * 60 + end_m
+
+    # Początek najpóźniej 23:59, koniec najpóźniej 24:00
+    if start_minute >= MINUTES_PER_DAY or end_minute > MINUTES_PER_DAY:
+        raise ValueError(f"Nieprawidłowe godziny: {hours_str}")
+
+    return start_minute, end_minute
+
+
+def shift_duration_minutes(start_minute, end_minute):
+    """
+    Zwraca długość zmiany w minutach.
+    Zmiana nocna (koniec przed początkiem, np. 22:00-06:00) kończy się następnego dnia.
+    """
+    if end_minute < start_minute:
+        return end_minute + MINUTES_PER_DAY - start_minute
+    return end_minute - start_minute
+
+
+def overlap_minutes(start, end, range_start, range_end):
+    """Długość części wspólnej przedziałów [start, end) i [range_start, range_end) w minutach."""
+    return max(0, min(end, range_end) - max(start, range_start))
+
+
+def job_fraction(job):
+    """
+    Zwraca wymiar etatu (pole Employee.job) jako ułamek z przedziału (0, 1].
+
+    Puste i nierozpoznane wartości (np. 'pełny') traktowane są jako pełny etat.
+    """
+    if not job:
+        return 1.0
+
+    match = JOB_FRACTION_PATTERN.search(job)
+    if match:
+        numerator, denominator = map(int, match.groups())
+        fraction = numerator / denominator if denominator else 0
+    else:
+        match = JOB_DECIMAL_PATTERN.search(job)
+        if not match:
+            return 1.0
+        fraction = float(match.group().replace(',', '.'))
+
+    return fraction if 0 < fraction <= 1 else 1.0
+
+
+def format_minute(minute):
+    """Minuta doby jako HH:MM (None dla wpisów bez godzin)."""
+    if minute is None:
+        return None
+    return f"{minute // 60:02d}:{minute % 60:02d}"
 
 
 def calculate_hours(hours_str):
@@ -9,29 +108,15 @@ def calculate_hours(hours_str):
     Oblicza liczbę godzin z formatu 'HH:MM-HH:MM' lub 'H-H'.
     Zwraca liczbę godzin jako float.
     """
-    if not hours_str or hours_str == '-':
-        return 0
-
     try:
-        # Format: "8:00-16:00" lub "08:00-16:00"
-        if ':' in hours_str:
-            match = re.match(r'(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})', hours_str)
-            if match:
-                start_h, start_m, end_h, end_m = map(int, match.groups())
-                start_total = start_h + start_m / 60
-                end_total = end_h + end_m / 60
-                return end_total - start_total
-
-        # Format: "8-16" lub "08-16"
-        match = re.match(r'(\d{1,2})-(\d{1,2})', hours_str)
-        if match:
-            start_h, end_h = map(int, match.groups())
-            return end_h - start_h
+        parsed = parse_shift_minutes(hours_str)
+    except ValueError:
+        return 0
 
-    except (ValueError, AttributeError):
-        pass
+    if not parsed:
+        return 0
 
-    return 0
+    return shift_duration_minutes(*parsed) / 60
 
 
 def get_polish_weekday_name(weekday_index, short=False):
@@ -65,4 +150,16 @@ def get_polish_month_name(month_number):
         'Lipiec', 'Sierpień', 'Wrzesień', 'Październik', 'Listopad', 'Grudzień'
     ]
 
-    return months[month_number]
\ No newline at end of file
+    return months[month_number]
+
+
+def month_range(year, month):
+    """
+    Zwraca półotwarty zakres miesiąca [pierwszy dzień, pierwszy dzień następnego miesiąca).
+
+    Filtr date >= od AND date < do jest skanem zakresu po indeksie (location, date);
+    date__month/date__year kompilują się do EXTRACT, którego indeks nie obsłuży.
+    """
+    first = date(year, month, 1)
+    next_first = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return first, next_first
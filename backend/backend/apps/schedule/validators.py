@@ -1,6 +1,7 @@
 """
 Walidatory dla modułu work_hours.
 """
+from datetime import date
 
 
 class ScheduleParamsValidator:
@@ -61,4 +62,112 @@ class ScheduleParamsValidator:
 
     @property
     def year(self):
-        return self._year
\ No newline at end of file
+        return self._year
+
+
+class MonthParamsValidator(ScheduleParamsValidator):
+    """Walidator parametrów month/year (widoki per pracownik - bez lokacji)."""
+
+    def _validate_required_params(self):
+        """Sprawdza czy month i year są obecne."""
+        if not all([self.query_params.get('month'), self.query_params.get('year')]):
+            self.errors['error'] = 'Brakuje parametrów: month, year'
+
+
+class DateRangeParamsValidator:
+    """Walidator parametrów date_from/date_to (YYYY-MM-DD)."""
+
+    def __init__(self, query_params, max_months=None):
+        self.query_params = query_params
+        self.max_months = max_months
+        self.errors = {}
+        self._date_from = None
+        self._date_to = None
+        self._validate()
+
+    def _validate(self):
+        """Waliduje obecność, format i kolejność dat."""
+        date_from = self.query_params.get('date_from')
+        date_to = self.query_params.get('date_to')
+
+        if not all([date_from, date_to]):
+            self.errors['error'] = 'Brakuje parametrów: date_from, date_to'
+            return
+
+        try:
+            self._date_from = date.fromisoformat(date_from)
+            self._date_to = date.fromisoformat(date_to)
+        except ValueError:
+            self.errors['error'] = 'Nieprawidłowy format daty - oczekiwano YYYY-MM-DD'
+            return
+
+        if self._date_from > self._date_to:
+            self.errors['error'] = 'date_from musi być wcześniejsze niż date_to'
+            return
+
+        months = (self._date_to.year - self._date_from.year) * 12 + self._date_to.month - self._date_from.month + 1
+        if self.max_months and months > self.max_months:
+            self.errors['error'] = f'Zakres może obejmować najwyżej {self.max_months} miesięcy'
+
+    def is_valid(self):
+        """Zwraca True jeśli parametry są poprawne."""
+        return not bool(self.errors)
+
+    @property
+    def date_from(self):
+        return self._date_from
+
+    @property
+    def date_to(self):
+        return self._date_to
+
+
+class ChangesParamsValidator:
+    """Walidator parametrów location/since/limit synchronizacji przyrostowej."""
+
+    def __init__(self, query_params, max_limit):
+        self.query_params = query_params
+        self.max_limit = max_limit
+        self.errors = {}
+        self._location_id = None
+        self._since = None
+        self._limit = max_limit
+        self._validate()
+
+    def _validate(self):
+        """Waliduje obecność lokacji oraz liczby since (>= 0) i limit (1..max_limit)."""
+        self._location_id = self.query_params.get('location')
+        if not self._location_id:
+            self.errors['error'] = 'Brakuje parametru: location'
+            return
+
+        try:
+            if self.query_params.get('since') is not None:
+                self._since = int(self.query_params.get('since'))
+            if self.query_params.get('limit') is not None:
+                self._limit = int(self.query_params.get('limit'))
+        except (ValueError, TypeError):
+            self.errors['error'] = 'Nieprawidłowy format parametrów'
+            return
+
+        if self._since is not None and self._since < 0:
+            self.errors['error'] = 'since nie może być ujemne'
+        elif not (1 <= self._limit <= self.max_limit):
+            self.errors['error'] = f'limit musi być w zakresie 1-{self.max_limit}'
+
+    def is_valid(self):
+        """Zwraca True jeśli parametry są poprawne."""
+        return not bool(self.errors)
+
+    @property
+    def location_id(self):
+        return self._location_id
+
+    @property
+    def since(self):
+        """None - klient pyta tylko o bieżący kursor."""
+        return self._since
+
+    @property
+    def limit(self):
+        return self._limit
@@ -1,21 +1,55 @@
 """
 ViewSets dla modułu work_hours.
 """
+import hashlib
 import logging
+import time
+from datetime import date, timedelta
+from urllib.parse import urlencode
 from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import HttpResponse
+from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 
-from .models import WorkHours
-from .serializers import WorkHoursSerializer
+from ...common.negotiation import LayoutFormatNegotiation
+from ...common.utils import with_conditional_headers
+from ..locations.models import Location
+
+from .models import WorkHours, RotationPattern
+from .serializers import (
+    WorkHoursSerializer, WorkHoursBulkSerializer, WorkHoursCopySerializer,
+    RotationPatternSerializer, RotationGenerateSerializer
+)
+from .services.bulk_schedule_service import BulkScheduleService
+from .services.compliance_scan_service import ComplianceScanService
+from .services.conflict_cache_service import ConflictCacheService
 from .services.conflict_detection_service import ConflictDetectionService
+from .services.conflict_index_service import ConflictIndexService
+from .services.cross_location_conflict_service import CrossLocationConflictService
+from .services.incremental_conflict_service import IncrementalConflictService
+from .services.monthly_hours_summary_service import MonthlyHoursSummaryService
 from .services.pdf_service import PDFGeneratorService
-
-from .validators import ScheduleParamsValidator
+from .services.rotation_generator_service import RotationGeneratorService
+from .services.schedule_change_service import ScheduleChangeService
+from .services.schedule_copy_service import ScheduleCopyService
+from .services.schedule_grid_service import ScheduleGridService
+from .services.schedule_overview_service import ScheduleOverviewService
+from .services.schedule_version_service import ScheduleVersionService
+from .services.settlement_period_service import SettlementPeriodService
+from .services.work_hours_export_service import WorkHoursExportService
+from .services.work_hours_read_service import WorkHoursReadService
+
+from .utils import month_range
+from .validators import (
+    ScheduleParamsValidator, MonthParamsValidator, DateRangeParamsValidator, ChangesParamsValidator
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +59,7 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
     queryset = WorkHours.objects.all()
     serializer_class = WorkHoursSerializer
     permission_classes = [IsAuthenticated]
+    content_negotiation_class = LayoutFormatNegotiation  # ?format=grid, ?format=csv (eksport)
 
     def get_queryset(self):
         """Filtrowanie queryset na podstawie parametrów."""
@@ -36,6 +71,9 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
         # Filtrowanie po miesiącu i roku
         queryset = self._filter_by_month_year(queryset)
 
+        # Filtrowanie po zakresie dat
+        queryset = self._filter_by_date_range(queryset)
+
         # Filtrowanie po pracowniku
         queryset = self._filter_by_employee(queryset)
 
@@ -45,20 +83,34 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
         return queryset
 
     def _filter_by_month_year(self, queryset):
-        """Filtrowanie po miesiącu i roku."""
+        """Filtrowanie po miesiącu i roku (zakres dat - skan indeksu (location, date))."""
         month = self.request.query_params.get('month')
         year = self.request.query_params.get('year')
 
         if month and year:
             try:
-                month = int(month)
-                year = int(year)
-                queryset = queryset.filter(date__month=month, date__year=year)
+                queryset = queryset.in_month(int(year), int(month))
             except (ValueError, TypeError):
                 pass
 
         return queryset
 
+    def _filter_by_date_range(self, queryset):
+        """Filtrowanie po date_from/date_to (YYYY-MM-DD, włącznie; każda granica opcjonalna)."""
+        date_from = self.request.query_params.get('date_from')
+        date_to = self.request.query_params.get('date_to')
+
+        if date_from or date_to:
+            try:
+                queryset = queryset.in_range(
+                    date.fromisoformat(date_from) if date_from else None,
+                    date.fromisoformat(date_to) if date_to else None
+                )
+            except ValueError:
+                pass
+
+        return queryset
+
     def _filter_by_employee(self, queryset):
         """Filtrowanie po pracowniku."""
         employee_id = self.request.query_params.get('employee_id')
@@ -79,10 +131,36 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         """
         GET /api/work-hours/?location=xxx&month=11&year=2025
-        Zwraca work_hours + konflikty
+        (lub dowolny zakres: ?location=xxx&date_from=2025-11-01&date_to=2025-12-15)
+        Zwraca work_hours + konflikty (odczytane z indeksu ScheduleConflict)
+        + konflikty pracowników z ich zmianami w innych lokacjach
+
+        ?conflicts=full wymusza przeliczenie konfliktów (cache per wersja grafiku).
+        ?debug=1 (DEBUG lub administrator) dodaje blok 'debug' z czasami reguł.
+        ?format=grid zwraca macierz pracownicy × dni (ScheduleGridService) zamiast
+        listy wpisów - bez serializera, konflikty jako indeksy macierzy.
+
+        Odpowiedź lokacji-miesiąca ma ETag/Last-Modified z wersji grafiku -
+        niezmieniony miesiąc zwraca 304 bez zapytań o wpisy i bez liczenia konfliktów.
         """
+        conditional = self._get_list_conditional_headers()
+        if conditional is not None:
+            not_modified = get_conditional_response(request, **conditional)
+            if not_modified is not None:
+                return with_conditional_headers(not_modified, conditional)
+
         queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
+
+        grid = None
+        if request.query_params.get('format') == 'grid':
+            grid = self._get_grid(queryset)
+            if isinstance(grid, Response):
+                return grid
+            employee_ids = grid.load().employee_ids
+        else:
+            # Odczyt bez instancji i serializera - JSON identyczny z WorkHoursSerializer
+            work_hours_data = WorkHoursReadService.serialize(queryset)
+            employee_ids = {row['employee'] for row in work_hours_data}
 
         # Pobierz parametry do obliczenia konfliktów
         location_id = request.query_params.get('location')
@@ -91,14 +169,29 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
 
         # Oblicz konflikty jeśli są wymagane parametry
         conflicts = None
+        cross_location_conflicts = None
+        debug = None
         if location_id and month and year:
             try:
-                conflict_service = ConflictDetectionService(
-                    location_id=location_id,
+                if request.query_params.get('conflicts') == 'full':
+                    conflicts = self._recalculate_list_conflicts(location_id, int(month), int(year))
+                else:
+                    # Konflikty z indeksu (utrzymywanego przy zapisach) - bez przeliczania
+                    conflicts = ConflictIndexService.get_conflicts(
+                        location_id=location_id,
+                        month=int(month),
+                        year=int(year)
+                    )
+
+                # Konflikty z innymi lokacjami pracowników z grafiku (queryset już pobrany)
+                cross_location_conflicts = CrossLocationConflictService(
+                    employee_ids=employee_ids,
                     month=int(month),
                     year=int(year)
-                )
-                conflicts = conflict_service.detect_all_conflicts()
+                ).detect(location_id=location_id)
+
+                if self._debug_requested():
+                    debug = self._get_conflict_debug(location_id, int(month), int(year))
             except (ValueError, TypeError) as e:
                 logger.error(f"Błędne parametry przy obliczaniu konfliktów: {e}", exc_info=True)
                 conflicts = {
@@ -106,6 +199,7 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
                     'rest_35h': {},
                     'exceed_12h': []
                 }
+                cross_location_conflicts = []
             except ValidationError as e:
                 logger.error(f"Błąd walidacji przy obliczaniu konfliktów: {e}", exc_info=True)
                 conflicts = {
@@ -113,50 +207,158 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
                     'rest_35h': {},
                     'exceed_12h': []
                 }
+                cross_location_conflicts = []
+
+        if grid is not None:
+            response_data = grid.build(conflicts, cross_location_conflicts)
+        else:
+            response_data = {
+                'work_hours': work_hours_data,
+                'conflicts': conflicts,
+                'cross_location_conflicts': cross_location_conflicts
+            }
+        if debug is not None:
+            response_data['debug'] = debug
 
-        return Response({
-            'work_hours': serializer.data,
-            'conflicts': conflicts
-        })
+        response = Response(response_data)
+        if conditional is not None:
+            with_conditional_headers(response, conditional)
+        return response
+
+    def _get_grid(self, queryset):
+        """
+        ScheduleGridService dla ?format=grid - wymaga lokacji i osi dni
+        (month+year albo date_from+date_to); przy błędnych parametrach Response 400.
+        """
+        params = self.request.query_params
+        if not params.get('location'):
+            return Response({'error': 'Format grid wymaga parametru location'}, status=400)
+
+        if params.get('month') and params.get('year'):
+            validator = ScheduleParamsValidator(params)
+            if not validator.is_valid():
+                return Response(validator.errors, status=400)
+            date_from, next_month_start = month_range(validator.year, validator.month)
+            date_to = next_month_start - timedelta(days=1)
+        else:
+            validator = DateRangeParamsValidator(params, max_months=settings.SCHEDULE_GRID_MAX_MONTHS)
+            if not validator.is_valid():
+                return Response(validator.errors, status=400)
+            date_from, date_to = validator.date_from, validator.date_to
+
+        return ScheduleGridService(queryset, date_from, date_to)
+
+    def _get_list_conditional_headers(self):
+        """
+        ETag i Last-Modified listy lokacji-miesiąca (None = odpowiedź bez warunkowania).
+
+        ETag obejmuje użytkownika i wszystkie parametry zapytania (inne parametry
+        to inna odpowiedź); ?debug=1 nie jest warunkowany (czasy reguł są zawsze świeże).
+        """
+        params = self.request.query_params
+        if self._debug_requested():
+            return None
+
+        validator = ScheduleParamsValidator(params)
+        if not validator.is_valid():
+            return None
+
+        try:
+            marker = ScheduleVersionService.get_month_marker(
+                location_id=validator.location_id,
+                month=validator.month,
+                year=validator.year,
+                user_id=self.request.user.id
+            )
+        except (ValueError, ValidationError):
+            return None
+        if marker is None:
+            return None
+
+        token, last_modified = marker
+        query = urlencode(sorted(params.lists()), doseq=True)
+        digest = hashlib.md5(f"{self.request.user.id}|{query}|{token}".encode()).hexdigest()
+        return {
+            'etag': quote_etag(digest),
+            'last_modified': int(last_modified.timestamp())
+        }
+
+    def _debug_requested(self):
+        """?debug=1 - tylko w trybie DEBUG lub dla administratora."""
+        if self.request.query_params.get('debug') not in ('1', 'true'):
+            return False
+        return settings.DEBUG or self.request.user.is_staff
+
+    def _get_conflict_debug(self, location_id, month, year):
+        """
+        Blok diagnostyczny: pełne przeliczenie konfliktów (z pominięciem
+        indeksu i cache) z czasem i rozmiarem wejścia każdej reguły.
+        """
+        detection = ConflictDetectionService(location_id=location_id, month=month, year=year)
+        started = time.perf_counter()
+        detection.detect_all_conflicts()
+
+        return {
+            'engine': detection.aggregator.engine,
+            'rules': sorted(detection.aggregator.rules or []),
+            'validators': detection.get_timings(),
+            'detection_ms': round((time.perf_counter() - started) * 1000, 3)
+        }
+
+    def _recalculate_list_conflicts(self, location_id, month, year):
+        """
+        Przelicza konflikty lokacji-miesiąca (cache per wersja grafiku).
+
+        Lista czyta tylko kolumny do odpowiedzi (WorkHoursReadService), więc
+        silnik pobiera zmiany okna sam - jednym zapytaniem zakresowym.
+        """
+        return ConflictCacheService.detect_all_conflicts(location_id, month, year)
 
     def create(self, request, *args, **kwargs):
         """
         POST /api/work-hours/
-        Zapisuje work_hours i zwraca je + konflikty
+        Zapisuje work_hours i zwraca je + konflikty (przyrostowo)
         """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
 
-        # Pobierz zapisany obiekt
-        instance = serializer.instance
+        # Stan konfliktów w oknie przed zapisem
+        targets = self._get_conflict_targets(serializer.validated_data)
+        conflicts_before = self._detect_window_conflicts(targets)
+
+        self.perform_create(serializer)
 
-        # Oblicz konflikty dla tej lokacji i miesiąca
-        conflicts = self._calculate_conflicts_for_instance(instance)
+        # Oblicz konflikty dla zapisanego obiektu
+        conflict_data = self._get_write_conflicts(serializer.instance, targets, conflicts_before)
 
         headers = self.get_success_headers(serializer.data)
         return Response({
             **serializer.data,
-            'conflicts': conflicts
+            **conflict_data
         }, status=status.HTTP_201_CREATED, headers=headers)
 
     def update(self, request, *args, **kwargs):
         """
         PATCH/PUT /api/work-hours/{id}/
-        Aktualizuje work_hours i zwraca konflikty
+        Aktualizuje work_hours i zwraca konflikty (przyrostowo)
         """
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
+
+        # Okna przed i po zmianie (zmiana może przenieść wpis na inny dzień/pracownika)
+        targets = self._get_conflict_targets(serializer.validated_data, instance)
+        conflicts_before = self._detect_window_conflicts(targets)
+
         self.perform_update(serializer)
 
         # Oblicz konflikty dla zaktualizowanego obiektu
-        conflicts = self._calculate_conflicts_for_instance(serializer.instance)
+        conflict_data = self._get_write_conflicts(serializer.instance, targets, conflicts_before)
 
         return Response({
             **serializer.data,
-            'conflicts': conflicts
+            **conflict_data
         })
 
     def destroy(self, request, *args, **kwargs):
@@ -166,41 +368,102 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
         """
         instance = self.get_object()
 
-        # Zapisz dane przed usunięciem (potrzebne do obliczenia konfliktów)
-        location_id = str(instance.location_id)
-        month = instance.date.month
-        year = instance.date.year
+        # Zapisz stan okna przed usunięciem
+        targets = self._get_conflict_targets({}, instance)
+        conflicts_before = self._detect_window_conflicts(targets)
 
         # Usuń obiekt
         self.perform_destroy(instance)
 
         # Oblicz konflikty po usunięciu
+        conflict_data = self._get_write_conflicts(instance, targets, conflicts_before)
+
+        return Response({
+            'deleted': True,
+            **conflict_data
+        }, status=status.HTTP_200_OK)
+
+    def _get_conflict_targets(self, validated_data, instance=None):
+        """
+        Zwraca listę okien (location_id, employee_id, date), na które wpływa zapis.
+
+        Przy aktualizacji zwraca okno starego i nowego położenia wpisu.
+        """
+        targets = []
+        if instance is not None:
+            targets.append((instance.location_id, instance.employee_id, instance.date))
+
+        if validated_data:
+            location = validated_data.get('location', getattr(instance, 'location', None))
+            employee = validated_data.get('employee', getattr(instance, 'employee', None))
+            work_date = validated_data.get('date', getattr(instance, 'date', None))
+            if employee is not None and work_date is not None:
+                targets.append((getattr(location, 'id', None), employee.id, work_date))
+
+        # Bez lokacji nie ma grafiku, w którym można liczyć konflikty
+        unique_targets = []
+        for target in targets:
+            if target[0] is not None and target not in unique_targets:
+                unique_targets.append(target)
+        return unique_targets
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        """Zapis i aktualizacja indeksu konfliktów (sygnał) w jednej transakcji."""
+        super().perform_create(serializer)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+
+    def _detect_window_conflicts(self, targets):
+        """Odczytuje z indeksu konflikty w oknach wokół zmienionych dat."""
         try:
-            conflict_service = ConflictDetectionService(
-                location_id=location_id,
-                month=month,
-                year=year
+            return IncrementalConflictService.merge_conflicts(
+                ConflictIndexService.get_window_conflicts(
+                    location_id=str(location_id),
+                    employee_id=str(employee_id),
+                    changed_date=work_date
+                )
+                for location_id, employee_id, work_date in targets
             )
-            conflicts = conflict_service.detect_all_conflicts()
         except (ValueError, TypeError) as e:
-            logger.error(f"Błędne parametry przy obliczaniu konfliktów po usunięciu: {e}", exc_info=True)
-            conflicts = {
-                'rest_11h': [],
-                'rest_35h': {},
-                'exceed_12h': []
-            }
+            logger.error(f"Błędne parametry przy przyrostowym obliczaniu konfliktów: {e}", exc_info=True)
+            return IncrementalConflictService.empty_conflicts()
         except ValidationError as e:
-            logger.error(f"Błąd walidacji przy obliczaniu konfliktów po usunięciu: {e}", exc_info=True)
-            conflicts = {
-                'rest_11h': [],
-                'rest_35h': {},
-                'exceed_12h': []
-            }
+            logger.error(f"Błąd walidacji przy przyrostowym obliczaniu konfliktów: {e}", exc_info=True)
+            return IncrementalConflictService.empty_conflicts()
 
-        return Response({
-            'deleted': True,
-            'conflicts': conflicts
-        }, status=status.HTTP_200_OK)
+    def _get_write_conflicts(self, instance, targets, conflicts_before):
+        """
+        Zwraca konflikty po zapisie.
+
+        Indeks jest już odświeżony przyrostowo (sygnał po zapisie), więc pełny
+        zbiór konfliktów miesiąca to jedno zapytanie, a różnica względem stanu
+        sprzed zapisu dotyczy tylko przeliczonych okien. Parametr ?conflicts=full
+        wymusza pełne przeliczenie lokacji-miesiąca.
+        """
+        if self.request.query_params.get('conflicts') == 'full':
+            return {'conflicts': self._calculate_conflicts_for_instance(instance)}
+
+        conflicts_after = self._detect_window_conflicts(targets)
+        if instance.location_id is not None:
+            conflicts = ConflictIndexService.get_conflicts(
+                location_id=str(instance.location_id),
+                month=instance.date.month,
+                year=instance.date.year
+            )
+        else:
+            conflicts = IncrementalConflictService.empty_conflicts()
+
+        return {
+            'conflicts': conflicts,
+            'conflicts_delta': IncrementalConflictService.diff_conflicts(conflicts_before, conflicts_after)
+        }
 
     def _calculate_conflicts_for_instance(self, instance):
         """
@@ -213,12 +476,11 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
             Dict z konfliktami
         """
         try:
-            conflict_service = ConflictDetectionService(
+            return ConflictCacheService.detect_all_conflicts(
                 location_id=str(instance.location_id),
                 month=instance.date.month,
                 year=instance.date.year
             )
-            return conflict_service.detect_all_conflicts()
         except (ValueError, TypeError) as e:
             logger.error(f"Błędne parametry przy obliczaniu konfliktów dla instancji {instance.id}: {e}", exc_info=True)
             return {
@@ -234,6 +496,149 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
                 'exceed_12h': []
             }
 
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        POST /api/schedule/bulk/
+        {
+            "location": "uuid", "month": 11, "year": 2025,
+            "mode": "merge" | "replace",
+            "cells": [{"employee": "uuid", "date": "2025-11-03", "hours": "8:00-16:00"},
+                      {"employee": "uuid", "date": "2025-11-04", "hours": null}, ...]
+        }
+        Zapisuje komórki atomowo (hours puste = wyczyszczenie) i zwraca grafik
+        miesiąca + konflikty po jednym przeliczeniu.
+        """
+        serializer = WorkHoursBulkSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        service = BulkScheduleService(
+            location_id=str(data['location']),
+            month=data['month'],
+            year=data['year'],
+            cells=data['cells'],
+            mode=data['mode']
+        )
+        result = service.apply()
+
+        work_hours = WorkHours.objects.filter(
+            location_id=data['location'],
+            date__gte=service.month_start,
+            date__lte=service.month_end
+        )
+
+        return Response({
+            **result,
+            'work_hours': WorkHoursReadService.serialize(work_hours),
+            'conflicts': ConflictIndexService.get_conflicts(
+                location_id=str(data['location']),
+                month=data['month'],
+                year=data['year']
+            )
+        })
+
+    @action(detail=False, methods=['post'], url_path='copy')
+    def copy_schedule(self, request):
+        """
+        POST /api/schedule/copy/
+        {
+            "location": "uuid",
+            "source_from": "2025-10-01", "source_to": "2025-10-31",
+            "target_from": "2025-11-01", "target_to": "2025-11-30",
+            "align": "weekday" | "date", "employees": ["uuid", ...], "overwrite": false
+        }
+        Kopiuje grafik z zakresu źródłowego do docelowego i zwraca konflikty
+        miesięcy docelowych (jedno przeliczenie na końcu).
+        """
+        serializer = WorkHoursCopySerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        service = ScheduleCopyService(
+            location_id=str(data['location']),
+            source_from=data['source_from'],
+            source_to=data['source_to'],
+            target_from=data['target_from'],
+            target_to=data['target_to'],
+            align=data['align'],
+            employee_ids=data['employees'],
+            overwrite=data['overwrite']
+        )
+        result = service.copy()
+
+        return Response({
+            **result,
+            'months': [
+                {
+                    'year': year,
+                    'month': month,
+                    'conflicts': ConflictIndexService.get_conflicts(str(data['location']), month, year)
+                }
+                for year, month in service.target_months()
+            ]
+        })
+
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        """
+        GET /api/schedule/changes/?location=xxx&since=123[&limit=500]
+        Zmiany komórek grafiku lokacji od kursora since (dziennik ScheduleChange):
+        {'changes': [{'seq', 'op': 'upsert'|'delete', 'id', 'employee', 'date', 'hours'}],
+         'cursor': kolejne since, 'has_more': bool, 'reset': bool}
+
+        Bez since zwraca tylko bieżący kursor - klient pobiera go przed
+        pobraniem pełnego miesiąca. reset=True: kursor jest starszy niż
+        wyczyszczona część dziennika, klient pobiera grafik od nowa.
+        """
+        validator = ChangesParamsValidator(request.query_params, max_limit=settings.SCHEDULE_CHANGES_MAX_LIMIT)
+        if not validator.is_valid():
+            return Response(validator.errors, status=400)
+
+        try:
+            if not Location.objects.filter(id=validator.location_id, user=request.user).exists():
+                return Response({'error': 'Lokacja nie istnieje'}, status=404)
+        except (ValueError, ValidationError):
+            return Response({'error': 'Nieprawidłowy identyfikator lokacji'}, status=400)
+
+        if validator.since is None:
+            return Response({'cursor': ScheduleChangeService.get_cursor(validator.location_id)})
+        return Response(ScheduleChangeService.get_changes(validator.location_id, validator.since, validator.limit))
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        GET /api/schedule/export/?date_from=2025-01-01&date_to=2025-12-31[&format=ndjson|csv]
+            [&location=xxx&location=yyy][&employee_id=zzz]
+        Strumień wpisów lokacji użytkownika z wyliczonymi godzinami - pamięć
+        stała niezależnie od długości zakresu (odczyt porcjami przez iterator()).
+        """
+        params = request.query_params
+        validator = DateRangeParamsValidator(params)
+        if not validator.is_valid():
+            return Response(validator.errors, status=400)
+
+        export_format = params.get('format', WorkHoursExportService.FORMAT_NDJSON)
+        if export_format not in WorkHoursExportService.FORMATS:
+            return Response({'error': 'Nieobsługiwany format eksportu - dozwolone: ndjson, csv'}, status=400)
+
+        queryset = WorkHours.objects.filter(location__user=request.user).in_range(
+            validator.date_from, validator.date_to
+        )
+        try:
+            if params.getlist('location'):
+                queryset = queryset.filter(location_id__in=params.getlist('location'))
+            if params.get('employee_id'):
+                queryset = queryset.filter(employee_id=params.get('employee_id'))
+        except (ValueError, ValidationError):
+            return Response({'error': 'Nieprawidłowy identyfikator lokacji lub pracownika'}, status=400)
+
+        exporter = WorkHoursExportService(queryset, export_format)
+        response = StreamingHttpResponse(exporter.stream(), content_type=exporter.content_type)
+        filename = f"grafik_{validator.date_from.isoformat()}_{validator.date_to.isoformat()}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
     @action(detail=False, methods=['get'], url_path='generate-schedule-pdf')
     def generate_schedule_pdf(self, request):
         """Generuje PDF z grafikiem dla wybranej lokacji i miesiąca."""
@@ -285,3 +690,153 @@ class WorkHoursViewSet(viewsets.ModelViewSet):
         response = HttpResponse(pdf_file, content_type='application/pdf')
         response['Content-Disposition'] = f'attachment; filename="{filename}"'
         return response
+
+    @action(detail=False, methods=['get'], url_path='hours-summary')
+    def hours_summary(self, request):
+        """
+        GET /api/schedule/hours-summary/?location=xxx&month=11&year=2025
+        Sumy godzin pracowników lokacji w miesiącu (czas pracy, liczba zmian,
+        pora nocna, weekend) - z tabeli MonthlyHoursSummary, bez przeliczania wpisów.
+        """
+        validator = ScheduleParamsValidator(request.query_params)
+        if not validator.is_valid():
+            return Response(validator.errors, status=400)
+
+        try:
+            if not Location.objects.filter(id=validator.location_id, user=request.user).exists():
+                return Response({'error': 'Lokacja nie istnieje'}, status=404)
+        except (ValueError, ValidationError):
+            return Response({'error': 'Nieprawidłowy identyfikator lokacji'}, status=400)
+
+        return Response({
+            'location': validator.location_id,
+            'month': validator.month,
+            'year': validator.year,
+            'employees': MonthlyHoursSummaryService.get_month_report(
+                validator.location_id, validator.month, validator.year
+            )
+        })
+
+    @action(detail=False, methods=['get'], url_path='settlement')
+    def settlement(self, request):
+        """
+        GET /api/schedule/settlement/?location=xxx&month=11&year=2025
+        Rozliczenie czasu pracy w okresie rozliczeniowym lokacji zawierającym miesiąc:
+        norma, czas przepracowany, nadgodziny (dobowe i z przeciętnej normy tygodniowej)
+        oraz sumy narastające per miesiąc okresu - z sum MonthlyHoursSummary.
+        """
+        validator = ScheduleParamsValidator(request.query_params)
+        if not validator.is_valid():
+            return Response(validator.errors, status=400)
+
+        try:
+            if not Location.objects.filter(id=validator.location_id, user=request.user).exists():
+                return Response({'error': 'Lokacja nie istnieje'}, status=404)
+        except (ValueError, ValidationError):
+            return Response({'error': 'Nieprawidłowy identyfikator lokacji'}, status=400)
+
+        return Response(
+            SettlementPeriodService(validator.location_id, validator.month, validator.year).build()
+        )
+
+    @action(detail=False, methods=['get'], url_path='overview')
+    def overview(self, request):
+        """
+        GET /api/schedule/overview/?month=11&year=2025[&conflicts=full]
+        Podsumowanie miesiąca wszystkich lokacji użytkownika: obsadzone dni,
+        pracownicy, wpisy, suma godzin i liczba konfliktów per reguła.
+
+        Stała liczba zapytań niezależnie od liczby lokacji (agregaty grupowane
+        po lokacji). Konflikty z indeksu; ?conflicts=full przelicza je jednym
+        skanem wszystkich lokacji.
+        """
+        validator = MonthParamsValidator(request.query_params)
+        if not validator.is_valid():
+            return Response(validator.errors, status=400)
+
+        overview = ScheduleOverviewService(
+            user=request.user,
+            month=validator.month,
+            year=validator.year,
+            full=request.query_params.get('conflicts') == 'full'
+        )
+        return Response(overview.build())
+
+    @action(detail=False, methods=['get'], url_path='compliance-scan')
+    def compliance_scan(self, request):
+        """
+        GET /api/schedule/compliance-scan/?date_from=2025-01-01&date_to=2025-12-31[&location=xxx&location=yyy]
+        Konflikty wszystkich (lub wskazanych) lokacji użytkownika we wszystkich
+        miesiącach zakresu - jeden raport z czasem każdej partycji.
+        """
+        validator = DateRangeParamsValidator(request.query_params, max_months=settings.COMPLIANCE_SCAN_MAX_MONTHS)
+        if not validator.is_valid():
+            return Response(validator.errors, status=400)
+
+        locations = Location.objects.filter(user=request.user)
+        location_ids = request.query_params.getlist('location')
+        if location_ids:
+            try:
+                locations = locations.filter(id__in=location_ids)
+            except (ValueError, ValidationError):
+                return Response({"error": "Nieprawidłowy identyfikator lokacji"}, status=400)
+
+        scan = ComplianceScanService(
+            location_ids=locations.values_list('id', flat=True),
+            date_from=validator.date_from,
+            date_to=validator.date_to
+        )
+        return Response(scan.run())
+
+
+class RotationPatternViewSet(viewsets.ModelViewSet):
+    """ViewSet wzorców rotacji zmian (tylko lokacje użytkownika)."""
+
+    serializer_class = RotationPatternSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = RotationPattern.objects.filter(
+            location__user=self.request.user
+        ).select_related('location').prefetch_related('assignments__employee')
+
+        location_id = self.request.query_params.get('location')
+        if location_id:
+            try:
+                queryset = queryset.filter(location_id=location_id)
+            except (ValueError, ValidationError):
+                return queryset.none()
+        return queryset
+
+    @action(detail=True, methods=['post'])
+    def generate(self, request, pk=None):
+        """
+        POST /api/schedule/rotation-patterns/{id}/generate/
+        {
+            "date_from": "2025-11-01", "date_to": "2025-11-30",
+            "employees": ["uuid", ...], "overwrite": false,
+            "dry_run": false, "force": false
+        }
+        Rozwija wzorzec na zakres dat i sprawdza reguły 11h/35h/12h przed zapisem.
+        dry_run zwraca tylko podgląd; przy konfliktach zapis wymaga force
+        (bez niego odpowiedź 409 z podglądem konfliktów).
+        """
+        serializer = RotationGenerateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        service = RotationGeneratorService(
+            pattern=self.get_object(),
+            date_from=data['date_from'],
+            date_to=data['date_to'],
+            employee_ids=data['employees'],
+            overwrite=data['overwrite']
+        )
+        result = service.generate(dry_run=data['dry_run'], force=data['force'])
+
+        if result['conflict_count'] and not data['dry_run'] and not result['committed']:
+            return Response({
+                'error': "Wygenerowany grafik narusza reguły czasu pracy (zapis z force=true pomija blokadę)",
+                **result
+            }, status=status.HTTP_409_CONFLICT)
+        return Response(result)
@@ -0,0 +1,22 @@
+"""
+Negocjacja treści z parametrem ?format= wybierającym układ odpowiedzi
+"""
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class LayoutFormatNegotiation(DefaultContentNegotiation):
+    """
+    ?format= jest w DRF zarezerwowany dla wyboru renderera - nieznana wartość
+    kończy się 404. Wartości z LAYOUT_FORMATS oznaczają układ danych JSON
+    (np. ?format=grid) albo format odpowiedzi tworzonej przez sam widok
+    (np. strumień ?format=csv), więc negocjacja wybiera JSON, a resztę robi widok.
+
+    Użycie w ViewSet:
+        content_negotiation_class = LayoutFormatNegotiation
+    """
+    LAYOUT_FORMATS = {'grid', 'ndjson', 'csv'}
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        if request.query_params.get(self.settings.URL_FORMAT_OVERRIDE) in self.LAYOUT_FORMATS:
+            format_suffix = 'json'
+        return super().select_renderer(request, renderers, format_suffix)
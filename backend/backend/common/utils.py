@@ -1,4 +1,20 @@
 """
 Funkcje pomocnicze używane w wielu miejscach
+"""
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+
+
+def with_conditional_headers(response, conditional):
+    """
+    Ustawia ETag i Last-Modified odpowiedzi warunkowego GET.
 
-"""
\ No newline at end of file
+    Args:
+        response: Odpowiedź (także 304 z get_conditional_response)
+        conditional: {'etag': ETag w cudzysłowie, 'last_modified': znacznik czasu}
+    """
+    response['ETag'] = conditional['etag']
+    response['Last-Modified'] = http_date(conditional['last_modified'])
+    # Przeglądarka trzyma kopię, ale przy każdym użyciu pyta serwer (tanie 304)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -168,6 +168,55 @@ if not DEBUG:
         }
     })
 
+# Silnik wykrywania konfliktów grafiku: 'python', 'numpy' lub 'auto'
+# ('auto' przełącza na NumPy od CONFLICT_ENGINE_NUMPY_THRESHOLD zmian)
+CONFLICT_ENGINE = os.getenv('CONFLICT_ENGINE', 'auto')
+CONFLICT_ENGINE_NUMPY_THRESHOLD = int(os.getenv('CONFLICT_ENGINE_NUMPY_THRESHOLD', '5000'))
+
+# Hook metryk walidatorów: ścieżka do funkcji hook(timings, **context) wywoływanej
+# po każdym wykrywaniu konfliktów (czasy i rozmiar wejścia każdej reguły)
+CONFLICT_METRICS_HOOK = os.getenv('CONFLICT_METRICS_HOOK')
+
+# Zbiorczy skan zgodności - liczba procesów roboczych, maks. liczba miesięcy na żądanie API
+# i liczba zmian, od której walidacja idzie do puli procesów
+COMPLIANCE_SCAN_MAX_WORKERS = int(os.getenv('COMPLIANCE_SCAN_MAX_WORKERS', str(min(4, os.cpu_count() or 1))))
+COMPLIANCE_SCAN_MAX_MONTHS = int(os.getenv('COMPLIANCE_SCAN_MAX_MONTHS', '24'))
+COMPLIANCE_SCAN_PARALLEL_THRESHOLD = int(os.getenv('COMPLIANCE_SCAN_PARALLEL_THRESHOLD', '20000'))
+
+# Maks. liczba miesięcy osi dni w odpowiedzi ?format=grid z date_from/date_to
+SCHEDULE_GRID_MAX_MONTHS = int(os.getenv('SCHEDULE_GRID_MAX_MONTHS', '3'))
+
+# Eksport strumieniowy grafiku - liczba wierszy pobieranych z bazy w jednej porcji
+WORK_HOURS_EXPORT_CHUNK_SIZE = int(os.getenv('WORK_HOURS_EXPORT_CHUNK_SIZE', '2000'))
+
+# Synchronizacja przyrostowa - maks. liczba zmian w jednej odpowiedzi /api/schedule/changes/
+SCHEDULE_CHANGES_MAX_LIMIT = int(os.getenv('SCHEDULE_CHANGES_MAX_LIMIT', '1000'))
+
+# Partycjonowanie tabeli WorkHours po miesiącach (tylko PostgreSQL; tabelę przepisuje
+# manage_work_hours_partitions --convert). Ta sama komenda tworzy partycje na
+# WORK_HOURS_PARTITION_MONTHS_AHEAD miesięcy naprzód i odłącza partycje starsze niż
+# WORK_HOURS_PARTITION_RETENTION_MONTHS miesięcy (0 = bez odłączania)
+WORK_HOURS_PARTITION_MONTHS_AHEAD = int(os.getenv('WORK_HOURS_PARTITION_MONTHS_AHEAD', '3'))
+WORK_HOURS_PARTITION_RETENTION_MONTHS = int(os.getenv('WORK_HOURS_PARTITION_RETENTION_MONTHS', '0'))
+
+# Cache - 'default' w pamięci procesu (throttling), 'conflicts' na wyniki wykrywania
+# konfliktów - musi być wspólny dla workerów gunicorna (plikowy lub bazodanowy:
+# CONFLICT_CACHE_BACKEND=django.core.cache.backends.db.DatabaseCache,
+# CONFLICT_CACHE_LOCATION=<nazwa tabeli>, potem manage.py createcachetable)
+CONFLICT_CACHE_ALIAS = 'conflicts'
+CONFLICT_CACHE_TIMEOUT = int(os.getenv('CONFLICT_CACHE_TIMEOUT', str(24 * 60 * 60)))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    CONFLICT_CACHE_ALIAS: {
+        'BACKEND': os.getenv('CONFLICT_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': os.getenv('CONFLICT_CACHE_LOCATION', str(BASE_DIR / 'cache' / 'conflicts')),
+        'TIMEOUT': CONFLICT_CACHE_TIMEOUT,
+    },
+}
+
 # CORS Configuration - dynamiczne
 CORS_ALLOWED_ORIGINS_ENV = os.getenv('CORS_ALLOWED_ORIGINS', 'http://localhost:4200,http://134.209.230.53:4200,http://134.209.230.53,http://localhost:4300')
 CORS_ALLOWED_ORIGINS = [origin.strip() for origin in CORS_ALLOWED_ORIGINS_ENV.split(',')]